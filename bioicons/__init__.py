@@ -0,0 +1,11 @@
+"""
+Bioicons Package
+
+Python tools for working with the bioicons library in static/icons.
+"""
+
+from .library import IconLibrary, default_library
+from .pack import IconPack, write_pack
+from .tree import ICONS_ROOT, scan_icons
+
+__version__ = "0.1.0"
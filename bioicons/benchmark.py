@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Build Benchmark - Times the build pipeline on synthetic icon trees.
+
+Generates license/category/author/icon.svg trees of configurable size and
+complexity, then runs the build three ways for each tree:
+
+- cold: empty build directory, nothing cached
+- warm: immediately again, nothing changed
+- single-change: after rewriting one icon
+
+Every run is a separate process so per-stage timings and peak RSS are not
+skewed by earlier runs. Results go to a JSON file that can be kept per commit
+and compared.
+
+    python -m bioicons.benchmark --sizes 1000 10000 100000 --output bench-$(git rev-parse --short HEAD).json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .build import REPO_ROOT, STAGES
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_COMPLEXITY = 20
+SCENARIOS = ("cold", "warm", "single-change")
+
+LICENSES = ("cc-0", "cc-by-3.0", "cc-by-4.0", "mit", "bsd")
+COLORS = ("#19aeff", "#ff4141", "#ffc022", "#5dbb63", "#333333", "#b3b3b3", "#ffffff")
+
+
+def _shape(rng: random.Random) -> str:
+    """One random drawing element in a 0-100 user space."""
+    color = rng.choice(COLORS)
+    kind = rng.random()
+    if kind < 0.5:
+        x, y = rng.uniform(0, 100), rng.uniform(0, 100)
+        d = [f"M{x:.2f},{y:.2f}"]
+        for _ in range(rng.randint(2, 8)):
+            points = ",".join(f"{rng.uniform(0, 100):.2f}" for _ in range(6))
+            d.append(f"C{points}")
+        return f'<path d="{" ".join(d)}z" style="fill:{color};stroke:#000000;stroke-width:0.5"/>'
+    if kind < 0.7:
+        return (f'<circle cx="{rng.uniform(0, 100):.2f}" cy="{rng.uniform(0, 100):.2f}" '
+                f'r="{rng.uniform(1, 20):.2f}" fill="{color}"/>')
+    if kind < 0.9:
+        return (f'<rect x="{rng.uniform(0, 80):.2f}" y="{rng.uniform(0, 80):.2f}" width="{rng.uniform(2, 20):.2f}" '
+                f'height="{rng.uniform(2, 20):.2f}" fill="{color}" transform="rotate({rng.randint(0, 90)})"/>')
+    return (f'<g transform="translate({rng.uniform(0, 20):.2f},{rng.uniform(0, 20):.2f})">'
+            f'<ellipse cx="40" cy="40" rx="{rng.uniform(5, 30):.2f}" ry="{rng.uniform(5, 30):.2f}" fill="{color}"/></g>')
+
+
+def synthetic_svg(rng: random.Random, complexity: int) -> str:
+    """
+    Generate an icon document the way editors save them.
+
+    Args:
+        rng: Random source
+        complexity: Number of drawing elements
+
+    Returns:
+        SVG document text, including editor metadata for the optimizer to remove
+    """
+    shapes = "\n  ".join(_shape(rng) for _ in range(complexity))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" '
+        'xmlns:sodipodi="http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd" '
+        'width="100" height="100" viewBox="0 0 100 100" inkscape:version="1.0">\n'
+        '  <sodipodi:namedview id="namedview1" inkscape:zoom="1"/>\n'
+        '  <metadata><rdf /></metadata>\n'
+        f"  {shapes}\n"
+        "</svg>\n"
+    )
+
+
+def generate_tree(root: Path, count: int, complexity: int = DEFAULT_COMPLEXITY,
+                  categories: int = 30, authors: int = 200, seed: int = 0) -> List[Path]:
+    """
+    Write a synthetic icon tree.
+
+    Args:
+        root: Library root to create
+        count: Number of icons
+        complexity: Drawing elements per icon (varies +/-50% between icons)
+        categories: Number of categories
+        authors: Number of authors
+        seed: Random seed, so trees are identical between benchmark runs
+
+    Returns:
+        Paths of the generated icons
+    """
+    rng = random.Random(seed)
+    author_licenses = {f"Author_{a:04d}": rng.choice(LICENSES) for a in range(authors)}
+    author_names = sorted(author_licenses)
+
+    paths = []
+    for i in range(count):
+        author = author_names[i % authors]
+        category = f"Category_{rng.randrange(categories):02d}"
+        directory = root / author_licenses[author] / category / author
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"icon-{i:06d}.svg"
+        shapes = max(1, int(complexity * rng.uniform(0.5, 1.5)))
+        path.write_text(synthetic_svg(rng, shapes))
+        paths.append(path)
+    return paths
+
+
+def _run(args: Sequence[str], report: Path) -> Dict:
+    """Run one build in a child process and collect its timings and peak RSS."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "bioicons.build", *args, "--report", str(report)],
+                            cwd=REPO_ROOT, stdout=subprocess.DEVNULL)
+    # wait4 reports the child's own usage, including the worker processes it reaped
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    stages = json.loads(report.read_text()) if report.exists() else {}
+    return {
+        "exit_code": proc.returncode,
+        "wall_seconds": round(wall, 3),
+        "peak_rss_mb": round(rss / (1024 * 1024), 1),
+        "stages": {name: {"status": stage["status"], "seconds": round(stage.get("seconds", 0.0), 4)}
+                   for name, stage in stages.items()},
+    }
+
+
+def benchmark_tree(workdir: Path, count: int, complexity: int, stages: Sequence[str],
+                   jobs: Optional[int] = None, seed: int = 0) -> List[Dict]:
+    """
+    Benchmark cold, warm and single-change builds of one synthetic tree.
+
+    Args:
+        workdir: Scratch directory for the tree and build outputs
+        count: Number of icons
+        complexity: Drawing elements per icon
+        stages: Build targets
+        jobs: Worker processes per stage
+        seed: Random seed for the tree
+
+    Returns:
+        One result per scenario
+    """
+    root = workdir / "icons"
+    start = time.perf_counter()
+    paths = generate_tree(root, count, complexity, seed=seed)
+    generate_seconds = time.perf_counter() - start
+    total_bytes = sum(path.stat().st_size for path in paths)
+    print(f"{count} icons ({total_bytes / 1e6:.1f} MB) generated in {generate_seconds:.1f}s")
+
+    args = [*stages, "--root", str(root), "--drawio-dir", str(workdir / "drawio-lib"),
+            "--build-dir", str(workdir / "build")]
+    if jobs:
+        args += ["--jobs", str(jobs)]
+
+    results = []
+    for scenario in SCENARIOS:
+        if scenario == "single-change":
+            changed = paths[len(paths) // 2]
+            changed.write_text(synthetic_svg(random.Random(seed + 1), complexity))
+        result = _run(args, workdir / f"report-{scenario}.json")
+        result.update(icons=count, complexity=complexity, bytes=total_bytes, scenario=scenario)
+        results.append(result)
+        print(f"  {scenario}: {result['wall_seconds']:.2f}s, peak RSS {result['peak_rss_mb']} MB"
+              + ("" if result["exit_code"] == 0 else f" (exit code {result['exit_code']})"))
+    return results
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Run the build benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the build on synthetic icon trees")
+    parser.add_argument("--sizes", "-n", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Tree sizes in icons (default: 1000 10000 100000)")
+    parser.add_argument("--complexity", "-c", type=int, default=DEFAULT_COMPLEXITY,
+                        help=f"Average drawing elements per icon (default: {DEFAULT_COMPLEXITY})")
+    parser.add_argument("--stages", nargs="*", default=[],
+                        help=f"Build targets (default: all of {', '.join(STAGES)})")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes per stage")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic trees")
+    parser.add_argument("--workdir", help="Scratch directory (default: a temporary directory)")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated trees")
+    parser.add_argument("--output", "-o", default="benchmark.json", help="Results file")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.sizes:
+        workdir = Path(tempfile.mkdtemp(prefix=f"bioicons-bench-{count}-", dir=args.workdir))
+        try:
+            results.extend(benchmark_tree(workdir, count, args.complexity, args.stages, args.jobs, args.seed))
+        finally:
+            if args.keep:
+                print(f"  kept {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "commit": _commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 1 if any(result["exit_code"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,782 @@
+#!/usr/bin/env python3
+"""
+Library Build - One cached entry point for the static/icons build pipeline.
+
+The pipeline is modelled as a dependency graph of stages:
+
+    scan -> validate -> index ----------------> compress
+                     -> placeholders -----------> compress
+                     -> optimize -> thumbnails
+                                 -> recolor
+                                 -> normalize
+                                 -> simplify (optional)
+                                 -----------------> compress
+                     -> drawio -----------------> compress
+
+Each stage declares its inputs (fingerprinted by content hash) and its outputs.
+A stage only re-runs when its input fingerprint, its upstream fingerprints or its
+recorded outputs changed; independent stages run concurrently and share one
+pool of --jobs worker processes.
+
+Usage:
+    python -m bioicons.build                  # build everything
+    python -m bioicons.build index drawio     # only these stages and their dependencies
+    python -m bioicons.build simplify         # optional stages run only when named
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from .drawio import DRAWIO_DIR, build_libraries
+from .indexer import run_index
+from .normalize import normalize_file
+from .optimize import minify_svg
+from .pack import write_pack
+from .placeholder import PLACEHOLDERS_FILE, placeholder_file, placeholder_key, write_placeholders
+from .placeholder import have_numpy as have_painter
+from .profiling import DEFAULT_TOP, Profiler, get_profiler
+from .recolor import THEMES, have_numpy, recolor_tree
+from .render import have_renderer, render_png
+from .simplify import DEFAULT_THRESHOLD, DEFAULT_TOLERANCE, simplify_file
+from .tree import ICONS_ROOT, scan_icons
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+REPO_ROOT = ICONS_ROOT.parent.parent
+BUILD_DIR = REPO_ROOT / "build"
+CACHE_FILE = "cache.json"
+CACHE_VERSION = 1
+
+THUMBNAIL_SIZE = 128
+
+# Publish copies in build/normalized: tight viewBox unless these are changed
+NORMALIZE_PADDING = 0.0
+NORMALIZE_SQUARE = False
+
+# Precompressed siblings written by the compress stage; ignored when stamping outputs
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+class Stage:
+    """
+    A build step with declared dependencies, inputs and outputs.
+    """
+
+    def __init__(self, name: str, func: Callable, deps: Sequence[str],
+                 inputs: Optional[Callable], outputs: Callable, version: int, optional: bool = False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        # inputs(ctx) -> JSON-serializable fingerprint material; None means always run
+        self.inputs = inputs
+        # outputs(ctx) -> list of files or directories the stage writes
+        self.outputs = outputs
+        self.version = version
+        # Optional stages only run when requested by name
+        self.optional = optional
+        self.description = (func.__doc__ or "").strip().split("\n")[0]
+
+
+STAGES: Dict[str, Stage] = {}
+
+
+def stage(name: str, deps: Sequence[str] = (), inputs: Optional[Callable] = None,
+          outputs: Optional[Callable] = None, version: int = 1, always: bool = False,
+          optional: bool = False):
+    """
+    Register a build stage.
+
+    Args:
+        name: Stage name used on the command line and in the cache
+        deps: Names of stages that must complete first
+        inputs: Function returning the stage's input fingerprint material
+            (default: the content hashes of all icons)
+        outputs: Function returning the paths the stage writes
+        version: Bump to invalidate cached results after changing the stage
+        always: Run on every build regardless of the cache
+        optional: Leave out of default builds; runs only when named as a target
+    """
+    def decorator(func):
+        STAGES[name] = Stage(
+            name, func, deps,
+            None if always else (inputs or tree_inputs),
+            outputs or (lambda ctx: []),
+            version, optional
+        )
+        return func
+    return decorator
+
+
+class BuildContext:
+    """
+    Shared state of one build run.
+    """
+
+    def __init__(self, root: Union[str, Path] = ICONS_ROOT,
+                 drawio_dir: Union[str, Path] = DRAWIO_DIR,
+                 build_dir: Union[str, Path] = BUILD_DIR,
+                 jobs: Optional[int] = None,
+                 profiler: Optional[Profiler] = None):
+        self.root = Path(root)
+        self.drawio_dir = Path(drawio_dir)
+        self.build_dir = Path(build_dir)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.profiler = get_profiler(profiler)
+        # Filled by the scan stage
+        self.icons: List[Dict[str, str]] = []
+        self.stats: Dict[str, tuple] = {}
+        self.hashes: Dict[str, str] = {}
+        self.tree_digest = ""
+        # Persistent cache loaded from build_dir
+        self.cache: Dict = {}
+        # Worker processes shared by all stages, started on first use
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def process_pool(self) -> ProcessPoolExecutor:
+        """The build's worker pool of jobs processes, started on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.jobs, mp_context=_mp_context())
+            return self._pool
+
+    def close(self):
+        """Shut down the worker pool."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+def tree_inputs(ctx: BuildContext):
+    """Default stage inputs: every icon path and its content hash."""
+    return ctx.tree_digest
+
+
+def _digest(material) -> str:
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stamp(path: Path):
+    """Cheap change stamp for an output file or directory (None if missing)."""
+    if path.is_file():
+        st = path.stat()
+        return [st.st_size, st.st_mtime_ns]
+    if path.is_dir():
+        count = size = latest = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                if filename.endswith(COMPRESSED_SUFFIXES):
+                    continue
+                st = os.stat(os.path.join(dirpath, filename))
+                count += 1
+                size += st.st_size
+                latest = max(latest, st.st_mtime_ns)
+        return [count, size, latest]
+    return None
+
+
+def _mp_context():
+    """Stages run in threads, so worker processes must not be started with plain fork."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+@contextmanager
+def _process_pool(ctx: BuildContext):
+    """
+    Worker pool for CPU-bound per-icon work.
+
+    Concurrent stages queue their work on the same ctx.jobs processes instead
+    of each starting a pool of their own; run_build shuts it down.
+    """
+    yield ctx.process_pool()
+
+
+def _changed_files(ctx: BuildContext, state: Dict) -> List[str]:
+    """Icons whose content hash differs from the one recorded in a stage's state."""
+    done = state.get("files", {})
+    return [path for path, digest in ctx.hashes.items() if done.get(path) != digest]
+
+
+def _remove_deleted(ctx: BuildContext, state: Dict, out_dir: Path, suffix: str = ""):
+    """Delete outputs of icons that no longer exist."""
+    files = state.get("files", {})
+    for path in [path for path in files if path not in ctx.hashes]:
+        target = out_dir / (path[:-len(".svg")] + suffix if suffix else path)
+        if target.exists():
+            target.unlink()
+        del files[path]
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+@stage("scan", always=True)
+def scan_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """List icons and hash their content (reusing hashes of unchanged files)."""
+    known = state.get("hashes", {})
+    with ctx.profiler.phase("scan", "glob"):
+        ctx.icons = scan_icons(ctx.root)
+
+    stale = []
+    with ctx.profiler.phase("scan", "stat"):
+        for icon in ctx.icons:
+            path = icon["path"]
+            st = os.stat(ctx.root / path)
+            ctx.stats[path] = (st.st_size, st.st_mtime_ns)
+            previous = known.get(path)
+            if previous and tuple(previous[:2]) == ctx.stats[path]:
+                ctx.hashes[path] = previous[2]
+            else:
+                stale.append(path)
+
+    # hashlib releases the GIL, so threads hash files in parallel
+    with ThreadPoolExecutor(ctx.jobs) as pool, ctx.profiler.phase("scan", "hash") as phase:
+        for path, digest in zip(stale, pool.map(lambda p: _file_sha256(str(ctx.root / p)), stale)):
+            ctx.hashes[path] = digest
+        phase.bytes = sum(ctx.stats[path][0] for path in stale)
+    ctx.profiler.add_bytes("scan", phase.bytes)
+
+    ctx.tree_digest = _digest(sorted(ctx.hashes.items()))
+    state["hashes"] = {path: [*ctx.stats[path], ctx.hashes[path]] for path in ctx.hashes}
+    return {"icons": len(ctx.icons), "hashed": len(stale)}
+
+
+def validate_icon(path: str) -> Optional[str]:
+    """Return a description of what is wrong with an icon file, or None if it is valid."""
+    try:
+        root = ET.parse(path).getroot()
+    except ET.ParseError as e:
+        return f"XML parse error: {e}"
+    if root.tag.split("}")[-1] != "svg":
+        return f"Root element is <{root.tag.split('}')[-1]}>, not <svg>"
+    if "viewBox" not in root.attrib and not ("width" in root.attrib and "height" in root.attrib):
+        return "Missing viewBox and width/height"
+    return None
+
+
+def _validate_timed(path: str):
+    start = time.perf_counter()
+    error = validate_icon(path)
+    return error, time.perf_counter() - start, os.path.getsize(path) if os.path.exists(path) else 0
+
+
+@stage("validate", deps=("scan",), outputs=lambda ctx: [ctx.build_dir / "validation.json"])
+def validate_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Check that every icon is a well-formed SVG with a usable size."""
+    errors = {path: error for path, error in state.get("errors", {}).items() if path in ctx.hashes}
+    changed = _changed_files(ctx, state)
+
+    with _process_pool(ctx) as pool:
+        results = pool.map(_validate_timed, [str(ctx.root / path) for path in changed], chunksize=32)
+        for path, (error, seconds, nbytes) in zip(changed, results):
+            ctx.profiler.record_file("validate", path, seconds, nbytes)
+            if error:
+                errors[path] = error
+            else:
+                errors.pop(path, None)
+
+    state["files"] = dict(ctx.hashes)
+    state["errors"] = errors
+    ctx.build_dir.mkdir(parents=True, exist_ok=True)
+    with open(ctx.build_dir / "validation.json", "w") as f:
+        json.dump([{"path": path, "error": error} for path, error in sorted(errors.items())], f, indent=2)
+
+    return {"checked": len(changed), "invalid": len(errors),
+            "errors": [{"path": path, "error": error} for path, error in sorted(errors.items())]}
+
+
+def _index_inputs(ctx: BuildContext):
+    # icons.json is ordered by modification time, so mtimes are part of the input
+    return _digest(sorted((path, ctx.stats[path][1], digest) for path, digest in ctx.hashes.items()))
+
+
+@stage("index", deps=("validate",), inputs=_index_inputs,
+       outputs=lambda ctx: [ctx.root / "icons.json", ctx.root / "categories.json", ctx.root / "icons.sqlite"])
+def index_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Write icons.json, categories.json and the SQLite catalog."""
+    icons = run_index(ctx.root, ctx.profiler)
+    return {"icons": len(icons)}
+
+
+@stage("placeholders", deps=("validate",), outputs=lambda ctx: [ctx.root / PLACEHOLDERS_FILE])
+def placeholders_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Write placeholders.json with a blurred 16x16 preview and dominant colors per icon."""
+    if not have_painter():
+        return {"skipped": "NumPy is not available"}
+
+    # Placeholders are cached by content hash; None marks icons that failed to parse
+    cache = state.setdefault("placeholders", {})
+    missing = sorted({digest: path for path, digest in ctx.hashes.items() if digest not in cache}.items())
+    with _process_pool(ctx) as pool:
+        results = pool.map(placeholder_file, [str(ctx.root / path) for _, path in missing], chunksize=16)
+        for (digest, _), result in zip(missing, results):
+            cache[digest] = result
+
+    live = set(ctx.hashes.values())
+    state["placeholders"] = {digest: entry for digest, entry in cache.items() if digest in live}
+    entries = {placeholder_key(icon): cache[ctx.hashes[icon["path"]]] for icon in ctx.icons
+               if cache[ctx.hashes[icon["path"]]]}
+    write_placeholders(entries, ctx.root)
+    return {"placeholders": len(entries), "painted": len(missing)}
+
+
+@stage("drawio", deps=("validate",), outputs=lambda ctx: [ctx.drawio_dir])
+def drawio_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Encode each category into a draw.io library."""
+    drawio = build_libraries(ctx.root, ctx.drawio_dir, ctx.profiler)
+    return {"libraries": len(drawio)}
+
+
+@stage("optimize", deps=("validate",), outputs=lambda ctx: [ctx.build_dir / "optimized"])
+def optimize_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Write editor-metadata-free copies of all icons to build/optimized."""
+    out_dir = ctx.build_dir / "optimized"
+    state.setdefault("files", {})
+    _remove_deleted(ctx, state, out_dir)
+
+    changed = _changed_files(ctx, state)
+    with _process_pool(ctx) as pool:
+        results = pool.map(_optimize_icon, [(str(ctx.root / p), str(out_dir / p)) for p in changed], chunksize=16)
+        saved = 0
+        for path, (path_saved, seconds, nbytes) in zip(changed, results):
+            ctx.profiler.record_file("optimize", path, seconds, nbytes)
+            saved += path_saved
+
+    state["files"].update((path, ctx.hashes[path]) for path in changed)
+    return {"optimized": len(changed), "bytes_saved": saved}
+
+
+def _optimize_icon(paths):
+    """Optimize one icon; returns (bytes saved, seconds, input bytes)."""
+    start = time.perf_counter()
+    src, dst = paths
+    with open(src, "rb") as f:
+        data = f.read()
+    optimized, _ = minify_svg(data)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    with open(dst, "wb") as f:
+        f.write(optimized)
+    return len(data) - len(optimized), time.perf_counter() - start, len(data)
+
+
+@stage("thumbnails", deps=("optimize",), outputs=lambda ctx: [ctx.build_dir / "thumbnails"])
+def thumbnails_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Render PNG thumbnails of the optimized icons to build/thumbnails."""
+    if not have_renderer():
+        return {"skipped": "CairoSVG is not available"}
+
+    src_dir = ctx.build_dir / "optimized"
+    out_dir = ctx.build_dir / "thumbnails"
+    state.setdefault("files", {})
+    _remove_deleted(ctx, state, out_dir, ".png")
+
+    changed = _changed_files(ctx, state)
+    jobs = [(str(src_dir / p), str(out_dir / (p[:-len(".svg")] + ".png"))) for p in changed]
+    with _process_pool(ctx) as pool:
+        results = []
+        for path, (ok, seconds, nbytes) in zip(changed, pool.map(_render_thumbnail, jobs, chunksize=8)):
+            ctx.profiler.record_file("thumbnails", path, seconds, nbytes)
+            results.append(ok)
+
+    failed = [path for path, ok in zip(changed, results) if not ok]
+    state["files"].update((path, ctx.hashes[path]) for path, ok in zip(changed, results) if ok)
+    return {"rendered": len(changed) - len(failed), "failed": len(failed)}
+
+
+def _render_thumbnail(paths):
+    """Render one thumbnail; returns (success, seconds, input bytes)."""
+    start = time.perf_counter()
+    src, dst = paths
+    try:
+        with open(src, "rb") as f:
+            data = f.read()
+        png = render_png(data, width=THUMBNAIL_SIZE)
+    except Exception:
+        return False, time.perf_counter() - start, 0
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    with open(dst, "wb") as f:
+        f.write(png)
+    return True, time.perf_counter() - start, len(data)
+
+
+@stage("recolor", deps=("optimize",), outputs=lambda ctx: [ctx.build_dir / "themes"])
+def recolor_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Write palette-recolored copies and packs of the optimized icons to build/themes."""
+    if not have_numpy():
+        return {"skipped": "NumPy is not available"}
+
+    src_dir = ctx.build_dir / "optimized"
+    out_dir = ctx.build_dir / "themes"
+    palettes = {theme: list(palette) if palette else None for theme, palette in THEMES.items()}
+    if state.get("palettes") != palettes:
+        # Color maps and outputs of a changed palette are stale
+        state.update(palettes=palettes, files={}, colors={})
+
+    files = state["files"]
+    for path in [path for path in files if path not in ctx.hashes]:
+        for theme in THEMES:
+            target = out_dir / theme / path
+            if target.exists():
+                target.unlink()
+        del files[path]
+
+    changed = _changed_files(ctx, state)
+    # Maps are cached per source color, so only colors new to the library are looked up
+    with _process_pool(ctx) as pool:
+        recolor_tree(src_dir, out_dir, THEMES, changed, cache=state["colors"], executor=pool)
+    files.update((path, ctx.hashes[path]) for path in changed)
+
+    with ThreadPoolExecutor(len(THEMES)) as pool:
+        packs = list(pool.map(lambda theme: write_pack(out_dir / f"{theme}.pack", out_dir / theme), THEMES))
+    return {
+        "recolored": len(changed),
+        "colors": max((len(mapping) for mapping in state["colors"].values()), default=0),
+        "packs": len(packs),
+    }
+
+
+@stage("normalize", deps=("optimize",), outputs=lambda ctx: [ctx.build_dir / "normalized"])
+def normalize_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Write copies of the optimized icons with viewBoxes fitted to their content to build/normalized."""
+    src_dir = ctx.build_dir / "optimized"
+    out_dir = ctx.build_dir / "normalized"
+    options = [NORMALIZE_PADDING, NORMALIZE_SQUARE]
+    if state.get("options") != options:
+        state.update(options=options, files={}, viewboxes={})
+    _remove_deleted(ctx, state, out_dir)
+
+    # viewBoxes are cached by content hash, so renamed or duplicated icons are not measured again
+    viewboxes = state["viewboxes"]
+    changed = _changed_files(ctx, state)
+    jobs = []
+    for path in changed:
+        digest = ctx.hashes[path]
+        # An empty list marks icons already known to be unmeasurable
+        cached = (viewboxes[digest] or []) if digest in viewboxes else None
+        jobs.append((str(src_dir / path), str(out_dir / path), NORMALIZE_PADDING, NORMALIZE_SQUARE, cached))
+    measured = sum(1 for job in jobs if job[4] is None)
+    with _process_pool(ctx) as pool:
+        for path, viewbox in zip(changed, pool.map(normalize_file, jobs, chunksize=16)):
+            viewboxes[ctx.hashes[path]] = viewbox
+
+    live = set(ctx.hashes.values())
+    state["viewboxes"] = {digest: viewbox for digest, viewbox in viewboxes.items() if digest in live}
+    state["files"].update((path, ctx.hashes[path]) for path in changed)
+    unchanged = sum(1 for path in changed if state["viewboxes"][ctx.hashes[path]] is None)
+    return {"normalized": len(changed) - unchanged, "unchanged": unchanged, "measured": measured}
+
+
+@stage("simplify", deps=("optimize",), optional=True,
+       outputs=lambda ctx: [ctx.build_dir / "simplified", ctx.build_dir / "simplify.json"])
+def simplify_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Write node-reduced copies of the optimized icons to build/simplified, guarded by a raster check."""
+    if not have_numpy():
+        return {"skipped": "NumPy is not available"}
+
+    src_dir = ctx.build_dir / "optimized"
+    out_dir = ctx.build_dir / "simplified"
+    options = [DEFAULT_TOLERANCE, DEFAULT_THRESHOLD]
+    if state.get("options") != options:
+        state.update(options=options, files={}, icons={})
+    _remove_deleted(ctx, state, out_dir)
+    icons = {path: stats for path, stats in state["icons"].items() if path in ctx.hashes}
+
+    changed = _changed_files(ctx, state)
+    jobs = [(str(src_dir / p), str(out_dir / p), DEFAULT_TOLERANCE, DEFAULT_THRESHOLD) for p in changed]
+    with _process_pool(ctx) as pool:
+        for path, stats in zip(changed, pool.map(simplify_file, jobs, chunksize=4)):
+            icons[path] = stats
+
+    state["icons"] = icons
+    state["files"].update((path, ctx.hashes[path]) for path in changed)
+    totals = {key: sum(stats[key] for stats in icons.values())
+              for key in ("nodes_before", "nodes_after", "bytes_before", "bytes_after", "simplified", "rejected")}
+    report = sorted(({"path": path, **stats} for path, stats in icons.items()),
+                    key=lambda entry: entry["bytes_before"] - entry["bytes_after"], reverse=True)
+    with open(ctx.build_dir / "simplify.json", "w") as f:
+        json.dump({"totals": totals, "icons": report}, f, indent=2)
+    return {
+        "nodes": f"{totals['nodes_before']} -> {totals['nodes_after']}",
+        "bytes_saved": totals["bytes_before"] - totals["bytes_after"],
+        "rejected_paths": totals["rejected"],
+    }
+
+
+def _compress_sources(ctx: BuildContext) -> List[Path]:
+    sources = [ctx.root / "icons.json", ctx.root / "categories.json", ctx.root / PLACEHOLDERS_FILE]
+    sources += sorted(ctx.drawio_dir.glob("*.xml")) + [ctx.drawio_dir / "categories.json"]
+    sources += sorted((ctx.build_dir / "optimized").glob("*/*/*/*.svg"))
+    return [path for path in sources if path.is_file()]
+
+
+def _compress_targets(path: Path) -> List[Path]:
+    suffixes = COMPRESSED_SUFFIXES if brotli is not None else (".gz",)
+    return [path.with_name(path.name + suffix) for suffix in suffixes]
+
+
+def _compress_inputs(ctx: BuildContext):
+    # Sources are outputs of upstream stages, so they are fingerprinted by their stamps
+    return _digest([(str(path), _stamp(path)) for path in _compress_sources(ctx)])
+
+
+@stage("compress", deps=("index", "placeholders", "optimize", "drawio"), inputs=_compress_inputs,
+       outputs=lambda ctx: [target for path in _compress_sources(ctx) for target in _compress_targets(path)])
+def compress_stage(ctx: BuildContext, state: Dict) -> Dict:
+    """Write .gz (and .br when brotli is installed) siblings of the published files."""
+    sources = _compress_sources(ctx)
+    with ThreadPoolExecutor(ctx.jobs) as pool:
+        results = list(pool.map(_compress_file, sources))
+    written = sum(count for count, _ in results)
+    ctx.profiler.add_bytes("compress", sum(nbytes for _, nbytes in results))
+    return {"files": len(sources), "compressed": written}
+
+
+def _compress_file(path: Path):
+    """
+    Compress one file unless its compressed siblings are up to date.
+
+    Returns:
+        Tuple of (compressed files written, bytes read)
+    """
+    mtime = path.stat().st_mtime_ns
+    compressors = {".gz": lambda data: gzip.compress(data, 9, mtime=0), ".br": lambda data: brotli.compress(data)}
+
+    written = 0
+    data = None
+    for target in _compress_targets(path):
+        compress = compressors[target.suffix]
+        if target.exists() and target.stat().st_mtime_ns >= mtime:
+            continue
+        if data is None:
+            data = path.read_bytes()
+        target.write_bytes(compress(data))
+        written += 1
+    return written, len(data) if data is not None else 0
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+def _load_cache(ctx: BuildContext) -> Dict:
+    try:
+        with open(ctx.build_dir / CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {"version": CACHE_VERSION, "stages": {}}
+    if cache.get("version") != CACHE_VERSION:
+        return {"version": CACHE_VERSION, "stages": {}}
+    return cache
+
+
+def _save_cache(ctx: BuildContext):
+    ctx.build_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = ctx.build_dir / (CACHE_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(ctx.cache, f)
+    os.replace(tmp_path, ctx.build_dir / CACHE_FILE)
+
+
+def resolve_stages(targets: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Return the requested stages plus everything they depend on, in registration order.
+
+    Raises:
+        ValueError: If a target is not a known stage
+    """
+    if not targets:
+        return [name for name, current in STAGES.items() if not current.optional]
+
+    selected = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in STAGES:
+            raise ValueError(f"Unknown stage {name!r}; choose from {', '.join(STAGES)}")
+        if name not in selected:
+            selected.add(name)
+            pending.extend(STAGES[name].deps)
+    return [name for name in STAGES if name in selected]
+
+
+def _run_stage(ctx: BuildContext, current: Stage, keys: Dict[str, str], force: bool) -> Dict:
+    """Run one stage unless its cached result is still valid. Returns its new cache record."""
+    record = ctx.cache["stages"].get(current.name, {})
+    state = json.loads(json.dumps(record.get("state", {})))
+
+    key = None
+    if current.inputs is not None:
+        inputs = current.inputs(ctx)
+        key = _digest([current.name, current.version, inputs, [keys[dep] for dep in current.deps]])
+
+    outputs = [str(path) for path in current.outputs(ctx)]
+    if (not force and key is not None and record.get("key") == key and
+            record.get("outputs") == {path: _stamp(Path(path)) for path in outputs}):
+        ctx.profiler.stage_done(current.name, 0.0, "cached")
+        return dict(record, status="cached", seconds=0.0)
+
+    start = time.perf_counter()
+    summary = current.func(ctx, state)
+    seconds = time.perf_counter() - start
+
+    status = "skipped" if "skipped" in summary else "ran"
+    ctx.profiler.stage_done(current.name, seconds, status)
+    return {
+        # Skipped stages keep no key so that they run once their requirements are met
+        "key": key if status == "ran" else None,
+        "outputs": {path: _stamp(Path(path)) for path in outputs},
+        "state": state,
+        "summary": summary,
+        "status": status,
+        "seconds": seconds,
+    }
+
+
+def run_build(targets: Optional[Iterable[str]] = None, force: bool = False,
+              ctx: Optional[BuildContext] = None) -> Dict[str, Dict]:
+    """
+    Run the build graph.
+
+    Args:
+        targets: Stages to bring up to date (default: all); dependencies are included
+        force: Ignore the cache and run every selected stage
+        ctx: Build context (default: the repository's icon tree)
+
+    Returns:
+        Mapping of stage name to its record (status, seconds, summary)
+    """
+    ctx = ctx or BuildContext()
+    if ctx.profiler:
+        ctx.profiler.start()
+    ctx.cache = _load_cache(ctx)
+    selected = resolve_stages(targets)
+
+    keys: Dict[str, str] = {}
+    results: Dict[str, Dict] = {}
+    pending = list(selected)
+    running = {}
+
+    # Stages run in threads and share ctx's process pool, shut down once every stage is done
+    with closing(ctx), ThreadPoolExecutor(max(1, len(selected))) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = STAGES[name].deps
+                if any(results.get(dep, {}).get("status") == "failed" for dep in deps):
+                    results[name] = {"status": "failed", "error": "dependency failed", "seconds": 0.0}
+                    pending.remove(name)
+                elif all(dep in keys for dep in deps):
+                    running[pool.submit(_run_stage, ctx, STAGES[name], keys, force)] = name
+                    pending.remove(name)
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    record = future.result()
+                except Exception as e:
+                    results[name] = {"status": "failed", "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+                    print(f"{name}: FAILED ({results[name]['error']})")
+                    continue
+
+                results[name] = record
+                keys[name] = record.get("key") or ""
+                ctx.cache["stages"][name] = {k: record[k] for k in ("key", "outputs", "state", "summary")}
+                _report(name, record)
+
+    _save_cache(ctx)
+    if ctx.profiler:
+        ctx.profiler.stop()
+    return results
+
+
+def _report(name: str, record: Dict):
+    # List values (such as validation errors) are printed one entry per line
+    details = {k: v for k, v in record.get("summary", {}).items() if isinstance(v, list)}
+    summary = ", ".join(f"{k}: {v}" for k, v in record.get("summary", {}).items() if k not in details)
+    if record["status"] == "cached":
+        print(f"{name}: up to date")
+    elif record["status"] == "skipped":
+        print(f"{name}: skipped ({record['summary']['skipped']})")
+    else:
+        print(f"{name}: {record['status']} in {record['seconds']:.2f}s ({summary})")
+    for entries in details.values():
+        for entry in entries:
+            print("  " + (f"{entry['path']}: {entry['error']}" if isinstance(entry, dict) else str(entry)))
+
+
+def main():
+    """Run the build from the command line."""
+    parser = argparse.ArgumentParser(description="Build the icon library (cached, incremental)")
+    parser.add_argument("targets", nargs="*", help=f"Stages to build (default: all of {', '.join(STAGES)})")
+    parser.add_argument("--root", "-r", default=str(ICONS_ROOT), help="Icon library root")
+    parser.add_argument("--drawio-dir", default=str(DRAWIO_DIR), help="Output directory for draw.io libraries")
+    parser.add_argument("--build-dir", "-b", default=str(BUILD_DIR), help="Directory for build outputs and cache")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes shared by all stages (default: CPU count)")
+    parser.add_argument("--force", "-f", action="store_true", help="Ignore the cache and rebuild")
+    parser.add_argument("--list", "-l", action="store_true", help="List stages and exit")
+    parser.add_argument("--report", help="Write per-stage status, timings and summaries to this JSON file")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Profile the build: per-stage phases and bytes, slowest icons, written as JSON")
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP,
+                        help=f"Number of slowest icons in the profile (default: {DEFAULT_TOP})")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Also trace Python allocations with tracemalloc (slower)")
+    args = parser.parse_args()
+
+    if args.list:
+        for current in STAGES.values():
+            deps = f" (after {', '.join(current.deps)})" if current.deps else ""
+            optional = " [optional]" if current.optional else ""
+            print(f"{current.name}: {current.description}{deps}{optional}")
+        return 0
+
+    profiler = Profiler(args.profile_top, args.profile_memory) if args.profile else None
+    ctx = BuildContext(args.root, args.drawio_dir, args.build_dir, args.jobs, profiler)
+    try:
+        results = run_build(args.targets, force=args.force, ctx=ctx)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.report:
+        report = {name: {k: record[k] for k in ("status", "seconds", "summary", "error") if k in record}
+                  for name, record in results.items()}
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    if profiler:
+        profiler.write(args.profile)
+        print(profiler.summary())
+        print(f"Profile written to {args.profile}")
+    return 1 if any(record["status"] == "failed" for record in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Icon Catalog - SQLite database of the icon library for ad-hoc queries.
+
+The catalog holds one row per icon with indexed facet columns (name, category,
+license, author, size) and an FTS5 full-text table over names, categories and
+authors. It is updated in place: only icons whose size or mtime changed are
+rewritten, and icons that disappeared from the tree are deleted.
+
+Example:
+    SELECT path FROM icons
+    WHERE license = 'cc-0' AND category = 'Lab_apparatus' AND author = 'Servier'
+      AND size > 100 * 1024
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import warnings
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .tree import ICONS_ROOT, icon_entry, scan_icons
+
+DEFAULT_CATALOG = ICONS_ROOT / "icons.sqlite"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS icons (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    license TEXT NOT NULL,
+    author TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS icons_name ON icons(name);
+CREATE INDEX IF NOT EXISTS icons_category ON icons(category, size);
+CREATE INDEX IF NOT EXISTS icons_license ON icons(license, size);
+CREATE INDEX IF NOT EXISTS icons_author ON icons(author, size);
+CREATE INDEX IF NOT EXISTS icons_facets ON icons(license, category, author, size);
+"""
+
+# External-content FTS table kept in sync with the icons table by triggers.
+# '_' and '-' separate tokens so that e.g. "Lab_apparatus" matches "apparatus".
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS icons_fts USING fts5(
+    name, category, author,
+    content='icons', content_rowid='id',
+    tokenize="unicode61 separators '_-'"
+);
+CREATE TRIGGER IF NOT EXISTS icons_fts_insert AFTER INSERT ON icons BEGIN
+    INSERT INTO icons_fts(rowid, name, category, author)
+    VALUES (new.id, new.name, new.category, new.author);
+END;
+CREATE TRIGGER IF NOT EXISTS icons_fts_delete AFTER DELETE ON icons BEGIN
+    INSERT INTO icons_fts(icons_fts, rowid, name, category, author)
+    VALUES ('delete', old.id, old.name, old.category, old.author);
+END;
+CREATE TRIGGER IF NOT EXISTS icons_fts_update AFTER UPDATE OF name, category, author ON icons BEGIN
+    INSERT INTO icons_fts(icons_fts, rowid, name, category, author)
+    VALUES ('delete', old.id, old.name, old.category, old.author);
+    INSERT INTO icons_fts(rowid, name, category, author)
+    VALUES (new.id, new.name, new.category, new.author);
+END;
+"""
+
+COLUMNS = ("path", "name", "category", "license", "author", "size", "mtime_ns")
+
+
+def connect(db_path: Union[str, Path] = DEFAULT_CATALOG) -> sqlite3.Connection:
+    """
+    Open (and if necessary create) a catalog database.
+
+    Args:
+        db_path: Path to the SQLite file
+
+    Returns:
+        Connection with rows accessible by column name
+    """
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        conn.close()
+        raise ValueError(f"Unsupported catalog schema version {version}: {db_path}")
+
+    conn.executescript(SCHEMA)
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        # SQLite builds without FTS5 still get the indexed facet table
+        warnings.warn(f"Full-text search unavailable ({e})", RuntimeWarning, stacklevel=2)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def has_fts(conn: sqlite3.Connection) -> bool:
+    """Check whether the catalog has its full-text table."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'icons_fts'").fetchone()
+    return row is not None
+
+
+def update_catalog(db_path: Union[str, Path] = DEFAULT_CATALOG,
+                   root: Union[str, Path] = ICONS_ROOT,
+                   icons: Optional[List[Dict[str, str]]] = None) -> Dict[str, int]:
+    """
+    Bring the catalog in line with the icon tree.
+
+    Args:
+        db_path: Path to the SQLite file (created if missing)
+        root: Library root directory
+        icons: Icon entries from scan_icons, if the caller already scanned the tree
+
+    Returns:
+        Dictionary with counts of added, updated, removed and unchanged rows
+    """
+    root = str(root)
+    if icons is None:
+        icons = scan_icons(root)
+
+    stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+    conn = connect(db_path)
+    try:
+        existing = {
+            row["path"]: (row["id"], row["size"], row["mtime_ns"])
+            for row in conn.execute("SELECT id, path, size, mtime_ns FROM icons")
+        }
+
+        inserts, updates = [], []
+        for icon in icons:
+            st = os.stat(os.path.join(root, icon["path"]))
+            row = existing.pop(icon["path"], None)
+            if row is None:
+                inserts.append((icon["path"], icon["name"], icon["category"], icon["license"],
+                                icon["author"], st.st_size, st.st_mtime_ns))
+            elif (row[1], row[2]) != (st.st_size, st.st_mtime_ns):
+                updates.append((st.st_size, st.st_mtime_ns, row[0]))
+            else:
+                stats["unchanged"] += 1
+
+        # Whatever is left in existing is no longer in the tree
+        with conn:
+            conn.executemany(
+                f"INSERT INTO icons ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                inserts
+            )
+            conn.executemany("UPDATE icons SET size = ?, mtime_ns = ? WHERE id = ?", updates)
+            conn.executemany("DELETE FROM icons WHERE id = ?", [(row[0],) for row in existing.values()])
+
+        stats["added"] = len(inserts)
+        stats["updated"] = len(updates)
+        stats["removed"] = len(existing)
+    finally:
+        conn.close()
+
+    return stats
+
+
+def update_paths(db_path: Union[str, Path] = DEFAULT_CATALOG,
+                 root: Union[str, Path] = ICONS_ROOT,
+                 paths: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    Bring the catalog rows of some icons in line with the tree.
+
+    Only the given paths are looked at, so the cost does not depend on the size of
+    the library: existing icons are inserted or updated, missing ones deleted.
+
+    Args:
+        db_path: Path to the SQLite file (created if missing)
+        root: Library root directory
+        paths: Icon paths relative to root (license/category/author/icon.svg)
+
+    Returns:
+        Dictionary with counts of added, updated, removed and unchanged rows
+    """
+    root = str(root)
+    stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+    conn = connect(db_path)
+    try:
+        with conn:
+            for path in paths:
+                row = conn.execute("SELECT id, size, mtime_ns FROM icons WHERE path = ?", (path,)).fetchone()
+                try:
+                    st = os.stat(os.path.join(root, path))
+                except FileNotFoundError:
+                    if row is not None:
+                        conn.execute("DELETE FROM icons WHERE id = ?", (row["id"],))
+                        stats["removed"] += 1
+                    continue
+                if row is None:
+                    icon = icon_entry(path)
+                    conn.execute(
+                        f"INSERT INTO icons ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                        (path, icon["name"], icon["category"], icon["license"], icon["author"],
+                         st.st_size, st.st_mtime_ns)
+                    )
+                    stats["added"] += 1
+                elif (row["size"], row["mtime_ns"]) != (st.st_size, st.st_mtime_ns):
+                    conn.execute("UPDATE icons SET size = ?, mtime_ns = ? WHERE id = ?",
+                                 (st.st_size, st.st_mtime_ns, row["id"]))
+                    stats["updated"] += 1
+                else:
+                    stats["unchanged"] += 1
+    finally:
+        conn.close()
+
+    return stats
+
+
+def find(conn: sqlite3.Connection, name: Optional[str] = None, category: Optional[str] = None,
+         license: Optional[str] = None, author: Optional[str] = None,
+         min_size: Optional[int] = None, max_size: Optional[int] = None) -> List[sqlite3.Row]:
+    """
+    Return icons matching all given facets, answered from the facet indexes.
+
+    Args:
+        conn: Connection from connect()
+        name, category, license, author: Exact facet values
+        min_size, max_size: File size bounds in bytes (inclusive)
+
+    Returns:
+        Matching rows ordered by path
+    """
+    clauses, params = [], []
+    for column, value in (("name", name), ("category", category), ("license", license), ("author", author)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if min_size is not None:
+        clauses.append("size >= ?")
+        params.append(min_size)
+    if max_size is not None:
+        clauses.append("size <= ?")
+        params.append(max_size)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return conn.execute(f"SELECT * FROM icons {where} ORDER BY path", params).fetchall()
+
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query that cannot be a syntax error.
+
+    Every whitespace-separated word becomes a quoted prefix term, so input
+    like "sars-cov-2", "AND" or an unbalanced quote is matched literally.
+
+    Returns:
+        The query, or "" if the text has no words
+    """
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in text.split())
+
+
+def search(conn: sqlite3.Connection, text: str, limit: int = 50) -> List[sqlite3.Row]:
+    """
+    Full-text search over icon names, categories and authors.
+
+    Args:
+        conn: Connection from connect()
+        text: FTS5 query, e.g. "cell" or "category:apparatus pipette*";
+            use fts_query() for untrusted input
+        limit: Maximum number of results
+
+    Returns:
+        Matching rows, best matches first
+    """
+    return conn.execute(
+        "SELECT icons.* FROM icons_fts JOIN icons ON icons.id = icons_fts.rowid "
+        "WHERE icons_fts MATCH ? ORDER BY rank LIMIT ?",
+        (text, limit)
+    ).fetchall()
+
+
+def main():
+    """Update the catalog or query it from the command line."""
+    parser = argparse.ArgumentParser(description="Build and query the SQLite icon catalog")
+    parser.add_argument("--root", "-r", default=str(ICONS_ROOT), help="Icon library root")
+    parser.add_argument("--db", "-d", default=str(DEFAULT_CATALOG), help="Catalog database file")
+    parser.add_argument("--search", "-s", help="Full-text query to run instead of updating")
+    args = parser.parse_args()
+
+    if args.search:
+        conn = connect(args.db)
+        for row in search(conn, args.search):
+            print(row["path"])
+        conn.close()
+        return 0
+
+    stats = update_catalog(args.db, args.root)
+    print(f"Catalog: {args.db}")
+    print(f"Added: {stats['added']}, updated: {stats['updated']}, "
+          f"removed: {stats['removed']}, unchanged: {stats['unchanged']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Delta Deploy - Publishes only the files that changed since the last deployment.
+
+Every deployment carries a manifest (deploy-manifest.json at the site root) with
+the size and SHA-256 of each published file. Comparing the manifest of a fresh
+build with the one currently deployed gives the added, modified and deleted
+paths, so the upload and the CDN invalidation can be limited to them:
+
+    python -m bioicons.deploy delta dist --previous site/deploy-manifest.json --output build/delta
+    python -m bioicons.deploy apply build/delta site
+
+`delta` writes the new manifest into the build, copies changed files into
+<output>/files and lists the changes in <output>/delta.json, grouped by artifact
+(icons, index, draw.io libraries, pack, site). `apply` brings a checkout of the
+deployed site up to date from a delta. Without a previous manifest every file
+counts as added and the delta is marked full; such a delta cannot be applied,
+since it does not know what to delete, and the whole site must be published.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+MANIFEST_NAME = "deploy-manifest.json"
+DELTA_NAME = "delta.json"
+MANIFEST_VERSION = 1
+
+# Published artifacts by path; the first matching rule wins
+ARTIFACTS = (
+    ("drawio", lambda p: p.startswith("drawio-lib/")),
+    ("pack", lambda p: p.startswith("icons/icons.pack")),
+    ("index", lambda p: p.startswith("icons/") and p.count("/") == 1 and ".json" in p),
+    ("icons", lambda p: p.startswith("icons/") and p.endswith(".svg")),
+)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def artifact_of(path: str) -> str:
+    """Name of the published artifact a site path belongs to."""
+    for name, matches in ARTIFACTS:
+        if matches(path):
+            return name
+    return "site"
+
+
+def build_manifest(site_dir: Union[str, Path], jobs: Optional[int] = None) -> Dict:
+    """
+    Hash every file of a built site.
+
+    Args:
+        site_dir: Directory about to be published
+        jobs: Hashing threads
+
+    Returns:
+        Manifest dictionary with a files mapping of relative path to
+        {"size", "sha256"}
+    """
+    site_dir = Path(site_dir)
+    paths = sorted(
+        path.relative_to(site_dir).as_posix()
+        for path in site_dir.rglob("*")
+        if path.is_file() and path.name != MANIFEST_NAME
+    )
+    with ThreadPoolExecutor(jobs or os.cpu_count() or 1) as pool:
+        digests = list(pool.map(lambda p: _sha256(site_dir / p), paths))
+    return {
+        "version": MANIFEST_VERSION,
+        "files": {
+            path: {"size": (site_dir / path).stat().st_size, "sha256": digest}
+            for path, digest in zip(paths, digests)
+        },
+    }
+
+
+def load_manifest(source: Optional[str]) -> Optional[Dict]:
+    """
+    Load a deployed manifest from a file or an http(s) URL.
+
+    Returns:
+        The manifest, or None if there is none (first deployment) or it is
+        from an incompatible version
+    """
+    if not source:
+        return None
+    try:
+        if source.startswith(("http://", "https://")):
+            with urllib.request.urlopen(source, timeout=30) as response:
+                manifest = json.load(response)
+        else:
+            with open(source) as f:
+                manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"No previous manifest ({e}); deploying everything")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        print("Previous manifest has another version; deploying everything")
+        return None
+    return manifest
+
+
+def diff_manifests(previous: Optional[Dict], current: Dict) -> Dict[str, List[str]]:
+    """
+    Compare two manifests.
+
+    Returns:
+        Dictionary of sorted added, modified and deleted paths
+    """
+    old = previous["files"] if previous else {}
+    new = current["files"]
+    return {
+        "added": sorted(path for path in new if path not in old),
+        "modified": sorted(path for path in new if path in old and old[path]["sha256"] != new[path]["sha256"]),
+        "deleted": sorted(path for path in old if path not in new),
+    }
+
+
+def write_delta(site_dir: Union[str, Path], out_dir: Union[str, Path], previous: Optional[Dict],
+                jobs: Optional[int] = None) -> Dict:
+    """
+    Prepare a delta deployment of a built site.
+
+    Writes the new manifest into site_dir, the changed files (and the manifest)
+    into out_dir/files and the change list into out_dir/delta.json.
+
+    Args:
+        site_dir: Directory about to be published
+        out_dir: Delta directory, replaced if it exists
+        previous: Manifest of the current deployment, or None
+        jobs: Hashing threads
+
+    Returns:
+        The delta: added, modified and deleted paths, changed artifacts, and
+        byte counts of the delta and the full site
+    """
+    site_dir, out_dir = Path(site_dir), Path(out_dir)
+    manifest = build_manifest(site_dir, jobs)
+    changes = diff_manifests(previous, manifest)
+
+    artifacts: Dict[str, List[str]] = {}
+    for kind in ("added", "modified", "deleted"):
+        for path in changes[kind]:
+            artifacts.setdefault(artifact_of(path), []).append(path)
+
+    files = manifest["files"]
+    delta = {
+        **changes,
+        "artifacts": {name: sorted(paths) for name, paths in sorted(artifacts.items())},
+        "bytes": sum(files[path]["size"] for path in changes["added"] + changes["modified"]),
+        "total_bytes": sum(entry["size"] for entry in files.values()),
+        "full": previous is None,
+    }
+
+    with open(site_dir / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    for path in changes["added"] + changes["modified"] + [MANIFEST_NAME]:
+        target = out_dir / "files" / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(site_dir / path, target)
+    with open(out_dir / DELTA_NAME, "w") as f:
+        json.dump(delta, f, indent=2)
+    return delta
+
+
+def apply_delta(delta_dir: Union[str, Path], site_dir: Union[str, Path]) -> Dict:
+    """
+    Update a copy of the deployed site from a delta.
+
+    Args:
+        delta_dir: Output directory of write_delta()
+        site_dir: Deployed site (e.g. a gh-pages checkout)
+
+    Returns:
+        The applied delta
+
+    Raises:
+        ValueError: If the delta is full (made without a previous manifest), as
+            it cannot tell which deployed files to delete
+    """
+    delta_dir, site_dir = Path(delta_dir), Path(site_dir)
+    with open(delta_dir / DELTA_NAME) as f:
+        delta = json.load(f)
+    if delta["full"]:
+        raise ValueError("Full delta: files removed since the last deployment are unknown; publish the whole site")
+    files = delta_dir / "files"
+    for source in files.rglob("*"):
+        if source.is_file():
+            target = site_dir / source.relative_to(files)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+    for path in delta["deleted"]:
+        target = site_dir / path
+        if target.is_file():
+            target.unlink()
+            # Drop directories emptied by the deletion
+            parent = target.parent
+            while parent != site_dir and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+    return delta
+
+
+def main():
+    """Create or apply a delta deployment from the command line."""
+    parser = argparse.ArgumentParser(description="Deploy only the files that changed")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    delta_parser = commands.add_parser("delta", help="Compare a built site with the deployed manifest")
+    delta_parser.add_argument("site", help="Built site directory (e.g. dist)")
+    delta_parser.add_argument("--previous", "-p", help="Deployed manifest file or URL")
+    delta_parser.add_argument("--output", "-o", default="build/delta", help="Delta directory")
+    delta_parser.add_argument("--jobs", "-j", type=int, help="Hashing threads (default: CPU count)")
+
+    apply_parser = commands.add_parser("apply", help="Update a deployed site checkout from a delta")
+    apply_parser.add_argument("delta", help="Delta directory")
+    apply_parser.add_argument("site", help="Deployed site directory")
+    args = parser.parse_args()
+
+    if args.command == "delta":
+        delta = write_delta(args.site, args.output, load_manifest(args.previous), args.jobs)
+        print(f"Added {len(delta['added'])}, modified {len(delta['modified'])}, deleted {len(delta['deleted'])} "
+              f"({delta['bytes'] / 1e6:.1f} of {delta['total_bytes'] / 1e6:.1f} MB)")
+        for name, paths in delta["artifacts"].items():
+            print(f"  {name}: {len(paths)} changed")
+    else:
+        try:
+            delta = apply_delta(args.delta, args.site)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"Applied {len(delta['added']) + len(delta['modified'])} updates and "
+              f"{len(delta['deleted'])} deletions to {args.site}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Draw.io Libraries - Encodes the icon library into draw.io XML libraries.
+
+Each category becomes one <mxlibrary> file holding its icons as base64 encoded
+data URIs. drawio does not support per icon licenses, we therefore add the license
+and author info to the title.
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import xml
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .profiling import Profiler, get_profiler
+from .tree import ICONS_ROOT, scan_icons
+
+DRAWIO_DIR = ICONS_ROOT.parent / "drawio-lib"
+
+# Libraries larger than this are not published
+MAX_LIBRARY_MB = 50
+
+licenses = {
+    "cc-0": {
+        "name": "CC0",
+        "modules": ["nocopyright"],
+        "url": "https://creativecommons.org/publicdomain/zero/1.0/",
+    },
+    "cc-by-3.0": {
+        "name": "CC-BY 3.0 Unported",
+        "modules": ["by"],
+        "url": "https://creativecommons.org/licenses/by/3.0/",
+    },
+    "cc-by-4.0": {
+        "name": "CC-BY 4.0 Unported",
+        "modules": ["by"],
+        "url": "https://creativecommons.org/licenses/by/4.0/",
+    },
+    "cc-by-sa-4.0": {
+        "name": "CC-BY SA 4.0",
+        "modules": ["by", "sa"],
+        "url": "https://creativecommons.org/licenses/by-sa/4.0/",
+    },
+    "cc-by-sa-3.0": {
+        "name": "CC-BY SA 3.0",
+        "modules": ["by", "sa"],
+        "url": "https://creativecommons.org/licenses/by-sa/3.0/",
+    },
+    "cc-by-nc-sa-4.0": {
+        "name": "CC-BY NC SA 4.0",
+        "modules": ["by", "sa", "nc"],
+        "url": "https://creativecommons.org/licenses/by-nc-sa/4.0/",
+    },
+    "cc-by-nc-sa-3.0": {
+        "name": "CC-BY NC SA 3.0",
+        "modules": ["by", "sa", "nc"],
+        "url": "https://creativecommons.org/licenses/by-nc-sa/3.0/",
+    },
+    "cc-by-nc-3.0": {
+        "name": "CC-BY NC 3.0",
+        "modules": ["by", "nc"],
+        "url": "https://creativecommons.org/licenses/by-nc/3.0/",
+    },
+    "cc-by-nd-3.0": {
+        "name": "CC-BY ND 3.0",
+        "modules": ["by", "nd"],
+        "url": "https://creativecommons.org/licenses/by-nd/3.0/",
+    },
+    "mit": {
+        "name": "MIT",
+        "modules": ["retaincopyrightnotice"],
+        "url": "https://mit-license.org/",
+    },
+    "gpl-2": {
+        "name": "GPLv2",
+        "modules": ["retaincopyrightnotice", "statechanges", "sa"],
+        "url": "https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt",
+    },
+    "asl": {
+        "name": "Apache License",
+        "modules": ["retaincopyrightnotice", "statechanges"],
+        "url": "https://www.apache.org/licenses/LICENSE-2.0.txt",
+    },
+    "gpl-3": {
+        "name": "GPLv3",
+        "modules": ["retaincopyrightnotice", "statechanges", "sa"],
+        "url": "https://www.gnu.org/licenses/gpl-3.0.txt",
+    },
+    "bsd": {
+        "name": "BSD",
+        "modules": ["retaincopyrightnotice", "noendorsement"],
+        "url": "https://opensource.org/licenses/BSD-3-Clause",
+    },
+}
+
+
+def get_size(file_path, unit='bytes'):
+    file_size = os.path.getsize(file_path)
+    exponents_map = {'bytes': 0, 'kb': 1, 'mb': 2, 'gb': 3}
+    if unit not in exponents_map:
+        raise ValueError("Must select from \
+        ['bytes', 'kb', 'mb', 'gb']")
+    else:
+        size = file_size / 1024 ** exponents_map[unit]
+        return round(size, 3)
+
+
+def get_width_height(icon):
+    try:
+        tree = ET.parse(icon)
+        root = tree.getroot()
+        viewBox = root.attrib["viewBox"]
+        width, height = viewBox.split(" ")[2:]
+        return float(width), float(height)
+    except KeyError:
+        if "height" in root.attrib.keys():
+            height = root.attrib["height"]
+        else:
+            height = 100
+        if "width" in root.attrib.keys():
+            width = root.attrib["width"]
+        else:
+            width = 100
+        return float(width), float(height)
+    except xml.etree.ElementTree.ParseError:
+        return float(100), float(100)
+
+
+def library_filename(category: str) -> str:
+    """File name of the draw.io library for a category."""
+    return "Bioicons-" + category.replace(" ", "_") + ".xml"
+
+
+def drawio_item(icon: Dict[str, str], root: Union[str, Path] = ICONS_ROOT,
+                size: Optional[Tuple[float, float]] = None,
+                profiler: Optional[Profiler] = None) -> Dict:
+    """
+    Encode one icon as a draw.io library item.
+
+    Args:
+        icon: Icon entry from scan_icons
+        root: Library root directory
+        size: Known (width, height); parsed from the file when omitted
+        profiler: Records parse and encode time per icon
+
+    Returns:
+        Dictionary in the draw.io library item format
+    """
+    profiler = get_profiler(profiler)
+    start = time.perf_counter()
+    path = os.path.join(str(root), icon["path"])
+    with profiler.phase("drawio", "parse"):
+        w, h = size if size is not None else get_width_height(path)
+    # Unknown license directories are shown by their directory name
+    license_name = licenses.get(icon["license"], {"name": icon["license"]})["name"]
+    with open(path, "rb") as f, profiler.phase("drawio", "encode") as phase:
+        raw = f.read()
+        data = base64.b64encode(raw).decode("utf-8")
+        phase.bytes = len(raw)
+    if profiler:
+        profiler.record_file("drawio", icon["path"], time.perf_counter() - start, len(raw))
+    return {
+        "title": f"{icon['name']} | {license_name} {icon['author']}",
+        "data": "data:image/svg+xml;base64," + data,
+        "w": w,
+        "h": h,
+        "aspect": "fixed",
+    }
+
+
+def write_library(category: str, items: List[Dict],
+                  out_dir: Union[str, Path] = DRAWIO_DIR,
+                  profiler: Optional[Profiler] = None) -> Optional[Dict]:
+    """
+    Write the library file for one category.
+
+    Returns:
+        The categories.json entry for the library, or None if it was too big
+        to publish (the file is removed in that case)
+    """
+    out_path = os.path.join(str(out_dir), library_filename(category))
+    with get_profiler(profiler).phase("drawio", "write") as phase:
+        library = "<mxlibrary>" + json.dumps(items) + "</mxlibrary>"
+        with open(out_path, "w") as outfile:
+            outfile.write(library)
+        phase.bytes = len(library)
+
+    file_size = get_size(out_path, "mb")
+    if file_size < MAX_LIBRARY_MB:
+        return {"n": len(items), "file": library_filename(category)}
+
+    print(category.replace(" ", "_"), "is too big", file_size, "MB")
+    os.remove(out_path)
+    return None
+
+
+def write_categories(drawio: Dict[str, Dict], out_dir: Union[str, Path] = DRAWIO_DIR):
+    """Write the draw.io categories.json listing all published libraries."""
+    with open(os.path.join(str(out_dir), "categories.json"), "w") as outfile:
+        json.dump(drawio, outfile)
+
+
+def build_libraries(root: Union[str, Path] = ICONS_ROOT,
+                    out_dir: Union[str, Path] = DRAWIO_DIR,
+                    profiler: Optional[Profiler] = None) -> Dict[str, Dict]:
+    """
+    Encode the whole library into one draw.io library per category.
+
+    Args:
+        root: Library root directory
+        out_dir: Output directory for the libraries
+        profiler: Records glob, parse, encode and write time
+
+    Returns:
+        The categories.json mapping that was written
+    """
+    os.makedirs(str(out_dir), exist_ok=True)
+
+    # iterates over all svg files organized as license/category/author/icon.svg
+    with get_profiler(profiler).phase("drawio", "glob"):
+        found = scan_icons(root)
+
+    icons = defaultdict(list)
+    for icon in found:
+        icons[icon["category"]].append(drawio_item(icon, root, profiler=profiler))
+
+    drawio = {}
+    for category in sorted(icons):
+        entry = write_library(category, icons[category], out_dir, profiler)
+        if entry is not None:
+            drawio[category] = entry
+
+    write_categories(drawio, out_dir)
+    return drawio
+
+
+def main():
+    """Build the draw.io libraries from the command line."""
+    parser = argparse.ArgumentParser(description="Encode the icon library into draw.io libraries")
+    parser.add_argument("--root", "-r", default=str(ICONS_ROOT), help="Icon library root")
+    parser.add_argument("--output", "-o", default=str(DRAWIO_DIR), help="Output directory for the libraries")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Write a JSON profile of glob, parse, encode and write time and the slowest icons")
+    args = parser.parse_args()
+
+    profiler = Profiler() if args.profile else None
+    if profiler:
+        profiler.start()
+    with get_profiler(profiler).stage("drawio"):
+        drawio = build_libraries(args.root, args.output, profiler)
+    if profiler:
+        profiler.stop()
+        profiler.write(args.profile)
+        print(profiler.summary())
+    print(f"Wrote {len(drawio)} draw.io libraries to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+PNG Export - Renders the whole library to PNG at publication resolutions.
+
+    python -m bioicons.export --dpi 300 600
+
+Icons are rendered on a process pool into <output>/<dpi>dpi/<license>/<category>/
+<author>/<icon>.png, sized from the icon's physical size (96 px per inch), with the
+DPI recorded in the PNG so that word processors place them at the right size.
+
+Progress is appended to <output>/manifest.jsonl as each icon finishes, so an
+interrupted export picks up where it stopped. Icons whose source hash and output
+are unchanged since the recorded render are skipped. Per-category zip archives
+are then written file by file straight to disk, rebuilt only for categories that
+changed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import zipfile
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .render import have_renderer, render_png
+from .tree import ICONS_ROOT, scan_icons
+
+EXPORT_DIR = ICONS_ROOT.parent.parent / "build" / "png"
+DEFAULT_DPIS = (300, 600)
+MANIFEST = "manifest.jsonl"
+# Bump when rendering changes so that earlier exports are redone
+RENDER_VERSION = 1
+
+CSS_DPI = 96
+
+
+def _sha256(path: Union[str, Path]) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def set_png_dpi(png: bytes, dpi: float) -> bytes:
+    """Insert (or replace) the pHYs chunk so the PNG carries its resolution."""
+    pixels_per_meter = round(dpi / 0.0254)
+    data = struct.pack(">IIB", pixels_per_meter, pixels_per_meter, 1)
+    chunk = struct.pack(">I", len(data)) + b"pHYs" + data + struct.pack(">I", zlib.crc32(b"pHYs" + data))
+
+    # Signature (8) + IHDR chunk (8 + 13 + 4); pHYs must come before IDAT
+    pos = 33
+    out = [png[:pos], chunk]
+    while pos < len(png):
+        length, kind = struct.unpack(">I4s", png[pos:pos + 8])
+        end = pos + 12 + length
+        if kind != b"pHYs":
+            out.append(png[pos:end])
+        pos = end
+    return b"".join(out)
+
+
+def render_icon(job: Tuple[str, List[Tuple[int, str]]]) -> List[Tuple[int, Optional[str], Optional[str]]]:
+    """
+    Render one icon at several resolutions.
+
+    Args:
+        job: (source path, [(dpi, destination path), ...])
+
+    Returns:
+        [(dpi, PNG sha256 or None, error or None), ...]
+    """
+    src, targets = job
+    with open(src, "rb") as f:
+        svg = f.read()
+    results = []
+    for dpi, dst in targets:
+        try:
+            # Physical units are converted at 96 DPI and everything is then scaled,
+            # so 1 in always becomes dpi pixels whatever unit the icon uses
+            png = set_png_dpi(render_png(svg, dpi=CSS_DPI, scale=dpi / CSS_DPI), dpi)
+        except Exception as e:
+            results.append((dpi, None, f"{type(e).__name__}: {e}"))
+            continue
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp = dst + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(png)
+        os.replace(tmp, dst)
+        results.append((dpi, hashlib.sha256(png).hexdigest(), None))
+    return results
+
+
+class Manifest:
+    """
+    Append-only record of finished renders, replayed on start.
+
+    Each line is {"path", "dpi", "source", "png", "version"}; later lines win.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        # (icon path, dpi) -> record
+        self.records: Dict[Tuple[str, int], Dict] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn last line of an interrupted run
+                        continue
+                    self.records[(record["path"], record["dpi"])] = record
+        self._log = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._log = open(self.path, "a")
+        return self
+
+    def __exit__(self, *exc):
+        self._log.close()
+        self._log = None
+
+    def is_current(self, path: str, dpi: int, source: str, output: Path) -> bool:
+        """Whether an output exists and was rendered from this source by this version."""
+        record = self.records.get((path, dpi))
+        return (record is not None and record["source"] == source and record["version"] == RENDER_VERSION
+                and output.is_file() and output.stat().st_size == record.get("size"))
+
+    def add(self, path: str, dpi: int, source: str, png: str, size: int):
+        """Record a finished render and flush it to disk."""
+        record = {"path": path, "dpi": dpi, "source": source, "png": png, "size": size,
+                  "version": RENDER_VERSION}
+        self.records[(path, dpi)] = record
+        self._log.write(json.dumps(record) + "\n")
+        self._log.flush()
+
+    def compact(self, keep: Iterable[Tuple[str, int]]):
+        """Rewrite the log with one line per live render."""
+        keep = set(keep)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w") as f:
+            for key, record in sorted(self.records.items()):
+                if key in keep:
+                    f.write(json.dumps(record) + "\n")
+        os.replace(tmp, self.path)
+
+
+def png_path(out_dir: Path, dpi: int, icon_path: str) -> Path:
+    """Output file of an icon at a resolution."""
+    return out_dir / f"{dpi}dpi" / (icon_path[:-len(".svg")] + ".png")
+
+
+def write_zip(archive: Path, files: Sequence[Tuple[Path, str]]):
+    """
+    Write a zip archive from files on disk, one at a time.
+
+    PNGs are already deflated, so entries are stored rather than compressed again.
+    """
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    tmp = archive.with_name(archive.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for path, arcname in files:
+            zf.write(path, arcname)
+    os.replace(tmp, archive)
+
+
+def export_library(root: Union[str, Path] = ICONS_ROOT, out_dir: Union[str, Path] = EXPORT_DIR,
+                   dpis: Sequence[int] = DEFAULT_DPIS, jobs: Optional[int] = None,
+                   zips: bool = True) -> Dict:
+    """
+    Render every icon at the given resolutions.
+
+    Args:
+        root: Library root directory
+        out_dir: Export directory (PNG trees, zips and the manifest)
+        dpis: Resolutions to render
+        jobs: Worker processes
+        zips: Also write per-category zip archives to out_dir/zips
+
+    Returns:
+        Counts of rendered, skipped and failed renders and of zips written
+    """
+    if not have_renderer():
+        raise RuntimeError("CairoSVG is not available; install cairosvg and the Cairo library")
+    root, out_dir = Path(root), Path(out_dir)
+    icons = scan_icons(root)
+    stats = {"rendered": 0, "skipped": 0, "failed": 0, "zips": 0}
+
+    with Manifest(out_dir / MANIFEST) as manifest:
+        work = []
+        sources = {}
+        for icon in icons:
+            sources[icon["path"]] = _sha256(root / icon["path"])
+            targets = [(dpi, str(png_path(out_dir, dpi, icon["path"]))) for dpi in dpis
+                       if not manifest.is_current(icon["path"], dpi, sources[icon["path"]],
+                                                  png_path(out_dir, dpi, icon["path"]))]
+            stats["skipped"] += len(dpis) - len(targets)
+            if targets:
+                work.append((icon, targets))
+
+        changed_categories = set()
+        with ProcessPoolExecutor(jobs) as pool:
+            futures = {pool.submit(render_icon, (str(root / icon["path"]), targets)): icon
+                       for icon, targets in work}
+            for done, future in enumerate(as_completed(futures), 1):
+                icon = futures[future]
+                for dpi, digest, error in future.result():
+                    if error:
+                        stats["failed"] += 1
+                        print(f"  failed: {icon['path']} at {dpi} DPI: {error}")
+                        continue
+                    size = png_path(out_dir, dpi, icon["path"]).stat().st_size
+                    manifest.add(icon["path"], dpi, sources[icon["path"]], digest, size)
+                    stats["rendered"] += 1
+                changed_categories.add(icon["category"])
+                if done % 100 == 0 or done == len(futures):
+                    print(f"  {done}/{len(futures)} icons rendered")
+
+        live = [(icon["path"], dpi) for icon in icons for dpi in dpis]
+        manifest.compact(live)
+
+    if zips:
+        members = defaultdict(list)
+        for icon in icons:
+            for dpi in dpis:
+                path = png_path(out_dir, dpi, icon["path"])
+                if path.is_file():
+                    members[icon["category"]].append((path, f"{dpi}dpi/{path.relative_to(out_dir / f'{dpi}dpi')}"))
+        for category, files in sorted(members.items()):
+            archive = out_dir / "zips" / f"Bioicons-{category.replace(' ', '_')}-png.zip"
+            if category in changed_categories or not archive.exists():
+                write_zip(archive, files)
+                stats["zips"] += 1
+    return stats
+
+
+def main():
+    """Export the library to PNG from the command line."""
+    parser = argparse.ArgumentParser(description="Render the icon library to PNG at publication resolutions")
+    parser.add_argument("--root", "-r", default=str(ICONS_ROOT), help="Icon library root")
+    parser.add_argument("--output", "-o", default=str(EXPORT_DIR), help="Export directory")
+    parser.add_argument("--dpi", type=int, nargs="+", default=list(DEFAULT_DPIS),
+                        help="Resolutions to render (default: 300 600)")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-zip", action="store_true", help="Skip the per-category zip archives")
+    args = parser.parse_args()
+
+    try:
+        stats = export_library(args.root, args.output, args.dpi, args.jobs, zips=not args.no_zip)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Rendered {stats['rendered']}, up to date {stats['skipped']}, failed {stats['failed']}, "
+          f"zips written {stats['zips']}")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,637 @@
+"""
+SVG Geometry - Path parsing, transforms and exact content bounds.
+
+Path data is parsed into absolute segments using only M, L, Q, C and Z: H/V become
+lines, S/T are expanded with their reflected control points, and elliptical arcs
+are converted to cubic Béziers (at most 90° each). Because these segment types
+stay exact under affine maps, transforms are applied to the control points and
+curve extrema are solved afterwards, giving tight bounds in the target space.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Affine matrix (a, b, c, d, e, f): x' = a*x + c*y + e, y' = b*x + d*y + f
+Matrix = Tuple[float, float, float, float, float, float]
+Segment = Tuple[str, Tuple[float, ...]]
+Bounds = Tuple[float, float, float, float]
+
+IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+# Cubic approximation of a quarter circle
+KAPPA = 0.5522847498307936
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+# Containers whose content is only drawn when referenced
+NON_RENDERED = {
+    "defs", "clipPath", "mask", "symbol", "marker", "pattern", "linearGradient",
+    "radialGradient", "filter", "metadata", "title", "desc", "style", "script", "font",
+}
+TEXT_ELEMENTS = {"text", "tspan", "textPath", "flowRoot"}
+
+UNITS = {"": 1.0, "px": 1.0, "pt": 4 / 3, "pc": 16.0, "mm": 96 / 25.4, "cm": 96 / 2.54, "in": 96.0}
+
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_LENGTH_RE = re.compile(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(px|pt|pc|mm|cm|in|%)?\s*$")
+_TRANSFORM_RE = re.compile(r"\s*(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)\s*,?")
+# Accepted argument counts per transform function
+_TRANSFORM_ARGS = {"matrix": (6,), "translate": (1, 2), "scale": (1, 2), "rotate": (1, 3),
+                   "skewX": (1,), "skewY": (1,)}
+_SEPARATORS = " \t\r\n,"
+_PATH_TOKEN_RE = re.compile(r"[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_ARGS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+
+
+def parse_length(value: Optional[str], reference: float = 0.0, default: float = 0.0) -> float:
+    """
+    Convert an SVG length to user units (px).
+
+    Args:
+        value: Attribute value such as "12", "4.5mm" or "50%"
+        reference: Length that 100% refers to
+        default: Returned for missing or malformed values
+    """
+    if value is None:
+        return default
+    match = _LENGTH_RE.match(value)
+    if not match:
+        return default
+    number, unit = float(match.group(1)), match.group(2) or ""
+    if unit == "%":
+        return number / 100.0 * reference
+    return number * UNITS[unit]
+
+
+def parse_numbers(value: str) -> List[float]:
+    """Parse a whitespace/comma separated list of numbers (e.g. polygon points)."""
+    return [float(n) for n in _NUMBER_RE.findall(value or "")]
+
+
+# ---------------------------------------------------------------------------
+# Transforms
+# ---------------------------------------------------------------------------
+
+def multiply(m1: Matrix, m2: Matrix) -> Matrix:
+    """Return m1 x m2 (apply m2 first, then m1)."""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (a1 * a2 + c1 * b2, b1 * a2 + d1 * b2,
+            a1 * c2 + c1 * d2, b1 * c2 + d1 * d2,
+            a1 * e2 + c1 * f2 + e1, b1 * e2 + d1 * f2 + f1)
+
+
+def apply(m: Matrix, x: float, y: float) -> Tuple[float, float]:
+    """Map a point through a matrix."""
+    return m[0] * x + m[2] * y + m[4], m[1] * x + m[3] * y + m[5]
+
+
+@lru_cache(maxsize=4096)
+def parse_transform(value: Optional[str]) -> Matrix:
+    """
+    Parse a transform attribute into a single matrix.
+
+    The list is applied right to left, as in SVG. An attribute with any invalid
+    part is ignored as a whole (identity), as browsers do. Icons repeat the same
+    few transform strings many times, so results are cached.
+    """
+    m = IDENTITY
+    if not value or not value.strip():
+        return m
+    text = value.strip()
+    pos = 0
+    while pos < len(text):
+        match = _TRANSFORM_RE.match(text, pos)
+        if match is None:
+            return IDENTITY
+        name, n = match.group(1), parse_numbers(match.group(2))
+        if len(n) not in _TRANSFORM_ARGS[name]:
+            return IDENTITY
+        if name == "matrix":
+            t = tuple(n)
+        elif name == "translate":
+            t = (1.0, 0.0, 0.0, 1.0, n[0], n[1] if len(n) > 1 else 0.0)
+        elif name == "scale":
+            t = (n[0], 0.0, 0.0, n[-1], 0.0, 0.0)
+        elif name == "rotate":
+            angle = math.radians(n[0])
+            cos, sin = math.cos(angle), math.sin(angle)
+            t = (cos, sin, -sin, cos, 0.0, 0.0)
+            if len(n) == 3:
+                cx, cy = n[1], n[2]
+                t = multiply(multiply((1.0, 0.0, 0.0, 1.0, cx, cy), t), (1.0, 0.0, 0.0, 1.0, -cx, -cy))
+        elif name == "skewX":
+            t = (1.0, 0.0, math.tan(math.radians(n[0])), 1.0, 0.0, 0.0)
+        else:
+            t = (1.0, math.tan(math.radians(n[0])), 0.0, 1.0, 0.0, 0.0)
+        m = multiply(m, t)
+        pos = match.end()
+    return m
+
+
+def matrix_scale(m: Matrix) -> float:
+    """Average linear scale factor of a matrix (used for stroke widths)."""
+    return math.sqrt(abs(m[0] * m[3] - m[1] * m[2]))
+
+
+# ---------------------------------------------------------------------------
+# Path data
+# ---------------------------------------------------------------------------
+
+def _scan_tokens(d: str) -> Iterator[Tuple[str, List[float]]]:
+    """Fast tokenizer for path data without arcs (whose compact flags need _scan)."""
+    command = None
+    args: List[float] = []
+    count = 0
+    for token in _PATH_TOKEN_RE.findall(d):
+        if token.isalpha():
+            if args:
+                return
+            command = token
+            count = _ARGS.get(command.upper())
+            if count is None:
+                return
+            if count == 0:
+                yield command, []
+            continue
+        if not count:
+            return
+        args.append(float(token))
+        if len(args) == count:
+            yield command, args
+            args = []
+            if command == "M":
+                command = "L"
+            elif command == "m":
+                command = "l"
+
+
+def _scan(d: str) -> Iterator[Tuple[str, List[float]]]:
+    """Yield (command, arguments) pairs, splitting implicit repeats."""
+    if "a" not in d and "A" not in d:
+        yield from _scan_tokens(d)
+        return
+    pos, n = 0, len(d)
+    command = None
+    while pos < n:
+        while pos < n and d[pos] in _SEPARATORS:
+            pos += 1
+        if pos >= n:
+            return
+        if d[pos].isalpha():
+            command = d[pos]
+            if command.upper() not in _ARGS:
+                return
+            pos += 1
+            if command in "Zz":
+                yield command, []
+                continue
+        elif command is None or command in "Zz":
+            return
+
+        upper = command.upper()
+        args = []
+        for i in range(_ARGS[upper]):
+            while pos < n and d[pos] in _SEPARATORS:
+                pos += 1
+            if upper == "A" and i in (3, 4):
+                # Arc flags are single digits and may be written without separators
+                if pos < n and d[pos] in "01":
+                    args.append(float(d[pos]))
+                    pos += 1
+                    continue
+                return
+            match = _NUMBER_RE.match(d, pos)
+            if not match:
+                return
+            args.append(float(match.group(0)))
+            pos = match.end()
+        yield command, args
+        # Extra coordinate pairs after a moveto are implicit linetos
+        if command == "M":
+            command = "L"
+        elif command == "m":
+            command = "l"
+
+
+def arc_to_cubics(x1: float, y1: float, rx: float, ry: float, angle: float,
+                  large_arc: bool, sweep: bool, x2: float, y2: float) -> List[Tuple[float, ...]]:
+    """
+    Convert an SVG elliptical arc to cubic Bézier segments.
+
+    Returns:
+        List of (c1x, c1y, c2x, c2y, x, y) tuples: a straight segment when a radius
+        is zero, nothing when the end points coincide
+    """
+    if x1 == x2 and y1 == y2:
+        return []
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0:
+        return [(x1, y1, x2, y2, x2, y2)]
+
+    phi = math.radians(angle % 360)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    # Endpoint to center parameterization (SVG 1.1 appendix F.6.5)
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1p = cos_phi * dx + sin_phi * dy
+    y1p = -sin_phi * dx + cos_phi * dy
+    lam = (x1p / rx) ** 2 + (y1p / ry) ** 2
+    if lam > 1:
+        rx, ry = rx * math.sqrt(lam), ry * math.sqrt(lam)
+    num = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    den = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+    coef = math.sqrt(max(0.0, num / den)) if den else 0.0
+    if large_arc == sweep:
+        coef = -coef
+    cxp, cyp = coef * rx * y1p / ry, -coef * ry * x1p / rx
+    cx = cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2
+    cy = sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2
+
+    def vector_angle(ux, uy, vx, vy):
+        return math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+
+    theta = vector_angle(1, 0, (x1p - cxp) / rx, (y1p - cyp) / ry)
+    delta = vector_angle((x1p - cxp) / rx, (y1p - cyp) / ry, (-x1p - cxp) / rx, (-y1p - cyp) / ry)
+    if not sweep and delta > 0:
+        delta -= 2 * math.pi
+    elif sweep and delta < 0:
+        delta += 2 * math.pi
+
+    count = max(1, math.ceil(abs(delta) / (math.pi / 2) - 1e-9))
+    step = delta / count
+    k = 4 / 3 * math.tan(step / 4)
+
+    def point(t):
+        cos_t, sin_t = math.cos(t), math.sin(t)
+        return (cx + rx * cos_t * cos_phi - ry * sin_t * sin_phi,
+                cy + rx * cos_t * sin_phi + ry * sin_t * cos_phi,
+                -rx * sin_t * cos_phi - ry * cos_t * sin_phi,
+                -rx * sin_t * sin_phi + ry * cos_t * cos_phi)
+
+    cubics = []
+    t = theta
+    px, py, dxs, dys = point(t)
+    for i in range(count):
+        qx, qy, dxe, dye = point(t + step)
+        if i == count - 1:
+            qx, qy = x2, y2
+        cubics.append((px + k * dxs, py + k * dys, qx - k * dxe, qy - k * dye, qx, qy))
+        t += step
+        px, py, dxs, dys = qx, qy, dxe, dye
+    return cubics
+
+
+def parse_path(d: Optional[str]) -> List[Segment]:
+    """
+    Parse path data into absolute M/L/Q/C/Z segments.
+
+    Parsing stops at the first error, like renderers do, keeping what was read.
+    """
+    segments: List[Segment] = []
+    if not d:
+        return segments
+    x = y = start_x = start_y = 0.0
+    # Last control point, for S/T reflection
+    last_c = last_q = None
+
+    for command, args in _scan(d):
+        upper = command.upper()
+        relative = command != upper and upper != "Z"
+        ox, oy = (x, y) if relative else (0.0, 0.0)
+        reflect_c, reflect_q = last_c, last_q
+        last_c = last_q = None
+
+        if upper == "M":
+            x, y = ox + args[0], oy + args[1]
+            start_x, start_y = x, y
+            segments.append(("M", (x, y)))
+        elif upper == "L":
+            x, y = ox + args[0], oy + args[1]
+            segments.append(("L", (x, y)))
+        elif upper == "H":
+            x = ox + args[0]
+            segments.append(("L", (x, y)))
+        elif upper == "V":
+            y = oy + args[0]
+            segments.append(("L", (x, y)))
+        elif upper in ("C", "S"):
+            if upper == "C":
+                c1x, c1y = ox + args[0], oy + args[1]
+                rest = args[2:]
+            else:
+                c1x, c1y = (2 * x - reflect_c[0], 2 * y - reflect_c[1]) if reflect_c else (x, y)
+                rest = args
+            c2x, c2y = ox + rest[0], oy + rest[1]
+            x, y = ox + rest[2], oy + rest[3]
+            segments.append(("C", (c1x, c1y, c2x, c2y, x, y)))
+            last_c = (c2x, c2y)
+        elif upper in ("Q", "T"):
+            if upper == "Q":
+                qx, qy = ox + args[0], oy + args[1]
+                x, y = ox + args[2], oy + args[3]
+            else:
+                qx, qy = (2 * x - reflect_q[0], 2 * y - reflect_q[1]) if reflect_q else (x, y)
+                x, y = ox + args[0], oy + args[1]
+            segments.append(("Q", (qx, qy, x, y)))
+            last_q = (qx, qy)
+        elif upper == "A":
+            ex, ey = ox + args[5], oy + args[6]
+            for cubic in arc_to_cubics(x, y, args[0], args[1], args[2], bool(args[3]), bool(args[4]), ex, ey):
+                segments.append(("C", cubic))
+            x, y = ex, ey
+        elif upper == "Z":
+            segments.append(("Z", ()))
+            x, y = start_x, start_y
+    return segments
+
+
+def _fmt(value: float, precision: int) -> str:
+    text = f"{value:.{precision}f}".rstrip("0").rstrip(".")
+    return "0" if text in ("", "-0") else text
+
+
+def format_path(segments: Sequence[Segment], precision: int = 3) -> str:
+    """Serialize segments back to compact absolute path data."""
+    parts = []
+    for command, args in segments:
+        if command == "Z":
+            parts.append("Z")
+        else:
+            parts.append(command + " ".join(_fmt(v, precision) for v in args))
+    return "".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Shapes
+# ---------------------------------------------------------------------------
+
+def ellipse_segments(cx: float, cy: float, rx: float, ry: float) -> List[Segment]:
+    """Four cubic quarter arcs forming an ellipse."""
+    kx, ky = rx * KAPPA, ry * KAPPA
+    return [
+        ("M", (cx + rx, cy)),
+        ("C", (cx + rx, cy + ky, cx + kx, cy + ry, cx, cy + ry)),
+        ("C", (cx - kx, cy + ry, cx - rx, cy + ky, cx - rx, cy)),
+        ("C", (cx - rx, cy - ky, cx - kx, cy - ry, cx, cy - ry)),
+        ("C", (cx + kx, cy - ry, cx + rx, cy - ky, cx + rx, cy)),
+        ("Z", ()),
+    ]
+
+
+def shape_segments(tag: str, attrib: Dict[str, str], viewport: Tuple[float, float] = (100.0, 100.0)) -> List[Segment]:
+    """
+    Outline of a basic shape or path element in its own user space.
+
+    Args:
+        tag: Local element name (path, rect, circle, ellipse, line, polyline, polygon, image)
+        attrib: Element attributes
+        viewport: Width and height that percentages refer to
+
+    Returns:
+        Segments; empty for unknown or degenerate shapes
+    """
+    vw, vh = viewport
+    diagonal = math.hypot(vw, vh) / math.sqrt(2)
+    get = attrib.get
+    if tag == "path":
+        return parse_path(get("d"))
+    if tag in ("rect", "image", "foreignObject"):
+        x, y = parse_length(get("x"), vw), parse_length(get("y"), vh)
+        w, h = parse_length(get("width"), vw), parse_length(get("height"), vh)
+        if w <= 0 or h <= 0:
+            return []
+        return [("M", (x, y)), ("L", (x + w, y)), ("L", (x + w, y + h)), ("L", (x, y + h)), ("Z", ())]
+    if tag == "circle":
+        r = parse_length(get("r"), diagonal)
+        if r <= 0:
+            return []
+        return ellipse_segments(parse_length(get("cx"), vw), parse_length(get("cy"), vh), r, r)
+    if tag == "ellipse":
+        rx, ry = parse_length(get("rx"), vw), parse_length(get("ry"), vh)
+        if rx <= 0 or ry <= 0:
+            return []
+        return ellipse_segments(parse_length(get("cx"), vw), parse_length(get("cy"), vh), rx, ry)
+    if tag == "line":
+        return [("M", (parse_length(get("x1"), vw), parse_length(get("y1"), vh))),
+                ("L", (parse_length(get("x2"), vw), parse_length(get("y2"), vh)))]
+    if tag in ("polyline", "polygon"):
+        n = parse_numbers(get("points"))
+        points = list(zip(n[0::2], n[1::2]))
+        if not points:
+            return []
+        segments = [("M", points[0])] + [("L", p) for p in points[1:]]
+        return segments + [("Z", ())] if tag == "polygon" else segments
+    return []
+
+
+# ---------------------------------------------------------------------------
+# Bounds
+# ---------------------------------------------------------------------------
+
+def _quadratic_extrema(p0: float, p1: float, p2: float) -> List[float]:
+    den = p0 - 2 * p1 + p2
+    if den == 0:
+        return []
+    t = (p0 - p1) / den
+    return [t] if 0 < t < 1 else []
+
+
+def _cubic_extrema(p0: float, p1: float, p2: float, p3: float) -> List[float]:
+    # Roots of the derivative a*t^2 + b*t + c (divided by 3)
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    if abs(a) < 1e-12:
+        return [-c / b] if b and 0 < -c / b < 1 else []
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return []
+    root = math.sqrt(disc)
+    return [t for t in ((-b + root) / (2 * a), (-b - root) / (2 * a)) if 0 < t < 1]
+
+
+def segments_bounds(segments: Sequence[Segment], matrix: Matrix = IDENTITY) -> Optional[Bounds]:
+    """
+    Exact bounds of path segments after a transform.
+
+    Returns:
+        (xmin, ymin, xmax, ymax), or None for empty geometry
+    """
+    xs: List[float] = []
+    ys: List[float] = []
+    x = y = start_x = start_y = 0.0
+    for command, args in segments:
+        if command == "M":
+            x, y = start_x, start_y = apply(matrix, *args)
+            xs.append(x)
+            ys.append(y)
+        elif command == "L":
+            x, y = apply(matrix, *args)
+            xs.append(x)
+            ys.append(y)
+        elif command == "Q":
+            qx, qy = apply(matrix, args[0], args[1])
+            ex, ey = apply(matrix, args[2], args[3])
+            xs.append(ex)
+            ys.append(ey)
+            for t in _quadratic_extrema(x, qx, ex):
+                xs.append((1 - t) ** 2 * x + 2 * (1 - t) * t * qx + t * t * ex)
+            for t in _quadratic_extrema(y, qy, ey):
+                ys.append((1 - t) ** 2 * y + 2 * (1 - t) * t * qy + t * t * ey)
+            x, y = ex, ey
+        elif command == "C":
+            c1x, c1y = apply(matrix, args[0], args[1])
+            c2x, c2y = apply(matrix, args[2], args[3])
+            ex, ey = apply(matrix, args[4], args[5])
+            xs.append(ex)
+            ys.append(ey)
+            # A curve can only leave its end points' range where a control point does
+            low, high = (x, ex) if x <= ex else (ex, x)
+            if not (low <= c1x <= high and low <= c2x <= high):
+                for t in _cubic_extrema(x, c1x, c2x, ex):
+                    mt = 1 - t
+                    xs.append(mt ** 3 * x + 3 * mt * mt * t * c1x + 3 * mt * t * t * c2x + t ** 3 * ex)
+            low, high = (y, ey) if y <= ey else (ey, y)
+            if not (low <= c1y <= high and low <= c2y <= high):
+                for t in _cubic_extrema(y, c1y, c2y, ey):
+                    mt = 1 - t
+                    ys.append(mt ** 3 * y + 3 * mt * mt * t * c1y + 3 * mt * t * t * c2y + t ** 3 * ey)
+            x, y = ex, ey
+        elif command == "Z":
+            x, y = start_x, start_y
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def union(a: Optional[Bounds], b: Optional[Bounds]) -> Optional[Bounds]:
+    """Smallest bounds containing both (either may be None)."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def local_name(tag) -> Optional[str]:
+    """Element name without namespace; None for comments and foreign elements."""
+    if not isinstance(tag, str):
+        return None
+    if tag.startswith("{"):
+        namespace, _, name = tag[1:].partition("}")
+        return name if namespace == SVG_NS else None
+    return tag
+
+
+def parse_style(value: Optional[str]) -> Dict[str, str]:
+    """Parse a style attribute into a property dictionary."""
+    style = {}
+    for declaration in (value or "").split(";"):
+        name, sep, prop = declaration.partition(":")
+        if sep:
+            style[name.strip()] = prop.strip()
+    return style
+
+
+def viewport_size(root) -> Tuple[float, float]:
+    """Width and height of the root's user space (viewBox, else width/height, else 100x100)."""
+    numbers = parse_numbers(root.get("viewBox"))
+    if len(numbers) == 4 and numbers[2] > 0 and numbers[3] > 0:
+        return numbers[2], numbers[3]
+    return parse_length(root.get("width"), default=100.0), parse_length(root.get("height"), default=100.0)
+
+
+class DocumentBounds:
+    """
+    Content bounds of an SVG document in the root's user space.
+
+    Attributes:
+        bounds: (xmin, ymin, xmax, ymax) of everything drawn, strokes included,
+            or None for documents without drawable content
+        complete: False if the document contains elements whose extent cannot
+            be computed without a font engine (text)
+    """
+
+    MAX_DEPTH = 64
+
+    def __init__(self, root):
+        self.root = root
+        self.viewport = viewport_size(root)
+        self.ids = {elem.get("id"): elem for elem in root.iter() if elem.get("id")}
+        self.complete = True
+        self.bounds: Optional[Bounds] = None
+        self._walk(root, IDENTITY, {"stroke": "none", "stroke-width": "1"}, 0)
+
+    def _walk(self, elem, matrix: Matrix, inherited: Dict[str, str], depth: int):
+        if depth > self.MAX_DEPTH:
+            return
+        for child in elem:
+            tag = local_name(child.tag)
+            if tag is None or tag in NON_RENDERED:
+                continue
+            style = parse_style(child.get("style"))
+            if child.get("display") == "none" or style.get("display") == "none":
+                continue
+
+            paint = dict(inherited)
+            for name in ("stroke", "stroke-width"):
+                value = style.get(name, child.get(name))
+                if value is not None and value != "inherit":
+                    paint[name] = value
+            m = multiply(matrix, parse_transform(child.get("transform")))
+
+            if tag in TEXT_ELEMENTS:
+                self.complete = False
+            elif tag in ("g", "a", "switch"):
+                self._walk(child, m, paint, depth + 1)
+            elif tag == "svg":
+                offset = (1.0, 0.0, 0.0, 1.0, parse_length(child.get("x")), parse_length(child.get("y")))
+                self._walk(child, multiply(m, offset), paint, depth + 1)
+            elif tag == "use":
+                self._use(child, m, paint, depth)
+            else:
+                self._shape(tag, child, m, paint)
+
+    def _use(self, elem, matrix: Matrix, paint: Dict[str, str], depth: int):
+        href = elem.get(XLINK_HREF) or elem.get("href") or ""
+        target = self.ids.get(href[1:]) if href.startswith("#") else None
+        if target is None:
+            return
+        m = multiply(matrix, (1.0, 0.0, 0.0, 1.0,
+                              parse_length(elem.get("x"), self.viewport[0]),
+                              parse_length(elem.get("y"), self.viewport[1])))
+        tag = local_name(target.tag)
+        if tag in ("symbol", "g", "svg"):
+            self._walk(target, m if tag != "g" else multiply(m, parse_transform(target.get("transform"))),
+                       paint, depth + 1)
+        elif tag in TEXT_ELEMENTS:
+            self.complete = False
+        elif tag is not None:
+            self._shape(tag, target, multiply(m, parse_transform(target.get("transform"))), paint)
+
+    def _shape(self, tag: str, elem, matrix: Matrix, paint: Dict[str, str]):
+        segments = shape_segments(tag, elem.attrib, self.viewport)
+        bounds = segments_bounds(segments, matrix)
+        if bounds is None:
+            return
+        if paint.get("stroke", "none") not in ("none", "transparent"):
+            half = parse_length(paint.get("stroke-width"), default=1.0) / 2 * matrix_scale(matrix)
+            bounds = (bounds[0] - half, bounds[1] - half, bounds[2] + half, bounds[3] + half)
+        self.bounds = union(self.bounds, bounds)
+
+
+def document_bounds(root) -> Tuple[Optional[Bounds], bool]:
+    """
+    Compute the content bounds of a parsed SVG document.
+
+    Args:
+        root: Root <svg> element (ElementTree or lxml)
+
+    Returns:
+        Tuple of (bounds or None, whether every drawn element could be measured)
+    """
+    result = DocumentBounds(root)
+    return result.bounds, result.complete
@@ -0,0 +1,117 @@
+"""
+Icon Indexer - Builds icons.json, categories.json and the SQLite catalog.
+
+icons.json lists every icon ordered by file modification time (newest last), and
+categories.json lists the category names after the All_icons pseudo-category.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .catalog import update_catalog
+from .profiling import Profiler, get_profiler
+from .tree import ICONS_ROOT, scan_icons
+
+INDEX_KEYS = ("name", "category", "license", "author")
+
+
+def index_entry(icon: Dict[str, str]) -> Dict[str, str]:
+    """Strip an icon entry down to the fields published in icons.json."""
+    return {key: icon[key] for key in INDEX_KEYS}
+
+
+def build_index(root: Union[str, Path] = ICONS_ROOT) -> List[Dict[str, str]]:
+    """
+    Scan the tree and return icon entries ordered by modification time.
+
+    Entries keep their path key so callers can map them back to files;
+    use index_entry() before publishing them.
+    """
+    root = str(root)
+    icons = scan_icons(root)
+    icons.sort(key=lambda icon: os.path.getmtime(os.path.join(root, icon["path"])))
+    return icons
+
+
+def index_categories(icons: List[Dict[str, str]]) -> List[str]:
+    """Return the category list for categories.json."""
+    return ["All_icons"] + sorted({icon["category"] for icon in icons})
+
+
+def write_index(icons: List[Dict[str, str]], root: Union[str, Path] = ICONS_ROOT):
+    """
+    Write icons.json and categories.json into the library root.
+
+    Args:
+        icons: Icon entries, in the order they should be published
+        root: Library root directory
+    """
+    root = Path(root)
+    with open(root / "icons.json", "w") as outfile:
+        json.dump([index_entry(icon) for icon in icons], outfile)
+
+    with open(root / "categories.json", "w") as outfile:
+        json.dump(index_categories(icons), outfile)
+
+
+def run_index(root: Union[str, Path] = ICONS_ROOT,
+              profiler: Optional[Profiler] = None) -> List[Dict[str, str]]:
+    """
+    Rebuild the JSON index files and update the SQLite catalog.
+
+    Args:
+        root: Library root directory
+        profiler: Records scan, write and catalog time
+
+    Returns:
+        The icon entries that were written
+    """
+    profiler = get_profiler(profiler)
+    with profiler.phase("index", "scan"):
+        icons = build_index(root)
+    with profiler.phase("index", "write"):
+        write_index(icons, root)
+    # SQLite catalog with facet indexes and full-text search, updated in place
+    with profiler.phase("index", "catalog"):
+        update_catalog(Path(root) / "icons.sqlite", root, icons)
+    return icons
+
+
+def main():
+    """Index the icon library from the command line."""
+    from .drawio import DRAWIO_DIR
+
+    parser = argparse.ArgumentParser(description="Index icons into icons.json, categories.json and icons.sqlite")
+    parser.add_argument("--root", "-r", default=str(ICONS_ROOT), help="Icon library root")
+    parser.add_argument("--watch", "-w", action="store_true",
+                        help="Keep running and update the indexes and draw.io libraries on file changes")
+    parser.add_argument("--drawio-dir", "-d", default=str(DRAWIO_DIR),
+                        help="Output directory for draw.io libraries when watching")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Write a JSON profile of scan, write and catalog time")
+    args = parser.parse_args()
+
+    if args.watch:
+        from .watch import LibraryWatcher
+        LibraryWatcher(args.root, args.drawio_dir).run()
+        return 0
+
+    profiler = Profiler() if args.profile else None
+    if profiler:
+        profiler.start()
+    with get_profiler(profiler).stage("index"):
+        icons = run_index(args.root, profiler)
+    if profiler:
+        profiler.stop()
+        profiler.write(args.profile)
+        print(profiler.summary())
+    print(f"Indexed {len(icons)} icons in {args.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Icon Library - Programmatic access to the bioicons library.
+
+Lookups by name, category, license and author are answered from the built index
+(icons.json) through in-memory facet tables. Icon files are only read when their
+content is requested, and parsed documents are kept in a bounded LRU cache so that
+long-running tools do not re-read or re-parse the same icons.
+"""
+
+import json
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .tree import ICONS_ROOT
+from .xmlparse import have_lxml, xml_parser
+
+# Prefer lxml when it is installed; the ElementTree API is the same for our purposes
+if have_lxml():
+    from lxml import etree as ET
+else:
+    import xml.etree.ElementTree as ET
+
+DEFAULT_CACHE_SIZE = 256
+
+FACETS = ("name", "category", "license", "author")
+
+
+def icon_path(icon: Dict[str, str]) -> str:
+    """
+    Return the path of an index entry relative to the library root.
+
+    Args:
+        icon: Entry from icons.json
+
+    Returns:
+        Path of the form license/category/author/icon.svg
+    """
+    if "path" in icon:
+        return icon["path"]
+    author_dir = icon["author"].replace(" ", "_")
+    return f"{icon['license']}/{icon['category']}/{author_dir}/{icon['name']}.svg"
+
+
+class LRUCache:
+    """
+    Small bounded mapping that evicts the least recently used entry.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def info(self) -> Dict[str, int]:
+        """Return hit, miss and size counters."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+
+class IconLibrary:
+    """
+    Lazy, cached view of the icon library backed by the built index.
+    """
+
+    def __init__(self, root: Union[str, Path] = ICONS_ROOT,
+                 index_path: Optional[Union[str, Path]] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE,
+                 pack_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the library. Nothing is read from disk until the first lookup.
+
+        Args:
+            root: Library root directory
+            index_path: Index file to use (default: icons.json under root)
+            cache_size: Maximum number of parsed documents kept in memory
+            pack_path: Optional icon pack (see bioicons.pack) to read icon bytes from
+        """
+        self.root = Path(root)
+        self.index_path = Path(index_path) if index_path else self.root / "icons.json"
+        self.pack_path = pack_path
+        self.cache = LRUCache(cache_size)
+        self._icons = None
+        self._facets = None
+        self._pack = None
+
+    def _load(self):
+        """Load the index and build the facet lookup tables."""
+        with open(self.index_path) as f:
+            self._icons = json.load(f)
+
+        self._facets = {facet: defaultdict(list) for facet in FACETS}
+        for i, icon in enumerate(self._icons):
+            for facet in FACETS:
+                self._facets[facet][icon[facet]].append(i)
+
+    def _ensure_loaded(self):
+        if self._icons is None:
+            self._load()
+
+    @property
+    def icons(self) -> List[Dict[str, str]]:
+        """All index entries."""
+        self._ensure_loaded()
+        return self._icons
+
+    def __len__(self) -> int:
+        return len(self.icons)
+
+    def __iter__(self):
+        return iter(self.icons)
+
+    def reload(self):
+        """Re-read the index and drop all cached documents."""
+        self._icons = None
+        self._facets = None
+        self.cache.clear()
+
+    def _values(self, facet: str) -> List[str]:
+        self._ensure_loaded()
+        return sorted(self._facets[facet])
+
+    def categories(self) -> List[str]:
+        """Sorted list of category names."""
+        return self._values("category")
+
+    def licenses(self) -> List[str]:
+        """Sorted list of license identifiers."""
+        return self._values("license")
+
+    def authors(self) -> List[str]:
+        """Sorted list of author names."""
+        return self._values("author")
+
+    def find(self, name: Optional[str] = None, category: Optional[str] = None,
+             license: Optional[str] = None, author: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Find icons matching all of the given facets.
+
+        Args:
+            name: Icon name (file name without extension)
+            category: Category directory name, e.g. Lab_apparatus
+            license: License directory name, e.g. cc-0
+            author: Author name as shown in the index, e.g. Simon Dürr
+
+        Returns:
+            Matching index entries in index order
+        """
+        self._ensure_loaded()
+        query = {"name": name, "category": category, "license": license, "author": author}
+        # Intersect starting from the smallest posting list
+        postings = sorted(
+            (self._facets[facet].get(value, []) for facet, value in query.items() if value is not None),
+            key=len
+        )
+        if not postings:
+            return list(self._icons)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return [self._icons[i] for i in sorted(candidates)]
+
+    def get(self, name: str, category: Optional[str] = None,
+            license: Optional[str] = None, author: Optional[str] = None) -> Dict[str, str]:
+        """
+        Return the first icon matching the given name and facets.
+
+        Raises:
+            KeyError: If no icon matches
+        """
+        matches = self.find(name=name, category=category, license=license, author=author)
+        if not matches:
+            raise KeyError(f"No icon named {name!r} matches the given filters")
+        return matches[0]
+
+    def path(self, icon: Union[str, Dict[str, str]]) -> Path:
+        """Absolute path of an icon, given an index entry or an icon name."""
+        if isinstance(icon, str):
+            icon = self.get(icon)
+        return self.root / icon_path(icon)
+
+    def read_bytes(self, icon: Union[str, Dict[str, str]]) -> bytes:
+        """
+        Read the raw SVG bytes of an icon.
+
+        Bytes come from the icon pack when one is configured and contains the icon,
+        otherwise from the icon file.
+        """
+        if isinstance(icon, str):
+            icon = self.get(icon)
+        key = icon_path(icon)
+
+        if self.pack_path is not None:
+            if self._pack is None:
+                from .pack import IconPack
+                self._pack = IconPack(self.pack_path)
+            view = self._pack.get(key)
+            if view is not None:
+                with view:
+                    return view.tobytes()
+
+        path = self.root / key
+        if not path.exists():
+            raise FileNotFoundError(f"Icon file not found (is icons.json up to date?): {path}")
+        return path.read_bytes()
+
+    def parse(self, icon: Union[str, Dict[str, str]]):
+        """
+        Return the parsed SVG root element of an icon.
+
+        Documents are cached; treat the returned tree as read-only and copy it
+        (copy.deepcopy) before modifying.
+        """
+        if isinstance(icon, str):
+            icon = self.get(icon)
+        key = icon_path(icon)
+
+        root = self.cache.get(key)
+        if root is None:
+            data = self.read_bytes(icon)
+            if have_lxml():
+                root = ET.fromstring(data, xml_parser())
+            else:
+                root = ET.fromstring(data)
+            self.cache.put(key, root)
+        return root
+
+    def close(self):
+        """Release the icon pack mapping, if one was opened."""
+        if self._pack is not None:
+            self._pack.close()
+            self._pack = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_library = None
+
+
+def default_library() -> IconLibrary:
+    """Return a shared library instance for the repository's icon tree."""
+    global _default_library
+    if _default_library is None:
+        _default_library = IconLibrary()
+    return _default_library
@@ -0,0 +1,197 @@
+"""
+Matplotlib Markers - Library icons as matplotlib paths, markers and collections.
+
+    from bioicons.markers import icon_marker, icon_collection
+
+    ax.scatter(x, y, s=400, marker=icon_marker("mouse"))           # one color
+    icon_collection("mouse", np.column_stack([x, y]), size=400, ax=ax)  # full color
+
+An icon's shapes are converted once into matplotlib Path objects with NumPy
+vertex arrays, normalized to a unit box centered on the origin (y up) the way
+matplotlib markers are, and cached per icon. Plotting thousands of markers
+reuses the same Path objects; only the offsets differ.
+
+Fills use the shape's flat color (gradients use the mean of their stops); text
+and embedded bitmaps are not converted.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+    from matplotlib.collections import PathCollection
+    from matplotlib.path import Path as MplPath
+    from matplotlib.transforms import IdentityTransform
+except ImportError:
+    np = None
+    PathCollection = MplPath = IdentityTransform = None
+
+from .geometry import Matrix, matrix_scale, parse_length, shape_segments
+from .library import DEFAULT_CACHE_SIZE, IconLibrary, LRUCache, default_library, icon_path
+from .raster import ShapeWalker, parse_opacity
+
+# Default marker area in points squared, as for scatter(s=...)
+DEFAULT_SIZE = 400
+
+IconRef = Union[str, Dict[str, str]]
+
+
+def have_matplotlib() -> bool:
+    """Check whether matplotlib and NumPy are available."""
+    return MplPath is not None
+
+
+class IconGeometry(ShapeWalker):
+    """
+    Matplotlib paths of one icon in marker coordinates.
+
+    Attributes:
+        parts: (path, facecolor, edgecolor, linewidth) per drawn shape in paint
+            order; colors are RGBA tuples or "none", and linewidth is a fraction
+            of the marker size
+    """
+
+    def __init__(self, root):
+        self.parts: List[Tuple] = []
+        self._marker = None
+        # Painting at size 1 maps the viewBox onto the unit square
+        super().__init__(root, size=1)
+
+    def _shape(self, tag: str, elem, matrix: Matrix, paint: Dict[str, str], opacity: float):
+        segments = shape_segments(tag, elem.attrib, self.viewport)
+        if not segments:
+            return
+        path = self._to_path(segments, matrix, closed=tag not in ("line", "polyline"))
+        fill = self._paint_color(paint["fill"]) if tag not in ("line", "polyline") else None
+        stroke = self._paint_color(paint["stroke"])
+        if fill is None and stroke is None:
+            return
+        fill_alpha = opacity * parse_opacity(paint.get("fill-opacity"))
+        stroke_alpha = opacity * parse_opacity(paint.get("stroke-opacity"))
+        width = parse_length(paint.get("stroke-width"), default=1.0) * matrix_scale(matrix) * self.scale
+        self.parts.append((
+            path,
+            (*fill, fill_alpha) if fill is not None else "none",
+            (*stroke, stroke_alpha) if stroke is not None else "none",
+            width if stroke is not None else 0.0,
+        ))
+
+    def _to_path(self, segments, matrix: Matrix, closed: bool):
+        """Convert absolute segments to a Path in marker coordinates."""
+        vertices: List[Tuple[float, float]] = []
+        codes: List[int] = []
+        start = (0.0, 0.0)
+        for command, args in segments:
+            if command == "M":
+                start = args
+                vertices.append(args)
+                codes.append(MplPath.MOVETO)
+            elif command == "L":
+                vertices.append(args)
+                codes.append(MplPath.LINETO)
+            elif command == "Q":
+                vertices.extend((args[0:2], args[2:4]))
+                codes.extend((MplPath.CURVE3,) * 2)
+            elif command == "C":
+                vertices.extend((args[0:2], args[2:4], args[4:6]))
+                codes.extend((MplPath.CURVE4,) * 3)
+            elif closed:
+                vertices.append(start)
+                codes.append(MplPath.CLOSEPOLY)
+
+        points = np.asarray(vertices, dtype=np.float64)
+        a, b, c, d, e, f = matrix
+        x = (a * points[:, 0] + c * points[:, 1] + e - self.origin[0]) * self.scale
+        y = (b * points[:, 0] + d * points[:, 1] + f - self.origin[1]) * self.scale
+        # Unit square with y down -> centered on the origin with y up
+        return MplPath(np.column_stack([x - 0.5, 0.5 - y]), np.asarray(codes, dtype=MplPath.code_type))
+
+    @property
+    def marker(self):
+        """All shapes as one compound Path, for single-color markers."""
+        if self._marker is None:
+            self._marker = MplPath.make_compound_path(*(part[0] for part in self.parts))
+        return self._marker
+
+
+_geometry_cache = LRUCache(DEFAULT_CACHE_SIZE)
+
+
+def icon_geometry(icon: IconRef, library: Optional[IconLibrary] = None) -> IconGeometry:
+    """
+    Return the cached matplotlib geometry of an icon.
+
+    Args:
+        icon: Icon name or index entry
+        library: Library to read from (default: the repository's icon tree)
+
+    Raises:
+        RuntimeError: If matplotlib or NumPy is not installed
+    """
+    if not have_matplotlib():
+        raise RuntimeError("matplotlib and NumPy are required for icon markers")
+    library = library or default_library()
+    if isinstance(icon, str):
+        icon = library.get(icon)
+    key = (str(library.root), icon_path(icon))
+    geometry = _geometry_cache.get(key)
+    if geometry is None:
+        geometry = IconGeometry(library.parse(icon))
+        _geometry_cache.put(key, geometry)
+    return geometry
+
+
+def icon_marker(icon: IconRef, library: Optional[IconLibrary] = None):
+    """
+    Return an icon as a single Path usable as a scatter or plot marker.
+
+    The marker keeps the icon's outline but not its colors; use
+    icon_collection() for full-color icons.
+    """
+    return icon_geometry(icon, library).marker
+
+
+def icon_collection(icon: IconRef, offsets: Sequence[Sequence[float]], size: float = DEFAULT_SIZE,
+                    ax=None, library: Optional[IconLibrary] = None, **kwargs):
+    """
+    Draw a full-color icon at many positions as one PathCollection.
+
+    Args:
+        icon: Icon name or index entry
+        offsets: (N, 2) positions in data coordinates (axes transform of ax)
+        size: Marker area in points squared, as for scatter(s=...)
+        ax: Axes to add the collection to; when omitted the collection is only created
+        library: Library to read from
+        **kwargs: Passed to PathCollection (zorder, alpha, label, ...)
+
+    Returns:
+        The PathCollection
+    """
+    geometry = icon_geometry(icon, library)
+    offsets = np.atleast_2d(np.asarray(offsets, dtype=np.float64))
+    count = len(offsets)
+    paths, facecolors, edgecolors, widths = zip(*geometry.parts) if geometry.parts else ((), (), (), ())
+
+    # Every icon draws all of its parts before the next icon, so overlapping icons stack correctly
+    collection = PathCollection(
+        list(paths) * count,
+        sizes=[size],
+        offsets=np.repeat(offsets, len(paths), axis=0),
+        offset_transform=ax.transData if ax is not None else None,
+        facecolors=list(facecolors) * count,
+        edgecolors=list(edgecolors) * count,
+        # Widths are a fraction of the marker's side, which is sqrt(size) points
+        linewidths=[w * np.sqrt(size) for w in widths] * count,
+        **kwargs
+    )
+    # As in scatter(): paths are in points (scaled by sizes), only offsets are in data space
+    collection.set_transform(IdentityTransform())
+    if ax is not None:
+        ax.add_collection(collection)
+        ax.autoscale_view()
+    return collection
+
+
+def clear_cache():
+    """Drop all cached icon geometry."""
+    _geometry_cache.clear()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+ViewBox Normalization - Fits each icon's canvas to its drawn content.
+
+The content bounding box is computed from the geometry (path extents, shapes,
+<use> references, transforms and strokes, see geometry.py) and written back as a
+tight or uniformly padded square viewBox, with width and height in user units so
+draw.io and get_width_height() see the real proportions. Only the root <svg> tag
+changes. Icons containing text are left as they are, since their extent depends
+on fonts.
+"""
+
+import argparse
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .geometry import document_bounds
+from .tree import scan_icons
+
+ViewBox = Tuple[float, float, float, float]
+
+DEFAULT_PADDING = 0.0
+
+_ROOT_TAG_RE = re.compile(rb"<svg\b[^>]*>")
+_SIZE_ATTRIBUTE_RE = re.compile(rb'\s(?:viewBox|width|height)\s*=\s*("[^"]*"|\'[^\']*\')')
+
+
+def _fmt(value: float) -> str:
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text in ("", "-0") else text
+
+
+def content_viewbox(data: bytes, padding: float = DEFAULT_PADDING, square: bool = False) -> Optional[ViewBox]:
+    """
+    Compute the normalized viewBox of an icon.
+
+    Args:
+        data: SVG document bytes
+        padding: Margin added on every side, as a fraction of the longer side
+        square: Extend the shorter side (centered) to make the viewBox square
+
+    Returns:
+        (x, y, width, height), or None if the icon cannot be measured (parse
+        errors, no drawable content, or text)
+    """
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return None
+    bounds, complete = document_bounds(root)
+    if bounds is None or not complete:
+        return None
+
+    xmin, ymin, xmax, ymax = bounds
+    width, height = xmax - xmin, ymax - ymin
+    if width <= 0 or height <= 0:
+        return None
+    if square:
+        side = max(width, height)
+        xmin -= (side - width) / 2
+        ymin -= (side - height) / 2
+        width = height = side
+    margin = max(width, height) * padding
+    return xmin - margin, ymin - margin, width + 2 * margin, height + 2 * margin
+
+
+def set_viewbox(data: bytes, viewbox: ViewBox) -> bytes:
+    """
+    Replace the viewBox, width and height of the root element.
+
+    The rest of the document is left byte-for-byte intact.
+    """
+    match = _ROOT_TAG_RE.search(data)
+    if match is None:
+        return data
+    x, y, width, height = (_fmt(v) for v in viewbox)
+    tag = _SIZE_ATTRIBUTE_RE.sub(b"", match.group(0))
+    attributes = f' viewBox="{x} {y} {width} {height}" width="{width}" height="{height}"'.encode("ascii")
+    tag = tag[:4] + attributes + tag[4:]
+    return data[:match.start()] + tag + data[match.end():]
+
+
+def normalize_svg(data: bytes, padding: float = DEFAULT_PADDING, square: bool = False,
+                  viewbox: Optional[ViewBox] = None) -> Tuple[bytes, Optional[ViewBox]]:
+    """
+    Normalize one icon.
+
+    Args:
+        data: SVG document bytes
+        padding: Margin as a fraction of the longer side
+        square: Make the viewBox square
+        viewbox: Precomputed result of content_viewbox(), e.g. from a cache
+
+    Returns:
+        Tuple of (output bytes, viewBox applied or None if unchanged)
+    """
+    if viewbox is None:
+        viewbox = content_viewbox(data, padding, square)
+    if viewbox is None:
+        return data, None
+    return set_viewbox(data, viewbox), viewbox
+
+
+def normalize_file(job) -> Optional[List[float]]:
+    """
+    Normalize src into dst.
+
+    Args:
+        job: (source path, destination path, padding, square, cached) where cached
+            is a known viewBox, an empty list for icons known to be unmeasurable,
+            or None if the icon has to be measured
+
+    Returns:
+        The viewBox that was applied, or None if the icon was copied unchanged
+    """
+    src, dst, padding, square, cached = job
+    with open(src, "rb") as f:
+        data = f.read()
+    if cached == []:
+        output, viewbox = data, None
+    else:
+        output, viewbox = normalize_svg(data, padding, square, tuple(cached) if cached else None)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    with open(dst, "wb") as f:
+        f.write(output)
+    return list(viewbox) if viewbox else None
+
+
+def main():
+    """Normalize an icon tree from the command line."""
+    parser = argparse.ArgumentParser(description="Fit icon viewBoxes to their drawn content")
+    parser.add_argument("source", help="Icon tree (license/category/author/icon.svg)")
+    parser.add_argument("output", help="Output directory for the normalized copies")
+    parser.add_argument("--padding", type=float, default=DEFAULT_PADDING,
+                        help="Margin as a fraction of the longer side (default: 0)")
+    parser.add_argument("--square", action="store_true", help="Make every viewBox square")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    paths = [icon["path"] for icon in scan_icons(args.source)]
+    jobs = [(os.path.join(args.source, p), os.path.join(args.output, p), args.padding, args.square, None)
+            for p in paths]
+    with ProcessPoolExecutor(args.jobs) as pool:
+        results = list(pool.map(normalize_file, jobs, chunksize=16))
+
+    unchanged = [path for path, viewbox in zip(paths, results) if viewbox is None]
+    print(f"Normalized {len(paths) - len(unchanged)} of {len(paths)} icons into {Path(args.output)}")
+    for path in unchanged:
+        print(f"  unchanged: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+SVG Optimizer - Lossless clean-up of icon files for publishing.
+
+Removes data that editors leave behind and renderers ignore: comments, <metadata>,
+Inkscape/Sodipodi elements and attributes, and indentation whitespace. Geometry and
+styling are not touched.
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Tuple
+
+SVG_NS = "http://www.w3.org/2000/svg"
+
+# Namespaces whose elements and attributes only matter to editors
+EDITOR_NAMESPACES = (
+    "http://www.inkscape.org/namespaces/inkscape",
+    "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+    "http://ns.adobe.com/AdobeIllustrator/10.0/",
+    "http://ns.adobe.com/SaveForWeb/1.0/",
+    "http://ns.adobe.com/Extensibility/1.0/",
+    "http://www.bohemiancoding.com/sketch/ns",
+)
+
+DROP_TAGS = {f"{{{SVG_NS}}}metadata"}
+
+# Elements whose whitespace is text content
+TEXT_TAGS = {f"{{{SVG_NS}}}{name}" for name in ("text", "tspan", "textPath")}
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# Serialize the SVG namespace as the default one instead of ns0:
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", "http://www.w3.org/1999/xlink")
+
+
+def _is_editor(name: str) -> bool:
+    return name.startswith("{") and name[1:].split("}", 1)[0] in EDITOR_NAMESPACES
+
+
+def _drop(parent, child, preserve: bool):
+    """Remove child, keeping its tail text where whitespace is content."""
+    if preserve and child.tail:
+        index = list(parent).index(child)
+        if index:
+            previous = parent[index - 1]
+            previous.tail = (previous.tail or "") + child.tail
+        else:
+            parent.text = (parent.text or "") + child.tail
+    parent.remove(child)
+
+
+def _clean(elem, preserve: bool = False):
+    space = elem.get(XML_SPACE)
+    if space is not None:
+        preserve = space == "preserve"
+    # Whitespace between <tspan>s is rendered, whatever xml:space says
+    preserve = preserve or elem.tag in TEXT_TAGS
+
+    for child in list(elem):
+        if not isinstance(child.tag, str) or child.tag in DROP_TAGS or _is_editor(child.tag):
+            _drop(elem, child, preserve)
+            continue
+        _clean(child, preserve)
+        # Indentation after an element
+        if not preserve and child.tail is not None and not child.tail.strip():
+            child.tail = None
+
+    for name in [name for name in elem.attrib if _is_editor(name)]:
+        del elem.attrib[name]
+
+    # Indentation before the first child
+    if not preserve and elem.text is not None and not elem.text.strip() and len(elem):
+        elem.text = None
+
+
+def minify_svg(data: bytes) -> Tuple[bytes, bool]:
+    """
+    Optimize an SVG document.
+
+    Args:
+        data: Original SVG bytes
+
+    Returns:
+        Tuple of (output bytes, whether the document was optimized). Documents that
+        cannot be parsed, or would not get smaller, are returned unchanged.
+    """
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return data, False
+
+    _clean(root)
+    optimized = ET.tostring(root, encoding="utf-8", xml_declaration=False)
+    if len(optimized) >= len(data):
+        return data, False
+    return optimized, True
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Icon Pack - A single-file binary container for the whole icon library.
+
+Opening thousands of small files is slow on network filesystems and in containers,
+so tools that need many icons can read them from one pack file instead. The pack
+layout is:
+
+    header | icon bytes ... | offset table
+
+The header points at the offset table, which maps each icon path
+(license/category/author/icon.svg) to the offset and length of its bytes.
+Rebuilds append changed icons and a fresh table after the existing data and only
+then rewrite the header, so an interrupted rebuild leaves the previous pack intact.
+Superseded bytes are reclaimed by compaction once they exceed a threshold.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import warnings
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+from .tree import ICONS_ROOT, icon_name, scan_icons
+
+DEFAULT_PACK = ICONS_ROOT / "icons.pack"
+
+MAGIC = b"BIOPACK\x00"
+VERSION = 1
+
+# magic, version, reserved, entry count, table offset, table length, live bytes
+HEADER = struct.Struct("<8sHHIQQQ")
+# offset, length, mtime_ns, crc32, key length (followed by the utf-8 key)
+ENTRY = struct.Struct("<QQqIH")
+
+# Compact when more than this fraction of the data region is superseded bytes
+COMPACT_THRESHOLD = 0.25
+
+
+class PackEntry(NamedTuple):
+    """Location and change-detection stamp of one icon inside a pack."""
+    offset: int
+    length: int
+    mtime_ns: int
+    crc32: int
+
+
+def _read_table(buf, pack_path) -> Dict[str, PackEntry]:
+    """Parse the header and offset table from a buffer holding the whole pack."""
+    if len(buf) < HEADER.size:
+        raise ValueError(f"Not a bioicons pack (file too short): {pack_path}")
+
+    magic, version, _, count, table_offset, table_length, _ = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a bioicons pack: {pack_path}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported pack version {version}: {pack_path}")
+    if table_offset + table_length > len(buf):
+        raise ValueError(f"Truncated pack: {pack_path}")
+
+    entries = {}
+    pos = table_offset
+    for _ in range(count):
+        offset, length, mtime_ns, crc, key_length = ENTRY.unpack_from(buf, pos)
+        pos += ENTRY.size
+        key = bytes(buf[pos:pos + key_length]).decode("utf-8")
+        pos += key_length
+        entries[key] = PackEntry(offset, length, mtime_ns, crc)
+
+    return entries
+
+
+def _encode_table(entries: Dict[str, PackEntry]) -> bytes:
+    """Serialize the offset table."""
+    chunks = []
+    for key, entry in entries.items():
+        encoded = key.encode("utf-8")
+        chunks.append(ENTRY.pack(entry.offset, entry.length, entry.mtime_ns, entry.crc32, len(encoded)))
+        chunks.append(encoded)
+    return b"".join(chunks)
+
+
+def _write_header(f, count: int, table_offset: int, table_length: int, live_bytes: int):
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, VERSION, 0, count, table_offset, table_length, live_bytes))
+
+
+def _read_icon(path: str):
+    """Read an icon file, returning its bytes and mtime stamp."""
+    mtime_ns = os.stat(path).st_mtime_ns
+    with open(path, "rb") as f:
+        data = f.read()
+    return data, mtime_ns
+
+
+def write_pack(pack_path: Union[str, Path] = DEFAULT_PACK,
+               root: Union[str, Path] = ICONS_ROOT,
+               compact_threshold: float = COMPACT_THRESHOLD,
+               compact: bool = False) -> Dict:
+    """
+    Create or incrementally update a pack with every icon under root.
+
+    Icons whose size and mtime match the existing table are kept in place; new or
+    modified icons are appended. The pack is rewritten from scratch when it does not
+    exist yet, when compact is set, or when superseded bytes would exceed
+    compact_threshold of the data region.
+
+    Args:
+        pack_path: Pack file to create or update
+        root: Library root directory
+        compact_threshold: Fraction of dead bytes that triggers compaction
+        compact: Always rewrite the pack without dead bytes
+
+    Returns:
+        Dictionary with counts of added, updated, removed and unchanged icons,
+        whether the pack was compacted, whether an unreadable pack was rebuilt
+        (also reported as a RuntimeWarning), and its final size in bytes
+    """
+    pack_path = str(pack_path)
+    root = str(root)
+    icons = scan_icons(root)
+
+    old_entries = None
+    old_end = HEADER.size
+    recovered = False
+    if os.path.exists(pack_path):
+        try:
+            with IconPack(pack_path) as pack:
+                old_entries = dict(pack._entries)
+                old_end = pack.table_end
+        except (ValueError, struct.error) as e:
+            warnings.warn(f"Rebuilding unreadable pack {pack_path}: {e}", RuntimeWarning, stacklevel=2)
+            recovered = True
+
+    stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "compacted": False,
+             "recovered": recovered}
+
+    # Decide which icons can stay where they are
+    kept = {}
+    stale = []
+    for icon in icons:
+        key = icon["path"]
+        st = os.stat(os.path.join(root, key))
+        entry = old_entries.get(key) if old_entries else None
+        if entry and entry.length == st.st_size and entry.mtime_ns == st.st_mtime_ns:
+            kept[key] = entry
+        else:
+            stale.append(key)
+            stats["updated" if entry else "added"] += 1
+    stats["unchanged"] = len(kept)
+    if old_entries:
+        current = {icon["path"] for icon in icons}
+        stats["removed"] = sum(1 for key in old_entries if key not in current)
+
+    if old_entries is not None and not stale and not stats["removed"] and not compact:
+        stats["size"] = os.path.getsize(pack_path)
+        return stats
+
+    # Read changed icons once; they are needed for both append and compaction
+    fresh = {key: _read_icon(os.path.join(root, key)) for key in stale}
+    live_bytes = sum(e.length for e in kept.values()) + sum(len(d) for d, _ in fresh.values())
+    appended_bytes = sum(len(d) for d, _ in fresh.values())
+    data_bytes = (old_end - HEADER.size) + appended_bytes
+    dead_fraction = 1 - live_bytes / data_bytes if data_bytes else 0.0
+
+    if old_entries is None or compact or dead_fraction > compact_threshold:
+        _rewrite_pack(pack_path, [icon["path"] for icon in icons], kept, fresh)
+        stats["compacted"] = old_entries is not None
+    else:
+        _append_pack(pack_path, [icon["path"] for icon in icons], kept, fresh, old_end, live_bytes)
+
+    stats["size"] = os.path.getsize(pack_path)
+    return stats
+
+
+def _append_pack(pack_path, order, kept, fresh, old_end, live_bytes):
+    """Append changed icons and a new table after the existing data, then switch the header."""
+    entries = dict(kept)
+    with open(pack_path, "r+b") as f:
+        f.seek(old_end)
+        pos = old_end
+        for key, (data, mtime_ns) in fresh.items():
+            f.write(data)
+            entries[key] = PackEntry(pos, len(data), mtime_ns, zlib.crc32(data))
+            pos += len(data)
+
+        table = _encode_table({key: entries[key] for key in order})
+        f.write(table)
+        f.flush()
+        os.fsync(f.fileno())
+
+        # The header is the commit point: until it is rewritten the old table is used
+        _write_header(f, len(order), pos, len(table), live_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _rewrite_pack(pack_path, order, kept, fresh):
+    """Write a compact pack to a temporary file and atomically replace the old one."""
+    tmp_path = pack_path + ".tmp"
+    old = None
+    if kept:
+        old_file = open(pack_path, "rb")
+        old = mmap.mmap(old_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(b"\x00" * HEADER.size)
+            entries = {}
+            pos = HEADER.size
+            for key in order:
+                if key in fresh:
+                    data, mtime_ns = fresh[key]
+                    crc = zlib.crc32(data)
+                else:
+                    entry = kept[key]
+                    data = old[entry.offset:entry.offset + entry.length]
+                    mtime_ns, crc = entry.mtime_ns, entry.crc32
+                f.write(data)
+                entries[key] = PackEntry(pos, len(data), mtime_ns, crc)
+                pos += len(data)
+
+            table = _encode_table(entries)
+            f.write(table)
+            _write_header(f, len(entries), pos, len(table), pos - HEADER.size)
+            f.flush()
+            os.fsync(f.fileno())
+    finally:
+        if old is not None:
+            old.close()
+            old_file.close()
+
+    os.replace(tmp_path, pack_path)
+
+
+class IconPack:
+    """
+    Read-only, memory-mapped view of an icon pack.
+
+    Icon data is returned as memoryview slices of the mapping, so no bytes are copied
+    until the caller asks for them (e.g. bytes(view) or view.tobytes()). Views must be
+    released before the pack is closed.
+    """
+
+    def __init__(self, pack_path: Union[str, Path] = DEFAULT_PACK):
+        """
+        Open and map a pack file.
+
+        Args:
+            pack_path: Path to a pack written by write_pack
+        """
+        self.pack_path = str(pack_path)
+        self._file = open(self.pack_path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Not a bioicons pack (empty file): {self.pack_path}")
+
+        self._view = memoryview(self._mmap)
+        try:
+            self._entries = _read_table(self._view, self.pack_path)
+        except Exception:
+            self.close()
+            raise
+
+        _, _, _, _, table_offset, table_length, self.live_bytes = HEADER.unpack_from(self._view, 0)
+        self.table_end = table_offset + table_length
+
+        self._by_name = defaultdict(list)
+        for key in self._entries:
+            self._by_name[icon_name(key.rsplit("/", 1)[-1])].append(key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmap the pack. Raises BufferError while returned views are still alive."""
+        if self._file.closed:
+            return
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: str) -> memoryview:
+        entry = self._entries[key]
+        return self._view[entry.offset:entry.offset + entry.length]
+
+    def keys(self) -> List[str]:
+        """Icon paths stored in the pack."""
+        return list(self._entries)
+
+    def get(self, key: str, default=None) -> Optional[memoryview]:
+        """Return the bytes of an icon path, or default if it is not in the pack."""
+        if key not in self._entries:
+            return default
+        return self[key]
+
+    def entry(self, key: str) -> PackEntry:
+        """Return the table entry (offset, length, mtime, crc32) for an icon path."""
+        return self._entries[key]
+
+    def find(self, name: str) -> List[str]:
+        """Return the paths of all icons with the given name (names are not unique)."""
+        return list(self._by_name.get(name, []))
+
+    def verify(self, key: str) -> bool:
+        """Check the stored bytes of an icon against its CRC32."""
+        return zlib.crc32(self[key]) == self._entries[key].crc32
+
+
+def main():
+    """Build or inspect an icon pack from the command line."""
+    parser = argparse.ArgumentParser(description="Pack the icon library into a single memory-mappable file")
+    parser.add_argument("--root", "-r", default=str(ICONS_ROOT), help="Icon library root")
+    parser.add_argument("--output", "-o", default=str(DEFAULT_PACK), help="Pack file to create or update")
+    parser.add_argument("--compact", "-c", action="store_true", help="Rewrite the pack without superseded bytes")
+    parser.add_argument("--threshold", "-t", type=float, default=COMPACT_THRESHOLD,
+                        help=f"Dead-byte fraction that triggers compaction (default: {COMPACT_THRESHOLD})")
+    args = parser.parse_args()
+
+    stats = write_pack(args.output, args.root, compact_threshold=args.threshold, compact=args.compact)
+    print(f"Pack: {args.output} ({stats['size'] / 1024 ** 2:.1f} MB)")
+    print(f"Added: {stats['added']}, updated: {stats['updated']}, "
+          f"removed: {stats['removed']}, unchanged: {stats['unchanged']}")
+    if stats["compacted"]:
+        print("Pack was compacted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Placeholders - Tiny previews that the gallery can paint before icons load.
+
+For every icon a 16x16 blurred PNG (as a data URI) and a pair of dominant
+colors are computed. Icons are painted with NumPy at 64x64: filled shapes in
+document order with their flat color (gradients use the mean of their stops),
+strokes as hairline coverage, and group opacity multiplied down the tree. The
+result is box-filtered to 16x16, which is all the detail a placeholder needs;
+no Cairo is involved.
+
+placeholders.json maps license/category/author/name (the fields of an
+icons.json entry joined by "/") to {"uri": ..., "colors": [...]}.
+"""
+
+import argparse
+import base64
+import json
+import struct
+import sys
+import xml.etree.ElementTree as ET
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .geometry import Matrix, matrix_scale, parse_length, shape_segments
+from .raster import Color, ShapeWalker, flatten, parse_opacity, rasterize
+from .tree import ICONS_ROOT, scan_icons
+
+PLACEHOLDERS_FILE = "placeholders.json"
+PLACEHOLDER_SIZE = 16
+# Painting resolution; each placeholder pixel averages a block of painted pixels
+PAINT_SIZE = 64
+
+
+def have_numpy() -> bool:
+    """Check whether placeholders can be painted."""
+    return np is not None
+
+
+def placeholder_key(icon: Dict[str, str]) -> str:
+    """Key of an icon in placeholders.json."""
+    return "/".join(icon[key] for key in ("license", "category", "author", "name"))
+
+
+class Painter(ShapeWalker):
+    """
+    Paints an SVG document into an RGBA array.
+
+    Attributes:
+        image: (size, size, 4) straight-alpha float array
+    """
+
+    def __init__(self, root, size: int = PAINT_SIZE):
+        self.image = np.zeros((size, size, 4), dtype=np.float64)
+        super().__init__(root, size)
+
+    def _shape(self, tag: str, elem, matrix: Matrix, paint: Dict[str, str], opacity: float):
+        segments = shape_segments(tag, elem.attrib, self.viewport)
+        if not segments:
+            return
+        polygons = flatten(segments, matrix, self.origin, self.scale)
+        fill = self._paint_color(paint["fill"]) if tag not in ("line", "polyline") else None
+        if fill is not None:
+            coverage = rasterize(polygons, (self.size, self.size), paint["fill-rule"] != "evenodd")
+            self._composite(coverage.astype(np.float64), fill, opacity * parse_opacity(paint.get("fill-opacity")))
+        stroke = self._paint_color(paint["stroke"])
+        if stroke is not None:
+            width = parse_length(paint.get("stroke-width"), default=1.0) * matrix_scale(matrix) * self.scale
+            self._composite(self._hairline(polygons, tag not in ("line", "polyline")) * min(1.0, width),
+                            stroke, opacity * parse_opacity(paint.get("stroke-opacity")))
+
+    def _hairline(self, polygons: List, closed: bool):
+        """Pixels touched by the polygon outlines."""
+        mask = np.zeros((self.size, self.size), dtype=np.float64)
+        for polygon in polygons:
+            ends = np.roll(polygon, -1, axis=0) if closed else polygon[1:]
+            starts = polygon if closed else polygon[:-1]
+            lengths = np.hypot(*(ends - starts).T)
+            steps = np.maximum(1, np.ceil(lengths * 2)).astype(np.int64)
+            edge = np.repeat(np.arange(len(starts)), steps)
+            t = (np.arange(len(edge)) - np.repeat(np.cumsum(steps) - steps, steps)) / steps[edge]
+            points = starts[edge] + (ends[edge] - starts[edge]) * t[:, None]
+            cols, rows = np.floor(points).astype(np.int64).T
+            inside = (rows >= 0) & (rows < self.size) & (cols >= 0) & (cols < self.size)
+            mask[rows[inside], cols[inside]] = 1.0
+        return mask
+
+    def _composite(self, coverage, color: Color, alpha: float):
+        """Source-over composite a flat color through a coverage mask."""
+        source = coverage * alpha
+        if alpha <= 0 or not source.any():
+            return
+        image = self.image
+        dest_alpha = image[..., 3]
+        out_alpha = source + dest_alpha * (1 - source)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for channel in range(3):
+                mixed = color[channel] * source + image[..., channel] * dest_alpha * (1 - source)
+                image[..., channel] = np.where(out_alpha > 0, mixed / out_alpha, 0.0)
+        image[..., 3] = out_alpha
+
+
+def encode_png(pixels) -> bytes:
+    """Encode an (height, width, 4) uint8 array as an RGBA PNG."""
+    height, width, _ = pixels.shape
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    # Filter type 0 (none) at the start of every row
+    raw = b"".join(b"\x00" + pixels[row].tobytes() for row in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 9))
+            + chunk(b"IEND", b""))
+
+
+def dominant_colors(image, count: int = 2) -> List[str]:
+    """
+    Most common visible colors of a painted image.
+
+    Pixels are bucketed at 4 bits per channel and each bucket reports its mean
+    color. Fewer visible colors than count repeat the last one; an empty image
+    gives white.
+    """
+    visible = image[image[..., 3] >= 0.5][:, :3]
+    if not len(visible):
+        return ["#ffffff"] * count
+    buckets = [tuple(key) for key in np.rint(visible * 15).astype(np.int64)]
+    colors = []
+    for key, _ in Counter(buckets).most_common(count):
+        mean = visible[np.all(np.rint(visible * 15).astype(np.int64) == key, axis=1)].mean(axis=0)
+        colors.append("#%02x%02x%02x" % tuple(int(round(v * 255)) for v in mean))
+    return colors + colors[-1:] * (count - len(colors))
+
+
+def make_placeholder(data: bytes, size: int = PLACEHOLDER_SIZE) -> Optional[Dict]:
+    """
+    Compute the placeholder of an icon.
+
+    Args:
+        data: SVG document bytes
+        size: Placeholder width and height in pixels
+
+    Returns:
+        {"uri": PNG data URI, "colors": [two #rrggbb colors]}, or None if the
+        document cannot be parsed
+    """
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return None
+    painter = Painter(root, PAINT_SIZE)
+    image = painter.image
+
+    # Box filter down to the placeholder size, averaging premultiplied color
+    block = PAINT_SIZE // size
+    premultiplied = np.concatenate([image[..., :3] * image[..., 3:], image[..., 3:]], axis=2)
+    small = premultiplied.reshape(size, block, size, block, 4).mean(axis=(1, 3))
+    # One more 3x3 box blur softens the edges the browser will upscale
+    padded = np.pad(small, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    small = sum(padded[dy:dy + size, dx:dx + size] for dy in range(3) for dx in range(3)) / 9
+    alpha = small[..., 3:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        color = np.where(alpha > 0, small[..., :3] / alpha, 0.0)
+    pixels = np.clip(np.rint(np.concatenate([color, alpha], axis=2) * 255), 0, 255).astype(np.uint8)
+
+    uri = "data:image/png;base64," + base64.b64encode(encode_png(pixels)).decode("ascii")
+    return {"uri": uri, "colors": dominant_colors(image)}
+
+
+def placeholder_file(path: str) -> Optional[Dict]:
+    """Compute the placeholder of an icon file."""
+    with open(path, "rb") as f:
+        return make_placeholder(f.read())
+
+
+def write_placeholders(entries: Dict[str, Dict], root=ICONS_ROOT):
+    """Write placeholders.json into the library root, keys sorted for stable diffs."""
+    with open(Path(root) / PLACEHOLDERS_FILE, "w") as f:
+        json.dump(dict(sorted(entries.items())), f, separators=(",", ":"))
+
+
+def main():
+    """Compute placeholders for the whole library from the command line."""
+    parser = argparse.ArgumentParser(description="Compute gallery placeholders for every icon")
+    parser.add_argument("--root", "-r", default=str(ICONS_ROOT), help="Icon library root")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not have_numpy():
+        print("Error: NumPy is required to paint placeholders")
+        return 1
+    icons = scan_icons(args.root)
+    with ProcessPoolExecutor(args.jobs) as pool:
+        results = list(pool.map(placeholder_file, [str(Path(args.root) / icon["path"]) for icon in icons],
+                                chunksize=16))
+    entries = {placeholder_key(icon): result for icon, result in zip(icons, results) if result}
+    write_placeholders(entries, args.root)
+    print(f"Wrote {len(entries)} placeholders to {Path(args.root) / PLACEHOLDERS_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
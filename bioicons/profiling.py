@@ -0,0 +1,207 @@
+"""
+Build Profiling - Opt-in timing and memory report for the build pipeline.
+
+A Profiler collects, per stage, the wall time, the bytes processed and the time
+spent in named phases (globbing, parsing, encoding, writing, ...), plus the N
+slowest icons across all stages. With memory tracing enabled it also records the
+tracemalloc peak and the largest allocation sites.
+
+Stages that fan out to worker processes report per-file timings measured in the
+workers; tracemalloc only sees the main process.
+
+Code paths take an optional profiler and fall back to NULL_PROFILER, which records
+nothing, so builds without profiling skip the bookkeeping.
+"""
+
+import heapq
+import itertools
+import json
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+DEFAULT_TOP = 20
+MEMORY_FRAMES = 10
+
+
+class Phase:
+    """Handle yielded by Profiler.phase(); set bytes to the amount of data handled."""
+
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = 0
+
+
+class Profiler:
+    """
+    Thread-safe collector for stage, phase and per-file costs.
+    """
+
+    def __init__(self, top: int = DEFAULT_TOP, trace_memory: bool = False):
+        """
+        Initialize the profiler.
+
+        Args:
+            top: Number of slowest icons to keep
+            trace_memory: Capture the tracemalloc peak and top allocation sites
+        """
+        self.top = top
+        self.trace_memory = trace_memory
+        self._lock = threading.Lock()
+        self._stages = defaultdict(lambda: {"seconds": 0.0, "files": 0, "bytes": 0, "phases": {}})
+        # min-heap of (seconds, tiebreak, record) holding the slowest files
+        self._slowest = []
+        self._counter = itertools.count()
+        self._start = None
+        self._seconds = None
+        self._memory = None
+
+    def __bool__(self):
+        return True
+
+    def start(self):
+        """Start the wall clock and, if enabled, memory tracing."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_FRAMES)
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """Stop the wall clock and take the memory snapshot."""
+        self._seconds = time.perf_counter() - self._start
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:self.top]
+            tracemalloc.stop()
+            self._memory = {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top_allocations": [
+                    {"location": str(stat.traceback[0]), "bytes": stat.size, "blocks": stat.count}
+                    for stat in top
+                ],
+            }
+
+    @contextmanager
+    def phase(self, stage: str, name: str):
+        """
+        Time a named phase of a stage; repeated phases accumulate.
+
+        Yields:
+            Phase whose bytes attribute the caller may set
+        """
+        handle = Phase()
+        start = time.perf_counter()
+        try:
+            yield handle
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                phases = self._stages[stage]["phases"]
+                totals = phases.setdefault(name, {"seconds": 0.0, "bytes": 0, "calls": 0})
+                totals["seconds"] += seconds
+                totals["bytes"] += handle.bytes
+                totals["calls"] += 1
+
+    def record_file(self, stage: str, path: str, seconds: float, nbytes: int):
+        """Account one icon processed by a stage."""
+        record = {"stage": stage, "path": path, "seconds": seconds, "bytes": nbytes}
+        with self._lock:
+            totals = self._stages[stage]
+            totals["files"] += 1
+            totals["bytes"] += nbytes
+            item = (seconds, next(self._counter), record)
+            if len(self._slowest) < self.top:
+                heapq.heappush(self._slowest, item)
+            elif seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def add_bytes(self, stage: str, nbytes: int):
+        """Account bytes a stage processed that are not tied to single icons."""
+        with self._lock:
+            self._stages[stage]["bytes"] += nbytes
+
+    def stage_done(self, stage: str, seconds: float, status: str):
+        """Record the wall time and outcome of a stage."""
+        with self._lock:
+            totals = self._stages[stage]
+            totals["seconds"] += seconds
+            totals["status"] = status
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a whole stage run outside the build orchestrator."""
+        start = time.perf_counter()
+        yield
+        self.stage_done(name, time.perf_counter() - start, "ran")
+
+    def report(self) -> Dict:
+        """Return the collected data as a JSON-serializable dictionary."""
+        with self._lock:
+            stages = {}
+            for name, totals in self._stages.items():
+                stages[name] = dict(totals, phases=dict(sorted(
+                    totals["phases"].items(), key=lambda item: item[1]["seconds"], reverse=True)))
+            slowest = [record for _, _, record in sorted(self._slowest, reverse=True)]
+        report = {"seconds": self._seconds, "stages": stages, "slowest_files": slowest}
+        if self._memory is not None:
+            report["memory"] = self._memory
+        return report
+
+    def write(self, path: Union[str, Path]):
+        """Write the report as JSON."""
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def summary(self) -> str:
+        """Short human-readable version of the report."""
+        report = self.report()
+        lines = []
+        for name, totals in report["stages"].items():
+            phases = ", ".join(f"{phase} {values['seconds']:.2f}s" for phase, values in totals["phases"].items())
+            lines.append(f"{name}: {totals['seconds']:.2f}s, {totals['files']} files, "
+                         f"{totals['bytes'] / 1e6:.1f} MB" + (f" ({phases})" if phases else ""))
+        for record in report["slowest_files"][:5]:
+            lines.append(f"  slow: {record['path']} ({record['stage']}) "
+                         f"{record['seconds'] * 1000:.1f} ms, {record['bytes'] / 1e3:.1f} kB")
+        if "memory" in report:
+            lines.append(f"tracemalloc peak: {report['memory']['peak_bytes'] / 1e6:.1f} MB")
+        return "\n".join(lines)
+
+
+class NullProfiler:
+    """
+    Profiler stand-in that records nothing.
+    """
+
+    def __bool__(self):
+        return False
+
+    @contextmanager
+    def phase(self, stage: str, name: str):
+        yield Phase()
+
+    def record_file(self, stage: str, path: str, seconds: float, nbytes: int):
+        pass
+
+    def add_bytes(self, stage: str, nbytes: int):
+        pass
+
+    def stage_done(self, stage: str, seconds: float, status: str):
+        pass
+
+    @contextmanager
+    def stage(self, name: str):
+        yield
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def get_profiler(profiler: Optional[Profiler]) -> Union[Profiler, NullProfiler]:
+    """Return the given profiler, or the no-op one."""
+    return profiler if profiler is not None else NULL_PROFILER
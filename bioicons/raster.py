@@ -0,0 +1,233 @@
+"""
+Raster - NumPy scanline rasterization of icon geometry, shared by the simplify
+quality guard, placeholder painting and matplotlib markers.
+
+Segments from bioicons.geometry are flattened into closed pixel-space polygons
+(curves are sampled at FLATTEN_STEPS points) and filled with the nonzero or
+even-odd rule. ShapeWalker walks a document in paint order, resolving
+transforms, inherited paint properties and group opacity, and hands every
+drawable shape to its _shape() hook.
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .geometry import (IDENTITY, NON_RENDERED, TEXT_ELEMENTS, XLINK_HREF, Matrix, Segment, local_name, multiply,
+                       parse_length, parse_numbers, parse_style, parse_transform, viewport_size)
+from .recolor import normalize_color
+
+# Points sampled per curve segment
+FLATTEN_STEPS = 8
+
+Color = Tuple[float, float, float]
+
+
+def have_numpy() -> bool:
+    """Check whether rasterization (which needs NumPy) is available."""
+    return np is not None
+
+
+def rgb(color: str) -> Color:
+    """Channels of a #rrggbb color as floats in 0..1."""
+    return tuple(int(color[i:i + 2], 16) / 255.0 for i in (1, 3, 5))
+
+
+def parse_opacity(value: Optional[str], default: float = 1.0) -> float:
+    """Opacity attribute value clamped to 0..1; default for missing or malformed values."""
+    try:
+        return min(1.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+def flatten(segments: Sequence[Segment], matrix: Matrix, origin, scale: float) -> List:
+    """
+    Flatten segments into closed polygons in pixel space.
+
+    Args:
+        segments: Absolute M/L/Q/C/Z segments (see geometry.parse_path)
+        matrix: Transform from the segments' user space to document space
+        origin: Document point mapped to pixel (0, 0)
+        scale: Pixels per document unit
+
+    Returns:
+        One (N, 2) point array per subpath
+    """
+    subpaths = []
+    curves: List[List[float]] = []
+    current = start = (0.0, 0.0)
+    for command, args in segments:
+        if command == "M":
+            if curves:
+                subpaths.append(curves)
+            curves = []
+            current = start = args
+            continue
+        if command == "L":
+            c = (*current, *current, *args, *args)
+        elif command == "Q":
+            # Degree elevation: the quadratic as an exact cubic
+            qx, qy, x, y = args
+            c = (*current, current[0] + 2 / 3 * (qx - current[0]), current[1] + 2 / 3 * (qy - current[1]),
+                 x + 2 / 3 * (qx - x), y + 2 / 3 * (qy - y), x, y)
+        elif command == "C":
+            c = (*current, *args)
+        else:
+            c = (*current, *current, *start, *start)
+            args = start
+        curves.append(c)
+        current = tuple(args[-2:])
+    if curves:
+        subpaths.append(curves)
+
+    t = np.linspace(0, 1, FLATTEN_STEPS + 1)[1:, None]
+    weights = np.hstack([(1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t ** 2, t ** 3])  # (steps, 4)
+    a, b, c, d, e, f = matrix
+    polygons = []
+    for curves in subpaths:
+        controls = np.asarray(curves, dtype=np.float64).reshape(-1, 4, 2)
+        points = np.einsum("sk,nkd->nsd", weights, controls).reshape(-1, 2)
+        points = np.vstack([controls[0, 0], points])
+        x = a * points[:, 0] + c * points[:, 1] + e
+        y = b * points[:, 0] + d * points[:, 1] + f
+        polygons.append(np.stack([(x - origin[0]) * scale, (y - origin[1]) * scale], axis=1))
+    return polygons
+
+
+def rasterize(polygons: Sequence, shape: Tuple[int, int], nonzero: bool = True):
+    """
+    Scanline-fill polygons, sampling pixel centers.
+
+    Args:
+        polygons: Closed (N, 2) point arrays in pixel coordinates
+        shape: (height, width) of the raster
+        nonzero: Use the nonzero winding rule, else even-odd
+
+    Returns:
+        Boolean (height, width) coverage mask
+    """
+    height, width = shape
+    # Winding deltas per row; a cumulative sum along the row yields winding numbers
+    grid = np.zeros((height, width + 1), dtype=np.int32)
+    for polygon in polygons:
+        p0 = polygon
+        p1 = np.roll(polygon, -1, axis=0)
+        y0, y1 = p0[:, 1], p1[:, 1]
+        first = np.clip(np.ceil(np.minimum(y0, y1) - 0.5), 0, height).astype(np.int64)
+        last = np.clip(np.ceil(np.maximum(y0, y1) - 0.5), 0, height).astype(np.int64)
+        counts = last - first
+        edges = np.nonzero(counts > 0)[0]
+        if not len(edges):
+            continue
+        counts = counts[edges]
+        edge = np.repeat(edges, counts)
+        offsets = np.arange(len(edge)) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = first[edge] + offsets
+        t = (rows + 0.5 - y0[edge]) / (y1[edge] - y0[edge])
+        x = p0[edge, 0] + t * (p1[edge, 0] - p0[edge, 0])
+        cols = np.clip(np.ceil(x - 0.5), 0, width).astype(np.int64)
+        delta = np.where(y1[edge] > y0[edge], 1, -1) if nonzero else np.ones(len(edge), dtype=np.int32)
+        np.add.at(grid, (rows, cols), delta)
+    winding = np.cumsum(grid, axis=1)[:, :width]
+    return winding != 0 if nonzero else (winding % 2) == 1
+
+
+class ShapeWalker:
+    """
+    Visits the drawable shapes of an SVG document in paint order.
+
+    The viewBox is fitted, centered, into a size x size pixel square: a shape's
+    points map to pixels through its matrix, then origin and scale. Subclasses
+    implement _shape(), which receives the element's local tag, the element,
+    its accumulated transform, its resolved paint properties and its opacity.
+    Text and embedded images are skipped.
+    """
+
+    MAX_DEPTH = 64
+
+    def __init__(self, root, size: int):
+        self.root = root
+        self.viewport = viewport_size(root)
+        self.ids = {elem.get("id"): elem for elem in root.iter() if elem.get("id")}
+        self.size = size
+
+        # Fit the viewBox into the square canvas, centered
+        numbers = parse_numbers(root.get("viewBox"))
+        x, y = (numbers[0], numbers[1]) if len(numbers) == 4 else (0.0, 0.0)
+        width, height = self.viewport
+        self.scale = size / max(width, height)
+        self.origin = (x - (max(width, height) - width) / 2, y - (max(width, height) - height) / 2)
+
+        self._walk(root, IDENTITY, {"fill": "#000000", "stroke": "none", "stroke-width": "1",
+                                    "fill-rule": "nonzero"}, 1.0, 0)
+
+    def _shape(self, tag: str, elem, matrix: Matrix, paint: Dict[str, str], opacity: float):
+        raise NotImplementedError
+
+    def _paint_color(self, value: str) -> Optional[Color]:
+        """Flat color of a fill or stroke value, or None if nothing is painted."""
+        value = value.strip()
+        if value in ("none", "transparent"):
+            return None
+        if value.startswith("url("):
+            target = self.ids.get(value[value.find("#") + 1:value.rfind(")")].strip("'\""))
+            return self._gradient_color(target, 0)
+        color = normalize_color(value)
+        # Named colors and currentColor are rare in the library; black is the SVG default
+        return rgb(color) if color else (0.0, 0.0, 0.0)
+
+    def _gradient_color(self, gradient, depth: int) -> Optional[Color]:
+        if gradient is None or depth > 8:
+            return None
+        stops = [rgb(c) for c in (normalize_color(parse_style(stop.get("style")).get("stop-color",
+                                                  stop.get("stop-color", "#000000")))
+                                  for stop in gradient if local_name(stop.tag) == "stop") if c]
+        if stops:
+            return tuple(sum(channel) / len(stops) for channel in zip(*stops))
+        # Gradients may inherit their stops through href
+        href = gradient.get(XLINK_HREF) or gradient.get("href") or ""
+        return self._gradient_color(self.ids.get(href[1:]), depth + 1) if href.startswith("#") else None
+
+    def _walk(self, elem, matrix: Matrix, inherited: Dict[str, str], opacity: float, depth: int):
+        if depth > self.MAX_DEPTH:
+            return
+        for child in elem:
+            tag = local_name(child.tag)
+            if tag is None or tag in NON_RENDERED or tag in TEXT_ELEMENTS:
+                continue
+            style = parse_style(child.get("style"))
+            if child.get("display") == "none" or style.get("display") == "none":
+                continue
+
+            paint = dict(inherited)
+            for name in ("fill", "stroke", "stroke-width", "fill-rule", "fill-opacity", "stroke-opacity"):
+                value = style.get(name, child.get(name))
+                if value is not None and value != "inherit":
+                    paint[name] = value
+            alpha = opacity * parse_opacity(style.get("opacity", child.get("opacity")))
+            m = multiply(matrix, parse_transform(child.get("transform")))
+
+            if tag in ("g", "a", "switch"):
+                self._walk(child, m, paint, alpha, depth + 1)
+            elif tag == "svg":
+                offset = (1.0, 0.0, 0.0, 1.0, parse_length(child.get("x")), parse_length(child.get("y")))
+                self._walk(child, multiply(m, offset), paint, alpha, depth + 1)
+            elif tag == "use":
+                href = child.get(XLINK_HREF) or child.get("href") or ""
+                target = self.ids.get(href[1:]) if href.startswith("#") else None
+                if target is not None:
+                    offset = (1.0, 0.0, 0.0, 1.0, parse_length(child.get("x")), parse_length(child.get("y")))
+                    if local_name(target.tag) in ("symbol", "svg"):
+                        # Symbols are only drawn through <use>; walk their content directly
+                        holder = target
+                    else:
+                        holder = ET.Element("g")
+                        holder.append(target)
+                    self._walk(holder, multiply(m, offset), paint, alpha, depth + 1)
+            elif tag != "image":
+                self._shape(tag, child, m, paint, alpha)
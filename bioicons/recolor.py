@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Palette Recoloring - Maps icon colors onto a theme palette.
+
+Colors are found in fill, stroke, stop-color, flood-color, lighting-color and
+color attributes, in style="" declarations and in <style> sheets. Every distinct
+source color of the whole library is collected first; the mapping for all of them
+is then computed in one vectorized CIELAB nearest-color lookup (or, for grayscale,
+by dropping the chroma of each color), and the files are rewritten with that map.
+Only color tokens change, so the rest of each document is byte-identical.
+
+Themes:
+    bioicons   the Bioicons palette plus white, so highlights stay white
+    grayscale  keeps lightness, removes chroma
+"""
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .tree import scan_icons
+
+# Icons per worker task when recoloring a tree
+RECOLOR_BATCH = 16
+
+BIOICONS_PALETTE = ("#19aeff", "#ff4141", "#ffc022", "#5dbb63", "#333333")
+
+# Theme name -> target palette; None means grayscale
+THEMES: Dict[str, Optional[Tuple[str, ...]]] = {
+    "bioicons": BIOICONS_PALETTE + ("#ffffff",),
+    "grayscale": None,
+}
+
+COLOR_PROPERTIES = ("fill", "stroke", "stop-color", "flood-color", "lighting-color", "color")
+_PROPS = "|".join(re.escape(name) for name in COLOR_PROPERTIES)
+
+# fill="..." attributes
+ATTRIBUTE_RE = re.compile(r'(?<![\w:.-])(' + _PROPS + r')(\s*=\s*)(["\'])(.*?)\3', re.S)
+# CSS is only looked at inside style="" attributes and <style> sheets
+STYLE_ATTRIBUTE_RE = re.compile(r'(?<![\w:.-])(style\s*=\s*)(["\'])(.*?)\2', re.S)
+STYLE_SHEET_RE = re.compile(r'(<style\b[^>]*>)(.*?)(</style>)', re.S)
+DECLARATION_RE = re.compile(r'(?<![\w:.-])(' + _PROPS + r')(\s*:\s*)([^;"\'}<>]+)')
+# url(...) references are matched first so that ids such as #abc are left alone
+TOKEN_RE = re.compile(r'url\([^)]*\)|#[0-9a-fA-F]{3,8}\b|rgba?\([^)]*\)|\b[a-zA-Z]+\b')
+
+NAMED_COLORS = {
+    "black": "#000000", "silver": "#c0c0c0", "gray": "#808080", "grey": "#808080",
+    "white": "#ffffff", "maroon": "#800000", "red": "#ff0000", "purple": "#800080",
+    "fuchsia": "#ff00ff", "magenta": "#ff00ff", "green": "#008000", "lime": "#00ff00",
+    "olive": "#808000", "yellow": "#ffff00", "navy": "#000080", "blue": "#0000ff",
+    "teal": "#008080", "aqua": "#00ffff", "cyan": "#00ffff", "orange": "#ffa500",
+    "darkgray": "#a9a9a9", "darkgrey": "#a9a9a9", "lightgray": "#d3d3d3",
+    "lightgrey": "#d3d3d3", "dimgray": "#696969", "dimgrey": "#696969",
+}
+
+
+def have_numpy() -> bool:
+    """Check whether the vectorized color lookup is available."""
+    return np is not None
+
+
+def normalize_color(token: str) -> Optional[str]:
+    """
+    Normalize a color token to #rrggbb.
+
+    Returns:
+        The lowercase hex color, or None for tokens that are not plain colors
+        (none, currentColor, url(...), keywords, malformed values)
+    """
+    token = token.strip().lower()
+    if token.startswith("#"):
+        digits = token[1:]
+        if len(digits) in (3, 4):
+            return "#" + "".join(c * 2 for c in digits[:3])
+        if len(digits) in (6, 8):
+            return "#" + digits[:6]
+        return None
+    if token.startswith("rgb"):
+        parts = token[token.find("(") + 1:-1].replace("/", ",").replace(" ", ",").split(",")
+        parts = [part for part in parts if part]
+        if len(parts) < 3:
+            return None
+        try:
+            channels = [float(p[:-1]) * 2.55 if p.endswith("%") else float(p) for p in parts[:3]]
+        except ValueError:
+            return None
+        return "#" + "".join(f"{min(255, max(0, round(c))):02x}" for c in channels)
+    return NAMED_COLORS.get(token)
+
+
+def _replace_tokens(value: str, mapping: Dict[str, str]) -> str:
+    def substitute(match):
+        token = match.group(0)
+        if token.startswith("url("):
+            return token
+        color = normalize_color(token)
+        target = mapping.get(color) if color else None
+        if target is None:
+            return token
+        if token.startswith("#") and len(token) in (5, 9):
+            # Keep the alpha digits of #rgba / #rrggbbaa
+            alpha = token[4] * 2 if len(token) == 5 else token[7:]
+            return target + alpha
+        if token.lower().startswith("rgb"):
+            # rgba(r, g, b, a), rgb(r, g, b, a) and CSS Color 4 rgb(r g b / a) keep their alpha
+            inner = token[token.find("(") + 1:-1]
+            if "/" in inner:
+                alpha = inner.rsplit("/", 1)[1].strip()
+            else:
+                parts = [part for part in inner.replace(" ", ",").split(",") if part]
+                alpha = parts[3] if len(parts) > 3 else None
+            if alpha:
+                r, g, b = (int(target[i:i + 2], 16) for i in (1, 3, 5))
+                return f"rgba({r},{g},{b},{alpha})"
+        return target
+    return TOKEN_RE.sub(substitute, value)
+
+
+def _css_blocks(svg: str) -> List[str]:
+    return ([m.group(3) for m in STYLE_ATTRIBUTE_RE.finditer(svg)] +
+            [m.group(2) for m in STYLE_SHEET_RE.finditer(svg)])
+
+
+def extract_colors(svg: str) -> Set[str]:
+    """Return the distinct normalized colors used by a document."""
+    values = [m.group(4) for m in ATTRIBUTE_RE.finditer(svg)]
+    for css in _css_blocks(svg):
+        values.extend(m.group(3) for m in DECLARATION_RE.finditer(css))
+    return {color for value in values for color in map(normalize_color, TOKEN_RE.findall(value)) if color}
+
+
+def recolor_svg(svg: str, mapping: Dict[str, str]) -> str:
+    """
+    Rewrite the colors of a document.
+
+    Args:
+        svg: SVG document text
+        mapping: Normalized source color -> target color
+
+    Returns:
+        The document with every mapped color replaced
+    """
+    def css(text):
+        return DECLARATION_RE.sub(lambda m: m.group(1) + m.group(2) + _replace_tokens(m.group(3), mapping), text)
+
+    svg = ATTRIBUTE_RE.sub(
+        lambda m: m.group(1) + m.group(2) + m.group(3) + _replace_tokens(m.group(4), mapping) + m.group(3), svg)
+    svg = STYLE_ATTRIBUTE_RE.sub(lambda m: m.group(1) + m.group(2) + css(m.group(3)) + m.group(2), svg)
+    return STYLE_SHEET_RE.sub(lambda m: m.group(1) + css(m.group(2)) + m.group(3), svg)
+
+
+# ---------------------------------------------------------------------------
+# Color science (vectorized)
+# ---------------------------------------------------------------------------
+
+# sRGB (D65) <-> CIE XYZ
+_RGB_TO_XYZ = ((0.4124564, 0.3575761, 0.1804375),
+               (0.2126729, 0.7151522, 0.0721750),
+               (0.0193339, 0.1191920, 0.9503041))
+_WHITE = (0.95047, 1.0, 1.08883)
+
+
+def hex_to_rgb(colors: Iterable[str]):
+    """Convert #rrggbb strings to an (N, 3) array of 0-1 sRGB values."""
+    values = [[int(c[i:i + 2], 16) for i in (1, 3, 5)] for c in colors]
+    return np.asarray(values, dtype=np.float64).reshape(-1, 3) / 255.0
+
+
+def rgb_to_hex(rgb) -> List[str]:
+    """Convert an (N, 3) array of 0-1 sRGB values to #rrggbb strings."""
+    values = np.clip(np.rint(rgb * 255.0), 0, 255).astype(np.int64)
+    return ["#%02x%02x%02x" % tuple(row) for row in values]
+
+
+def rgb_to_lab(rgb):
+    """Convert (N, 3) sRGB values to CIELAB."""
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ np.asarray(_RGB_TO_XYZ).T / np.asarray(_WHITE)
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+
+def lab_to_rgb(lab):
+    """Convert (N, 3) CIELAB values to sRGB (clipped to the gamut)."""
+    fy = (lab[:, 0] + 16) / 116
+    f = np.stack([fy + lab[:, 1] / 500, fy, fy - lab[:, 2] / 200], axis=1)
+    xyz = np.where(f > 6 / 29, f ** 3, 3 * (6 / 29) ** 2 * (f - 4 / 29)) * np.asarray(_WHITE)
+    linear = np.clip(xyz @ np.linalg.inv(np.asarray(_RGB_TO_XYZ)).T, 0, 1)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+
+def build_color_map(colors: Iterable[str], palette: Optional[Iterable[str]]) -> Dict[str, str]:
+    """
+    Map source colors to a theme in one vectorized pass.
+
+    Args:
+        colors: Normalized #rrggbb source colors
+        palette: Target colors; None converts to grayscale instead
+
+    Returns:
+        Source color -> target color
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for recoloring")
+    colors = sorted(set(colors))
+    if not colors:
+        return {}
+
+    lab = rgb_to_lab(hex_to_rgb(colors))
+    if palette is None:
+        lab[:, 1:] = 0
+        targets = rgb_to_hex(lab_to_rgb(lab))
+    else:
+        palette = [normalize_color(color) for color in palette]
+        palette_lab = rgb_to_lab(hex_to_rgb(palette))
+        # (N, P) squared CIE76 distances; argmin picks the nearest palette entry
+        distances = ((lab[:, None, :] - palette_lab[None, :, :]) ** 2).sum(axis=2)
+        targets = [palette[i] for i in distances.argmin(axis=1)]
+    return dict(zip(colors, targets))
+
+
+# ---------------------------------------------------------------------------
+# Bulk recoloring
+# ---------------------------------------------------------------------------
+
+def _read_colors(path: str) -> Set[str]:
+    with open(path, encoding="utf-8", errors="surrogateescape") as f:
+        return extract_colors(f.read())
+
+
+def recolor_file(job: Tuple[str, Dict[str, str]], maps: Dict[str, Dict[str, str]]) -> int:
+    """
+    Write every themed variant of one icon.
+
+    Args:
+        job: (source path, theme name -> destination path)
+        maps: Theme name -> color map
+
+    Returns:
+        Number of files written
+    """
+    src, destinations = job
+    with open(src, encoding="utf-8", errors="surrogateescape") as f:
+        svg = f.read()
+    for theme, dst in destinations.items():
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        with open(dst, "w", encoding="utf-8", errors="surrogateescape") as f:
+            f.write(recolor_svg(svg, maps[theme]))
+    return len(destinations)
+
+
+def _recolor_batch(batch) -> int:
+    # The color maps travel once per batch rather than once per icon
+    maps, jobs = batch
+    return sum(recolor_file(job, maps) for job in jobs)
+
+
+def update_color_maps(colors: Set[str], themes: Dict[str, Optional[Tuple[str, ...]]],
+                      cache: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """
+    Extend cached color maps with colors that have not been mapped yet.
+
+    Args:
+        colors: All source colors in use
+        themes: Theme name -> palette
+        cache: Theme name -> existing color map; updated in place
+
+    Returns:
+        The cache
+    """
+    for theme, palette in themes.items():
+        mapping = cache.setdefault(theme, {})
+        mapping.update(build_color_map((c for c in colors if c not in mapping), palette))
+    return cache
+
+
+def recolor_tree(src_root: Union[str, Path], out_root: Union[str, Path],
+                 themes: Optional[Dict[str, Optional[Tuple[str, ...]]]] = None,
+                 paths: Optional[List[str]] = None, jobs: Optional[int] = None,
+                 cache: Optional[Dict[str, Dict[str, str]]] = None,
+                 mp_context=None, executor: Optional[Executor] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Recolor a license/category/author/icon.svg tree into one tree per theme.
+
+    Args:
+        src_root: Source tree
+        out_root: Output directory; each theme is written to out_root/<theme>
+        themes: Theme name -> palette (default: THEMES)
+        paths: Relative icon paths to process (default: all icons in src_root)
+        jobs: Worker processes
+        cache: Color maps from an earlier run, extended with new colors
+        mp_context: multiprocessing context for the worker pool
+        executor: Process pool to run on instead of starting one (jobs and mp_context are then unused)
+
+    Returns:
+        The color maps per theme
+    """
+    themes = THEMES if themes is None else themes
+    src_root, out_root = Path(src_root), Path(out_root)
+    if paths is None:
+        paths = [icon["path"] for icon in scan_icons(src_root)]
+    cache = {} if cache is None else cache
+    if not paths:
+        return cache
+
+    sources = [str(src_root / path) for path in paths]
+    with nullcontext(executor) if executor is not None else ProcessPoolExecutor(jobs, mp_context=mp_context) as pool:
+        colors = set().union(*pool.map(_read_colors, sources, chunksize=32))
+        update_color_maps(colors, themes, cache)
+
+        maps = {theme: cache[theme] for theme in themes}
+        work = [(src, {theme: str(out_root / theme / path) for theme in themes})
+                for src, path in zip(sources, paths)]
+        batches = [(maps, work[i:i + RECOLOR_BATCH]) for i in range(0, len(work), RECOLOR_BATCH)]
+        for _ in pool.map(_recolor_batch, batches):
+            pass
+    return cache
+
+
+def parse_palette(spec: str) -> Tuple[str, Optional[Tuple[str, ...]]]:
+    """Parse a NAME=#hex,#hex,... theme definition (NAME=gray for grayscale)."""
+    name, _, colors = spec.partition("=")
+    if not name or not colors:
+        raise argparse.ArgumentTypeError(f"Expected NAME=#hex,#hex,... got {spec!r}")
+    if colors in ("gray", "grey", "grayscale"):
+        return name, None
+    palette = tuple(normalize_color(color) for color in colors.split(","))
+    if None in palette:
+        raise argparse.ArgumentTypeError(f"Invalid color in {spec!r}")
+    return name, palette
+
+
+def main():
+    """Recolor an icon tree from the command line."""
+    parser = argparse.ArgumentParser(description="Write palette-recolored copies of an icon tree")
+    parser.add_argument("source", help="Icon tree (license/category/author/icon.svg)")
+    parser.add_argument("output", help="Output directory; one subdirectory per theme")
+    parser.add_argument("--theme", "-t", action="append", choices=sorted(THEMES),
+                        help="Built-in theme (repeatable; default: all)")
+    parser.add_argument("--palette", "-p", action="append", type=parse_palette, default=[],
+                        help="Custom theme as NAME=#hex,#hex,... (or NAME=gray)")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if np is None:
+        print("Error: NumPy is required for recoloring (pip install numpy)")
+        return 1
+
+    themes = {name: THEMES[name] for name in args.theme or ([] if args.palette else THEMES)}
+    themes.update(args.palette)
+    maps = recolor_tree(args.source, args.output, themes, jobs=args.jobs)
+    for theme, mapping in maps.items():
+        print(f"{theme}: {len(mapping)} colors mapped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+SVG Rendering - Rasterizes icons with CairoSVG.
+
+CairoSVG needs the native Cairo library (see svg_critic/INSTALL.md). When it is
+missing, have_renderer() returns False and stages that need rasters are skipped.
+"""
+
+from typing import Optional
+
+try:
+    import cairosvg
+except (ImportError, OSError):
+    # OSError: the Python package is installed but libcairo is not
+    cairosvg = None
+
+
+def have_renderer() -> bool:
+    """Check whether SVG rasterization is available."""
+    return cairosvg is not None
+
+
+def render_png(svg: bytes, width: Optional[int] = None, height: Optional[int] = None,
+               dpi: float = 96, scale: float = 1) -> bytes:
+    """
+    Rasterize an SVG document to PNG.
+
+    Args:
+        svg: SVG document bytes
+        width: Output width in pixels (height follows the aspect ratio if omitted)
+        height: Output height in pixels
+        dpi: Resolution used to convert physical units (mm, in, pt)
+        scale: Extra scale factor applied to the document size
+
+    Returns:
+        PNG bytes
+    """
+    if cairosvg is None:
+        raise RuntimeError("CairoSVG is not available; install cairosvg and the Cairo library")
+    return cairosvg.svg2png(bytestring=svg, output_width=width, output_height=height,
+                            dpi=dpi, scale=scale)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Render Cost - Measures how long each icon takes to rasterize and why.
+
+    python -m bioicons.rendercost --repeats 5 --top 20
+
+Every icon is rendered several times at gallery size on a process pool and the
+median time is kept. The most expensive icons are then profiled element by
+element: each subtree is removed in turn and the icon re-rendered, and the time
+saved is attributed to that subtree. Subtrees that account for a large share of
+the cost are broken down into their children, so the report points at the
+filter, embedded bitmap or huge path to optimize rather than at a whole group.
+
+Timings from parallel workers compete for the CPU; use --jobs 1 for the most
+stable numbers.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .geometry import local_name
+from .render import have_renderer, render_png
+from .tree import ICONS_ROOT, scan_icons
+
+SVG_NS = "http://www.w3.org/2000/svg"
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", "http://www.w3.org/1999/xlink")
+
+REPORT_PATH = ICONS_ROOT.parent.parent / "build" / "rendercost.json"
+DEFAULT_REPEATS = 5
+DEFAULT_SIZE = 256
+DEFAULT_TOP = 20
+# Subtrees costing at least this share of the icon are broken down further
+DRILL_SHARE = 0.1
+# Upper bound on re-renders per profiled icon (times the repeats)
+MAX_REMOVALS = 200
+
+
+def median_render_time(svg: bytes, repeats: int = DEFAULT_REPEATS, size: int = DEFAULT_SIZE) -> float:
+    """
+    Median wall time of rendering a document, in seconds.
+
+    One warm-up render is done first so that font and import setup are not counted.
+    """
+    render_png(svg, width=size)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        render_png(svg, width=size)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def time_icon(job: Tuple[str, int, int]) -> Tuple[Optional[float], int, Optional[str]]:
+    """
+    Time one icon file.
+
+    Args:
+        job: (path, repeats, size)
+
+    Returns:
+        Tuple of (median seconds or None, file size, error or None)
+    """
+    path, repeats, size = job
+    with open(path, "rb") as f:
+        svg = f.read()
+    try:
+        return median_render_time(svg, repeats, size), len(svg), None
+    except Exception as e:
+        return None, len(svg), f"{type(e).__name__}: {e}"
+
+
+def _label(element: ET.Element, path: str) -> Dict:
+    """Describe an element for the report."""
+    label = {"element": path, "tag": local_name(element.tag)}
+    if element.get("id"):
+        label["id"] = element.get("id")
+    hints = []
+    if element.get("filter") or "filter:" in (element.get("style") or ""):
+        hints.append("filter")
+    if label["tag"] == "image":
+        hints.append("bitmap")
+    if element.get("mask") or element.get("clip-path"):
+        hints.append("mask/clip")
+    if len(element.get("d", "")) > 10000:
+        hints.append(f"path data {len(element.get('d')) // 1024} KB")
+    if hints:
+        label["hints"] = hints
+    return label
+
+
+def attribute_cost(svg: bytes, repeats: int = DEFAULT_REPEATS, size: int = DEFAULT_SIZE,
+                   drill_share: float = DRILL_SHARE, max_removals: int = MAX_REMOVALS) -> Dict:
+    """
+    Attribute an icon's render time to its elements.
+
+    Starting from the children of the root, each subtree is removed and the
+    document re-rendered; the time saved is the subtree's cost. Subtrees costing
+    at least drill_share of the total are broken down into their own children.
+
+    Args:
+        svg: SVG document bytes
+        repeats: Renders per measurement
+        size: Output width in pixels
+        drill_share: Share of the total above which a subtree is broken down
+        max_removals: Most subtrees measured for this icon
+
+    Returns:
+        Dictionary with the baseline seconds and elements sorted by cost
+    """
+    root = ET.fromstring(svg)
+    # Time the re-serialized document, so that removals are compared like for like
+    baseline = median_render_time(ET.tostring(root), repeats, size)
+
+    elements = []
+    queue = [(root, local_name(root.tag))]
+    removals = 0
+    while queue and removals < max_removals:
+        parent, parent_path = queue.pop(0)
+        counts: Dict[str, int] = {}
+        for index, child in enumerate(list(parent)):
+            if removals >= max_removals:
+                break
+            if not isinstance(child.tag, str):
+                continue
+            tag = local_name(child.tag)
+            counts[tag] = counts.get(tag, 0) + 1
+            path = f"{parent_path}/{tag}[{counts[tag]}]"
+
+            parent.remove(child)
+            try:
+                seconds = median_render_time(ET.tostring(root), repeats, size)
+            finally:
+                parent.insert(index, child)
+            removals += 1
+
+            cost = max(baseline - seconds, 0.0)
+            elements.append({**_label(child, path), "seconds": cost,
+                             "share": cost / baseline if baseline else 0.0})
+            if len(child) and cost >= drill_share * baseline:
+                queue.append((child, path))
+
+    elements.sort(key=lambda e: e["seconds"], reverse=True)
+    return {"seconds": baseline, "elements": elements, "removals": removals}
+
+
+def profile_icon(job: Tuple[str, int, int]) -> Dict:
+    """Attribute the cost of one icon file; job is (path, repeats, size)."""
+    path, repeats, size = job
+    with open(path, "rb") as f:
+        svg = f.read()
+    try:
+        return attribute_cost(svg, repeats, size)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def measure_library(root: Union[str, Path] = ICONS_ROOT, repeats: int = DEFAULT_REPEATS,
+                    size: int = DEFAULT_SIZE, top: int = DEFAULT_TOP, jobs: Optional[int] = None) -> Dict:
+    """
+    Time every icon and profile the most expensive ones.
+
+    Args:
+        root: Library root directory
+        repeats: Renders per measurement
+        size: Output width in pixels
+        top: Number of most expensive icons to break down by element
+        jobs: Worker processes
+
+    Returns:
+        Report with every icon ranked by median render time, the element
+        breakdown of the top icons, their elements ranked together, and
+        render failures
+    """
+    if not have_renderer():
+        raise RuntimeError("CairoSVG is not available; install cairosvg and the Cairo library")
+    root = Path(root)
+    paths = [icon["path"] for icon in scan_icons(root)]
+
+    with ProcessPoolExecutor(jobs) as pool:
+        timings = list(pool.map(time_icon, [(str(root / p), repeats, size) for p in paths], chunksize=8))
+        icons = [{"path": path, "seconds": seconds, "bytes": nbytes}
+                 for path, (seconds, nbytes, error) in zip(paths, timings) if error is None]
+        failed = [{"path": path, "error": error} for path, (_, _, error) in zip(paths, timings) if error]
+        icons.sort(key=lambda icon: icon["seconds"], reverse=True)
+
+        worst = icons[:top]
+        breakdowns = pool.map(profile_icon, [(str(root / icon["path"]), repeats, size) for icon in worst])
+        for icon, breakdown in zip(worst, breakdowns):
+            icon["breakdown"] = breakdown
+
+    elements = [{"path": icon["path"], **element} for icon in worst
+                for element in icon["breakdown"].get("elements", [])]
+    elements.sort(key=lambda element: element["seconds"], reverse=True)
+
+    return {
+        "repeats": repeats,
+        "size": size,
+        "total_seconds": sum(icon["seconds"] for icon in icons),
+        "icons": icons,
+        "elements": elements,
+        "failed": failed,
+    }
+
+
+def print_report(report: Dict, top: int = DEFAULT_TOP, elements: int = 5):
+    """Print the most expensive icons and, for each, its most expensive elements."""
+    icons = report["icons"]
+    print(f"Rendered {len(icons)} icons at {report['size']} px in {report['total_seconds']:.2f} s "
+          f"(median of {report['repeats']})")
+    for rank, icon in enumerate(icons[:top], 1):
+        print(f"{rank:3d}. {icon['seconds'] * 1000:8.1f} ms  {icon['bytes'] // 1024:6d} KB  {icon['path']}")
+        breakdown = icon.get("breakdown", {})
+        if "error" in breakdown:
+            print(f"       breakdown failed: {breakdown['error']}")
+        for element in breakdown.get("elements", [])[:elements]:
+            name = element["element"] + (f" #{element['id']}" if "id" in element else "")
+            hints = f"  ({', '.join(element['hints'])})" if "hints" in element else ""
+            print(f"       {element['seconds'] * 1000:8.1f} ms {element['share']:5.0%}  {name}{hints}")
+    for failure in report["failed"]:
+        print(f"  failed: {failure['path']}: {failure['error']}")
+
+
+def main():
+    """Measure render cost from the command line."""
+    parser = argparse.ArgumentParser(description="Rank icons and their elements by rasterization time")
+    parser.add_argument("--root", "-r", default=str(ICONS_ROOT), help="Icon library root")
+    parser.add_argument("--output", "-o", default=str(REPORT_PATH), help="JSON report file")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Renders per measurement (default: 5)")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="Render width in pixels (default: 256)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP,
+                        help="Most expensive icons to break down by element (default: 20)")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    try:
+        report = measure_library(args.root, args.repeats, args.size, args.top, args.jobs)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report, args.top)
+    print(f"Report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
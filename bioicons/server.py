@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Icon Server - Local asyncio HTTP server for the icon library and build artifacts.
+
+Intended for offline development and air-gapped labs. Compared to
+python -m http.server it adds:
+
+- Strong ETags derived from file content, with 304 responses to If-None-Match
+- Precompressed variants (icon.svg.br / icon.svg.gz) chosen by Accept-Encoding
+- Zero-copy transfer with sendfile where the platform supports it
+- A JSON search endpoint at /api/search backed by the built index
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import sqlite3
+import sys
+from email.utils import formatdate
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .catalog import DEFAULT_CATALOG
+from .library import IconLibrary, icon_path
+from .tree import ICONS_ROOT
+
+# Serve static/ so that both icons/ and drawio-lib/ are reachable
+STATIC_ROOT = ICONS_ROOT.parent
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+# Precompressed variants in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+MAX_HEADER_BYTES = 16 * 1024
+SEARCH_LIMIT = 100
+
+mimetypes.add_type("image/svg+xml", ".svg")
+
+
+def _accepted_encodings(header: str) -> set:
+    """Parse an Accept-Encoding header into the set of acceptable codings."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class IconServer:
+    """
+    Asynchronous static file and search server.
+    """
+
+    def __init__(self, root: Union[str, Path] = STATIC_ROOT,
+                 icons_root: Union[str, Path] = ICONS_ROOT,
+                 catalog_path: Optional[Union[str, Path]] = DEFAULT_CATALOG):
+        """
+        Initialize the server.
+
+        Args:
+            root: Directory served at /
+            icons_root: Library root whose index backs /api/search
+            catalog_path: SQLite catalog used for full-text search when it exists
+        """
+        self.root = Path(root).resolve()
+        self.library = IconLibrary(icons_root)
+        self.catalog_path = Path(catalog_path) if catalog_path else None
+        self._catalog = None
+        # path -> ((size, mtime_ns), etag) so files are hashed once per version
+        self._etags = {}
+
+    def _cached_etag(self, path: Path, st: os.stat_result) -> Optional[str]:
+        cached = self._etags.get(path)
+        if cached and cached[0] == (st.st_size, st.st_mtime_ns):
+            return cached[1]
+        return None
+
+    def _etag(self, path: Path, st: os.stat_result) -> str:
+        """Strong ETag from the SHA-256 of the file content."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()[:32]}"'
+        self._etags[path] = ((st.st_size, st.st_mtime_ns), etag)
+        return etag
+
+    def _resolve(self, url_path: str) -> Optional[Path]:
+        """Map a URL path to a file under root, refusing anything outside it."""
+        path = (self.root / unquote(url_path).lstrip("/")).resolve()
+        if path != self.root and self.root not in path.parents:
+            return None
+        try:
+            if path.is_dir():
+                path = path / "index.html"
+            return path if path.is_file() else None
+        except OSError:
+            # e.g. a name too long for the file system
+            return None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    await self._send_error(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, False)
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    await self._send_error(writer, HTTPStatus.BAD_REQUEST, False)
+                    break
+
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                await self._respond(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, writer, method: str, target: str, headers: Dict[str, str], keep_alive: bool):
+        if method not in ("GET", "HEAD"):
+            await self._send_error(writer, HTTPStatus.METHOD_NOT_ALLOWED, keep_alive, {"Allow": "GET, HEAD"})
+            return
+
+        url = urlsplit(target)
+        try:
+            if url.path == "/api/search":
+                result = self.search(parse_qs(url.query))
+            else:
+                path = self._resolve(url.path)
+        except (sqlite3.OperationalError, ValueError):
+            # Unusable query or a path with a NUL byte
+            await self._send_error(writer, HTTPStatus.BAD_REQUEST, keep_alive)
+            return
+        except OSError:
+            # icons.json has not been built or cannot be read
+            await self._send_error(writer, HTTPStatus.SERVICE_UNAVAILABLE, keep_alive)
+            return
+
+        if url.path == "/api/search":
+            body = json.dumps(result).encode("utf-8")
+            self._write_head(writer, HTTPStatus.OK, {
+                "Content-Type": "application/json",
+                "Content-Length": str(len(body)),
+                "Cache-Control": "no-cache",
+            }, keep_alive)
+            if method == "GET":
+                writer.write(body)
+            await writer.drain()
+            return
+
+        if path is None:
+            await self._send_error(writer, HTTPStatus.NOT_FOUND, keep_alive)
+            return
+
+        # Prefer a precompressed variant the client accepts
+        accepted = _accepted_encodings(headers.get("accept-encoding", ""))
+        content_type = mimetypes.guess_type(path.name)[0]
+        content_encoding = None
+        for coding, suffix in ENCODINGS:
+            variant = path.with_name(path.name + suffix)
+            if coding in accepted and variant.is_file():
+                path, content_encoding = variant, coding
+                break
+
+        st = path.stat()
+        etag = self._cached_etag(path, st)
+        if etag is None:
+            # Hash off the event loop; only happens once per file version
+            etag = await asyncio.get_running_loop().run_in_executor(None, self._etag, path, st)
+        response_headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or
+                              etag in (tag.strip() for tag in if_none_match.split(","))):
+            self._write_head(writer, HTTPStatus.NOT_MODIFIED, response_headers, keep_alive)
+            await writer.drain()
+            return
+
+        response_headers["Content-Type"] = content_type or "application/octet-stream"
+        response_headers["Content-Length"] = str(st.st_size)
+        if content_encoding:
+            response_headers["Content-Encoding"] = content_encoding
+        self._write_head(writer, HTTPStatus.OK, response_headers, keep_alive)
+        await writer.drain()
+
+        if method == "GET":
+            with open(path, "rb") as f:
+                # Uses os.sendfile when the transport supports it, else a read/write loop
+                await asyncio.get_running_loop().sendfile(writer.transport, f, 0, st.st_size)
+
+    def _write_head(self, writer, status: HTTPStatus, headers: Dict[str, str], keep_alive: bool):
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}",
+                 f"Date: {formatdate(usegmt=True)}",
+                 "Server: bioicons",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _send_error(self, writer, status: HTTPStatus, keep_alive: bool, headers: Optional[Dict] = None):
+        body = json.dumps({"error": status.phrase}).encode("utf-8")
+        response_headers = {"Content-Type": "application/json", "Content-Length": str(len(body))}
+        response_headers.update(headers or {})
+        self._write_head(writer, status, response_headers, keep_alive)
+        writer.write(body)
+        await writer.drain()
+
+    def search(self, params: Dict[str, List[str]]) -> Dict:
+        """
+        Answer /api/search.
+
+        Query parameters: q (full-text), name, category, license, author and limit
+        (clamped to 1..SEARCH_LIMIT).
+        Free text uses the SQLite catalog's FTS index when it has been built and
+        falls back to a name substring match over icons.json otherwise.
+        """
+        def param(key):
+            values = params.get(key)
+            return values[0] if values else None
+
+        try:
+            limit = max(1, min(int(param("limit") or SEARCH_LIMIT), SEARCH_LIMIT))
+        except ValueError:
+            limit = SEARCH_LIMIT
+        text = param("q")
+        facets = {key: param(key) for key in ("name", "category", "license", "author")}
+
+        if text and text.strip() and self.catalog_path and self.catalog_path.exists():
+            from . import catalog
+            if self._catalog is None:
+                self._catalog = catalog.connect(self.catalog_path)
+            if catalog.has_fts(self._catalog):
+                rows = catalog.search(self._catalog, catalog.fts_query(text), limit=SEARCH_LIMIT * 10)
+                results = [
+                    {key: row[key] for key in ("name", "category", "license", "author", "path")}
+                    for row in rows
+                    if all(value is None or row[key] == value for key, value in facets.items())
+                ]
+                return {"query": text, "count": len(results[:limit]), "results": results[:limit]}
+
+        matches = self.library.find(**facets)
+        if text:
+            needle = text.lower()
+            matches = [icon for icon in matches if needle in icon["name"].lower()]
+        results = [dict(icon, path=icon_path(icon)) for icon in matches[:limit]]
+        return {"query": text, "count": len(results), "results": results}
+
+    async def serve_forever(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        print(f"Serving {self.root} on http://{host}:{port}/")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """Run the icon server from the command line."""
+    parser = argparse.ArgumentParser(description="Serve the icon library locally with caching headers and search")
+    parser.add_argument("--root", "-r", default=str(STATIC_ROOT), help="Directory to serve")
+    parser.add_argument("--icons-root", default=str(ICONS_ROOT), help="Icon library root backing /api/search")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", "-p", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    args = parser.parse_args()
+
+    server = IconServer(args.root, args.icons_root, Path(args.icons_root) / "icons.sqlite")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Server stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
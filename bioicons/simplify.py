@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Path Simplification - Reduces node counts of traced icons under a quality guard.
+
+Each path is simplified in two steps: Bézier segments whose control points lie
+within the tolerance of their chord become lines, and runs of lines are thinned
+with Ramer-Douglas-Peucker. The result is accepted only if the path's filled
+silhouette, rasterized with NumPy at display scale before and after, differs by
+less than the error threshold; otherwise the original path data is kept.
+
+Paths that are not filled (stroke-only outlines) are left alone, because their
+silhouette says nothing about how the stroke renders.
+"""
+
+import argparse
+import os
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .geometry import (IDENTITY, Matrix, Segment, format_path, local_name, multiply, parse_path,
+                       parse_style, parse_transform, viewport_size)
+from .raster import flatten, rasterize
+from .tree import scan_icons
+
+SVG_NS = "http://www.w3.org/2000/svg"
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", "http://www.w3.org/1999/xlink")
+
+# Tolerance as a fraction of the longer viewBox side (0.5 units on a 1000 unit canvas)
+DEFAULT_TOLERANCE = 0.0005
+# Largest accepted share of changed pixels within the path's silhouette
+DEFAULT_THRESHOLD = 0.01
+RASTER_SIZE = 512
+# Area (in pixels) below which error is measured against this fixed area, so that a
+# single flipped pixel does not veto simplifying a speck a few pixels wide
+MIN_ERROR_AREA = 100
+
+
+def have_numpy() -> bool:
+    """Check whether simplification (which needs NumPy) is available."""
+    return np is not None
+
+
+def count_nodes(segments: Sequence[Segment]) -> int:
+    """Number of drawing commands in a path (closepath excluded)."""
+    return sum(1 for command, _ in segments if command != "Z")
+
+
+# ---------------------------------------------------------------------------
+# Simplification
+# ---------------------------------------------------------------------------
+
+def rdp(points, tolerance: float):
+    """
+    Ramer-Douglas-Peucker polyline simplification.
+
+    Args:
+        points: (N, 2) array
+        tolerance: Largest allowed distance of a removed point from the result
+
+    Returns:
+        Boolean mask of the points to keep (first and last are always kept)
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = points[first], points[last]
+        inner = points[first + 1:last]
+        ab = b - a
+        length2 = float(ab @ ab)
+        if length2 == 0:
+            distances = np.hypot(*(inner - a).T)
+        else:
+            # Distance to the segment, not the infinite line, so closed loops work
+            t = np.clip((inner - a) @ ab / length2, 0, 1)
+            distances = np.hypot(*(inner - (a + t[:, None] * ab)).T)
+        index = int(distances.argmax())
+        if distances[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+
+def _is_flat(start: Tuple[float, float], args: Tuple[float, ...], tolerance: float) -> bool:
+    """Whether a Q/C segment's control points are within tolerance of its chord."""
+    # Called once per curve, so plain floats beat NumPy here
+    ax, ay = start
+    bx, by = args[-2], args[-1]
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    for i in range(0, len(args) - 2, 2):
+        px, py = args[i] - ax, args[i + 1] - ay
+        t = min(1.0, max(0.0, (px * dx + py * dy) / length2)) if length2 else 0.0
+        if (px - t * dx) ** 2 + (py - t * dy) ** 2 > tolerance * tolerance:
+            return False
+    return True
+
+
+def simplify_segments(segments: Sequence[Segment], tolerance: float) -> List[Segment]:
+    """
+    Simplify path segments.
+
+    Args:
+        segments: Absolute segments from geometry.parse_path
+        tolerance: Largest allowed deviation in user units
+
+    Returns:
+        New segments with flat curves turned into lines and line runs thinned
+    """
+    out: List[Segment] = []
+    run: List[Tuple[float, float]] = []
+    current = start = (0.0, 0.0)
+
+    def flush():
+        if len(run) > 1:
+            points = np.asarray(run, dtype=np.float64)
+            for point in points[rdp(points, tolerance)][1:]:
+                out.append(("L", (float(point[0]), float(point[1]))))
+        run.clear()
+
+    for command, args in segments:
+        if command == "M":
+            flush()
+            out.append((command, args))
+            current = start = args
+            run.append(current)
+        elif command == "L" or (command in ("Q", "C") and _is_flat(current, args, tolerance)):
+            if not run:
+                run.append(current)
+            current = tuple(args[-2:])
+            run.append(current)
+        elif command in ("Q", "C"):
+            flush()
+            out.append((command, args))
+            current = tuple(args[-2:])
+        elif command == "Z":
+            flush()
+            out.append((command, args))
+            current = start
+    flush()
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Raster guard
+# ---------------------------------------------------------------------------
+
+def _window(polygons: Sequence, shape: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    """Pixel rows and columns (top, bottom, left, right) covered by polygons, clipped to the raster."""
+    points = np.vstack(polygons)
+    top, left = np.floor(points.min(axis=0)[::-1]).astype(int)
+    bottom, right = np.ceil(points.max(axis=0)[::-1]).astype(int) + 1
+    return max(0, top), min(shape[0], bottom), max(0, left), min(shape[1], right)
+
+
+def raster_error(before, after) -> float:
+    """Share of pixels that changed, relative to the area covered before or after."""
+    changed = np.count_nonzero(before ^ after)
+    return changed / max(MIN_ERROR_AREA, np.count_nonzero(before | after))
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+def _filled_paths(elem, matrix: Matrix, inherited: Dict[str, str], found: List):
+    """Collect (path element, transform, nonzero) for every path that is filled."""
+    for child in elem:
+        tag = local_name(child.tag)
+        if tag is None:
+            continue
+        style = parse_style(child.get("style"))
+        paint = dict(inherited)
+        for name in ("fill", "fill-rule"):
+            value = style.get(name, child.get(name))
+            if value is not None and value != "inherit":
+                paint[name] = value
+        m = multiply(matrix, parse_transform(child.get("transform")))
+        if tag == "path":
+            if paint["fill"] not in ("none", "transparent"):
+                found.append((child, m, paint["fill-rule"] != "evenodd"))
+        else:
+            _filled_paths(child, m, paint, found)
+
+
+def simplify_svg(data: bytes, tolerance: float = DEFAULT_TOLERANCE,
+                 threshold: float = DEFAULT_THRESHOLD, size: int = RASTER_SIZE) -> Tuple[bytes, Dict]:
+    """
+    Simplify the paths of one icon.
+
+    Args:
+        data: SVG document bytes
+        tolerance: Deviation allowed per path, as a fraction of the longer viewBox side
+        threshold: Largest accepted raster error per path
+        size: Raster size (longer side) for the quality check
+
+    Returns:
+        Tuple of (output bytes, statistics with node and byte counts and the
+        number of paths accepted and rejected)
+    """
+    stats = {"nodes_before": 0, "nodes_after": 0, "bytes_before": len(data), "bytes_after": len(data),
+             "simplified": 0, "rejected": 0}
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return data, stats
+
+    vw, vh = viewport_size(root)
+    viewbox = [float(v) for v in (root.get("viewBox") or "").replace(",", " ").split()] or [0, 0, vw, vh]
+    origin = viewbox[:2] if len(viewbox) == 4 else (0.0, 0.0)
+    scale = size / max(vw, vh)
+    shape = (max(1, int(np.ceil(vh * scale))), max(1, int(np.ceil(vw * scale))))
+    user_tolerance = tolerance * max(vw, vh)
+
+    paths = []
+    _filled_paths(root, IDENTITY, {"fill": "black", "fill-rule": "nonzero"}, paths)
+    changed = False
+    for elem, matrix, nonzero in paths:
+        original = elem.get("d") or ""
+        segments = parse_path(original)
+        nodes = count_nodes(segments)
+        stats["nodes_before"] += nodes
+        # Tolerance is given in document units; undo the element's own scaling
+        local_scale = abs(matrix[0] * matrix[3] - matrix[1] * matrix[2]) ** 0.5 or 1.0
+        simplified = simplify_segments(segments, user_tolerance / local_scale)
+        d = format_path(simplified)
+        if count_nodes(simplified) >= nodes or len(d) >= len(original):
+            stats["nodes_after"] += nodes
+            continue
+
+        old = flatten(segments, matrix, origin, scale)
+        new = flatten(simplified, matrix, origin, scale)
+        # Only rasterize the window both versions cover
+        top, bottom, left, right = _window(old + new, shape)
+        if bottom <= top or right <= left:
+            error = 0.0
+        else:
+            offset = np.array([left, top], dtype=np.float64)
+            window = (bottom - top, right - left)
+            before = rasterize([p - offset for p in old], window, nonzero)
+            after = rasterize([p - offset for p in new], window, nonzero)
+            error = raster_error(before, after)
+        if error > threshold:
+            stats["rejected"] += 1
+            stats["nodes_after"] += nodes
+            continue
+
+        elem.set("d", d)
+        changed = True
+        stats["simplified"] += 1
+        stats["nodes_after"] += count_nodes(simplified)
+
+    if not changed:
+        return data, stats
+    output = ET.tostring(root, encoding="utf-8", xml_declaration=False)
+    if len(output) >= len(data):
+        stats["nodes_after"] = stats["nodes_before"]
+        stats["simplified"] = 0
+        return data, stats
+    stats["bytes_after"] = len(output)
+    return output, stats
+
+
+def simplify_file(job) -> Dict:
+    """
+    Simplify src into dst.
+
+    Args:
+        job: (source path, destination path, tolerance, threshold)
+
+    Returns:
+        Statistics from simplify_svg()
+    """
+    src, dst, tolerance, threshold = job
+    with open(src, "rb") as f:
+        data = f.read()
+    output, stats = simplify_svg(data, tolerance, threshold)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    with open(dst, "wb") as f:
+        f.write(output)
+    return stats
+
+
+def main():
+    """Simplify an icon tree from the command line."""
+    parser = argparse.ArgumentParser(description="Simplify icon paths under a raster-difference guard")
+    parser.add_argument("source", help="Icon tree (license/category/author/icon.svg)")
+    parser.add_argument("output", help="Output directory for the simplified copies")
+    parser.add_argument("--tolerance", "-t", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Deviation as a fraction of the longer viewBox side (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Largest accepted raster error per path (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if np is None:
+        print("Error: NumPy is required for path simplification (pip install numpy)")
+        return 1
+
+    paths = [icon["path"] for icon in scan_icons(args.source)]
+    jobs = [(os.path.join(args.source, p), os.path.join(args.output, p), args.tolerance, args.threshold)
+            for p in paths]
+    with ProcessPoolExecutor(args.jobs) as pool:
+        results = list(pool.map(simplify_file, jobs, chunksize=4))
+
+    totals = {key: sum(stats[key] for stats in results) for key in results[0]} if results else {}
+    if totals:
+        print(f"Nodes: {totals['nodes_before']} -> {totals['nodes_after']}, "
+              f"bytes: {totals['bytes_before']} -> {totals['bytes_after']}, "
+              f"paths simplified: {totals['simplified']}, rejected: {totals['rejected']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+"""Shared fixtures: a small icon library on disk."""
+
+import pytest
+
+from bioicons.indexer import build_index, write_index
+
+SVG = ('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10">'
+       '<rect x="1" y="1" width="8" height="8" fill="{color}"/></svg>')
+
+ICONS = {
+    "cc-0/Virology/Jane_Doe/sars-cov-2.svg": "#ff0000",
+    "cc-0/Virology/Jane_Doe/influenza.svg": "#00ff00",
+    "cc-by-4.0/Lab_apparatus/John_Roe/pipette.svg": "#0000ff",
+}
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Library root with three icons and a built icons.json."""
+    root = tmp_path / "icons"
+    for relpath, color in ICONS.items():
+        path = root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(SVG.format(color=color))
+    write_index(build_index(root), root)
+    return root
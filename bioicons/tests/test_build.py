@@ -0,0 +1,80 @@
+import gzip
+import os
+
+import pytest
+
+from bioicons.build import BuildContext, resolve_stages, run_build
+
+from .conftest import SVG
+
+TARGETS = ["compress"]
+
+
+@pytest.fixture
+def context(library, tmp_path):
+    def make():
+        return BuildContext(library, tmp_path / "drawio", tmp_path / "build", jobs=2)
+    return make
+
+
+def statuses(results):
+    return {name: record["status"] for name, record in results.items()}
+
+
+def test_resolve_stages_includes_dependencies():
+    assert resolve_stages(["index"]) == ["scan", "validate", "index"]
+    with pytest.raises(ValueError):
+        resolve_stages(["nope"])
+
+
+def test_second_build_is_cached(context, library):
+    first = run_build(TARGETS, ctx=context())
+    assert set(statuses(first).values()) == {"ran"}
+    assert (library / "icons.json.gz").exists()
+
+    # scan always runs; everything it feeds is unchanged
+    second = run_build(TARGETS, ctx=context())
+    assert statuses(second) == dict(statuses(first), validate="cached", index="cached", placeholders="cached",
+                                    optimize="cached", drawio="cached", compress="cached")
+
+
+def test_changed_icon_reruns_stages(context, library, tmp_path):
+    run_build(TARGETS, ctx=context())
+    path = library / "cc-0/Virology/Jane_Doe/influenza.svg"
+    path.write_text(SVG.format(color="#123456"))
+
+    results = run_build(TARGETS, ctx=context())
+    assert results["optimize"]["status"] == "ran"
+    assert results["optimize"]["summary"]["optimized"] == 1
+    assert results["compress"]["status"] == "ran"
+    optimized = tmp_path / "build/optimized/cc-0/Virology/Jane_Doe/influenza.svg"
+    assert b"#123456" in gzip.decompress(optimized.with_name(optimized.name + ".gz").read_bytes())
+
+
+def test_compress_reruns_when_output_is_removed(context, library):
+    run_build(TARGETS, ctx=context())
+    os.remove(library / "icons.json.gz")
+
+    results = run_build(TARGETS, ctx=context())
+    assert results["index"]["status"] == "cached"
+    assert results["compress"]["status"] == "ran"
+    assert results["compress"]["summary"]["compressed"] == 1
+    assert (library / "icons.json.gz").exists()
+
+
+def test_worker_pool_is_shut_down(context):
+    ctx = context()
+    run_build(["optimize"], ctx=ctx)
+    assert ctx._pool is None
+
+
+def test_invalid_icons_are_in_the_stage_result(context, library, tmp_path):
+    (library / "cc-0/Virology/Jane_Doe/broken.svg").write_text("<svg")
+    results = run_build(["validate"], ctx=context())
+    summary = results["validate"]["summary"]
+    assert summary["invalid"] == 1
+    assert [entry["path"] for entry in summary["errors"]] == ["cc-0/Virology/Jane_Doe/broken.svg"]
+    assert summary["errors"][0]["error"].startswith("XML parse error")
+
+    # A cached run reports the same errors
+    assert run_build(["validate"], ctx=context())["validate"]["summary"]["errors"] == summary["errors"]
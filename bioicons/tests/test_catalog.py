@@ -0,0 +1,75 @@
+import os
+import sqlite3
+
+import pytest
+
+from bioicons import catalog
+from bioicons.catalog import connect, find, fts_query, search, update_catalog
+
+
+def _names(rows):
+    return sorted(row["name"] for row in rows)
+
+
+def test_update_catalog_is_incremental(library, tmp_path):
+    db = tmp_path / "icons.sqlite"
+    assert update_catalog(db, library) == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0}
+    assert update_catalog(db, library)["unchanged"] == 3
+
+    icon = library / "cc-0/Virology/Jane_Doe/influenza.svg"
+    icon.write_text("<svg xmlns='http://www.w3.org/2000/svg'/>")
+    (library / "cc-by-4.0/Lab_apparatus/John_Roe/pipette.svg").unlink()
+    stats = update_catalog(db, library)
+    assert (stats["updated"], stats["removed"], stats["unchanged"]) == (1, 1, 1)
+
+    conn = connect(db)
+    try:
+        row = find(conn, name="influenza")[0]
+        assert row["size"] == os.path.getsize(icon)
+        assert _names(find(conn)) == ["influenza", "sars-cov-2"]
+    finally:
+        conn.close()
+
+
+def test_find_facets(library, tmp_path):
+    db = tmp_path / "icons.sqlite"
+    update_catalog(db, library)
+    conn = connect(db)
+    try:
+        assert _names(find(conn, category="Virology")) == ["influenza", "sars-cov-2"]
+        assert _names(find(conn, author="John Roe", license="cc-by-4.0")) == ["pipette"]
+        assert find(conn, category="Virology", author="John Roe") == []
+    finally:
+        conn.close()
+
+
+def test_search(library, tmp_path):
+    db = tmp_path / "icons.sqlite"
+    update_catalog(db, library)
+    conn = connect(db)
+    try:
+        assert _names(search(conn, "virology")) == ["influenza", "sars-cov-2"]
+        assert _names(search(conn, "category:lab* pipette")) == ["pipette"]
+        assert _names(search(conn, fts_query("sars-cov-2"))) == ["sars-cov-2"]
+        assert _names(search(conn, fts_query("infl"))) == ["influenza"]
+        with pytest.raises(sqlite3.OperationalError):
+            search(conn, '"unterminated')
+        assert search(conn, fts_query('"unterminated')) == []
+    finally:
+        conn.close()
+
+
+def test_fts_query():
+    assert fts_query("  a-b  c ") == '"a-b"* "c"*'
+    assert fts_query('say "hi"') == '"say"* """hi"""*'
+    assert fts_query("  ") == ""
+
+
+def test_missing_fts5_warns(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog, "FTS_SCHEMA", "CREATE VIRTUAL TABLE icons_fts USING no_such_module(name);")
+    with pytest.warns(RuntimeWarning, match="Full-text search unavailable"):
+        conn = connect(tmp_path / "icons.sqlite")
+    try:
+        assert not catalog.has_fts(conn)
+    finally:
+        conn.close()
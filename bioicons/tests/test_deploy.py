@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from bioicons.deploy import (DELTA_NAME, MANIFEST_NAME, apply_delta, artifact_of, build_manifest, diff_manifests,
+                             load_manifest, write_delta)
+
+
+def write_site(root, files):
+    for path, text in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text)
+    return root
+
+
+@pytest.fixture
+def deployed(tmp_path):
+    """A deployed site with its manifest."""
+    site = write_site(tmp_path / "site", {
+        "index.html": "home",
+        "icons/icons.json": "[]",
+        "icons/cc-0/Virology/Jane_Doe/old.svg": "<svg/>",
+        "icons/cc-0/Virology/Jane_Doe/kept.svg": "<svg id='a'/>",
+    })
+    (site / MANIFEST_NAME).write_text(json.dumps(build_manifest(site)))
+    return site
+
+
+def test_diff_manifests(deployed, tmp_path):
+    dist = write_site(tmp_path / "dist", {
+        "index.html": "home, changed",
+        "icons/icons.json": "[]",
+        "icons/cc-0/Virology/Jane_Doe/kept.svg": "<svg id='a'/>",
+        "icons/cc-0/Virology/Jane_Doe/new.svg": "<svg/>",
+    })
+    changes = diff_manifests(load_manifest(str(deployed / MANIFEST_NAME)), build_manifest(dist))
+    assert changes == {
+        "added": ["icons/cc-0/Virology/Jane_Doe/new.svg"],
+        "modified": ["index.html"],
+        "deleted": ["icons/cc-0/Virology/Jane_Doe/old.svg"],
+    }
+
+
+def test_missing_manifest_gives_a_full_delta(tmp_path):
+    dist = write_site(tmp_path / "dist", {"index.html": "home", "icons/icons.json": "[]"})
+    previous = load_manifest(str(tmp_path / "missing" / MANIFEST_NAME))
+    assert previous is None
+    assert diff_manifests(previous, build_manifest(dist)) == {
+        "added": ["icons/icons.json", "index.html"], "modified": [], "deleted": []}
+
+    delta = write_delta(dist, tmp_path / "delta", previous)
+    assert delta["full"]
+    with pytest.raises(ValueError):
+        apply_delta(tmp_path / "delta", tmp_path / "site")
+
+
+def test_apply_delta_removes_deleted_files(deployed, tmp_path):
+    dist = write_site(tmp_path / "dist", {
+        "index.html": "home",
+        "icons/icons.json": "[1]",
+        "icons/cc-by-4.0/Lab_apparatus/John_Roe/pipette.svg": "<svg/>",
+    })
+    delta = write_delta(dist, tmp_path / "delta", load_manifest(str(deployed / MANIFEST_NAME)))
+    assert not delta["full"]
+    assert delta["artifacts"] == {
+        "icons": ["icons/cc-0/Virology/Jane_Doe/kept.svg", "icons/cc-0/Virology/Jane_Doe/old.svg",
+                  "icons/cc-by-4.0/Lab_apparatus/John_Roe/pipette.svg"],
+        "index": ["icons/icons.json"],
+    }
+    assert json.loads((tmp_path / "delta" / DELTA_NAME).read_text())["deleted"] == delta["deleted"]
+
+    apply_delta(tmp_path / "delta", deployed)
+    # The deployed site now matches the build, and emptied directories are gone
+    assert build_manifest(deployed)["files"] == build_manifest(dist)["files"]
+    assert not (deployed / "icons/cc-0").exists()
+    assert json.loads((deployed / MANIFEST_NAME).read_text()) == build_manifest(dist)
+
+
+def test_manifest_of_another_version_is_ignored(tmp_path):
+    path = tmp_path / MANIFEST_NAME
+    path.write_text(json.dumps({"version": 0, "files": {}}))
+    assert load_manifest(str(path)) is None
+
+
+@pytest.mark.parametrize("path, artifact", [
+    ("drawio-lib/Virology.xml", "drawio"),
+    ("icons/icons.pack", "pack"),
+    ("icons/icons.json", "index"),
+    ("icons/cc-0/Virology/Jane_Doe/a.svg", "icons"),
+    ("_nuxt/app.js", "site"),
+])
+def test_artifact_of(path, artifact):
+    assert artifact_of(path) == artifact
@@ -0,0 +1,95 @@
+import json
+import struct
+import zipfile
+import zlib
+
+import pytest
+
+from bioicons.export import MANIFEST, RENDER_VERSION, Manifest, export_library, png_path, set_png_dpi, write_zip
+from bioicons.render import have_renderer
+
+from .conftest import ICONS
+
+
+def chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def tiny_png(extra=b""):
+    """A 1x1 grayscale PNG, with extra chunks inserted after IHDR."""
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0)) + extra +
+            chunk(b"IDAT", zlib.compress(b"\x00\x00")) + chunk(b"IEND", b""))
+
+
+def chunks(png):
+    pos, found = 8, []
+    while pos < len(png):
+        length, kind = struct.unpack(">I4s", png[pos:pos + 8])
+        found.append((kind, png[pos + 8:pos + 8 + length]))
+        pos += 12 + length
+    return found
+
+
+def test_set_png_dpi_inserts_one_phys_chunk_before_idat():
+    png = set_png_dpi(tiny_png(chunk(b"pHYs", struct.pack(">IIB", 1, 1, 0))), 300)
+    kinds = [kind for kind, _ in chunks(png)]
+    assert kinds == [b"IHDR", b"pHYs", b"IDAT", b"IEND"]
+    x, y, unit = struct.unpack(">IIB", dict(chunks(png))[b"pHYs"])
+    assert x == y == round(300 / 0.0254) and unit == 1
+
+
+def test_manifest_replays_and_skips_torn_lines(tmp_path):
+    output = tmp_path / "300dpi" / "a.png"
+    output.parent.mkdir()
+    output.write_bytes(b"png")
+    with Manifest(tmp_path / MANIFEST) as manifest:
+        manifest.add("a.svg", 300, "source-hash", "png-hash", 3)
+        manifest.add("b.svg", 300, "source-hash", "png-hash", 3)
+    with open(tmp_path / MANIFEST, "a") as f:
+        f.write('{"path": "c.svg", "dp')
+
+    manifest = Manifest(tmp_path / MANIFEST)
+    assert set(manifest.records) == {("a.svg", 300), ("b.svg", 300)}
+    assert manifest.records[("a.svg", 300)]["version"] == RENDER_VERSION
+    assert manifest.is_current("a.svg", 300, "source-hash", output)
+    assert not manifest.is_current("a.svg", 300, "changed-source", output)
+    assert not manifest.is_current("a.svg", 600, "source-hash", output)
+    output.write_bytes(b"truncated or replaced")
+    assert not manifest.is_current("a.svg", 300, "source-hash", output)
+
+    manifest.compact([("b.svg", 300)])
+    lines = (tmp_path / MANIFEST).read_text().splitlines()
+    assert [json.loads(line)["path"] for line in lines] == ["b.svg"]
+
+
+def test_png_path_and_zip(tmp_path):
+    path = png_path(tmp_path, 600, "cc-0/Virology/Jane_Doe/fly_fertlized_egg_3.5h.svg")
+    assert path == tmp_path / "600dpi/cc-0/Virology/Jane_Doe/fly_fertlized_egg_3.5h.png"
+
+    path.parent.mkdir(parents=True)
+    path.write_bytes(tiny_png())
+    archive = tmp_path / "zips" / "Bioicons-Virology-png.zip"
+    write_zip(archive, [(path, "600dpi/a.png")])
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.namelist() == ["600dpi/a.png"]
+        assert zf.getinfo("600dpi/a.png").compress_type == zipfile.ZIP_STORED
+        assert zf.read("600dpi/a.png") == tiny_png()
+
+
+@pytest.mark.skipif(not have_renderer(), reason="CairoSVG is not available")
+def test_export_is_resumable(library, tmp_path):
+    out = tmp_path / "png"
+    first = export_library(library, out, dpis=(96,), jobs=1)
+    assert first == {"rendered": len(ICONS), "skipped": 0, "failed": 0, "zips": 2}
+    assert export_library(library, out, dpis=(96,), jobs=1) == {"rendered": 0, "skipped": 3, "failed": 0, "zips": 0}
+
+    (library / "cc-0/Virology/Jane_Doe/influenza.svg").write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10"><circle cx="5" cy="5" r="4"/></svg>')
+    # Only the changed icon is rendered again, and only its category's zip is rewritten
+    assert export_library(library, out, dpis=(96,), jobs=1) == {"rendered": 1, "skipped": 2, "failed": 0, "zips": 1}
+
+
+@pytest.mark.skipif(have_renderer(), reason="CairoSVG is available")
+def test_export_requires_renderer(library, tmp_path):
+    with pytest.raises(RuntimeError):
+        export_library(library, tmp_path / "png")
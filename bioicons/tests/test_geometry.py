@@ -0,0 +1,129 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from bioicons.geometry import (IDENTITY, apply, document_bounds, format_path, parse_path, parse_transform,
+                               segments_bounds, shape_segments)
+
+
+def sampled_bounds(segments, matrix=IDENTITY, steps=2000):
+    """Bounds from dense sampling of every segment, for comparison with the exact solution."""
+    xs, ys = [], []
+    x = y = 0.0
+    for command, args in segments:
+        if command in ("M", "L"):
+            x, y = args
+            points = [(x, y)]
+        elif command == "Q":
+            (qx, qy, ex, ey), (x0, y0) = args, (x, y)
+            points = [((1 - t) ** 2 * x0 + 2 * (1 - t) * t * qx + t * t * ex,
+                       (1 - t) ** 2 * y0 + 2 * (1 - t) * t * qy + t * t * ey)
+                      for t in (i / steps for i in range(steps + 1))]
+            x, y = ex, ey
+        elif command == "C":
+            (c1x, c1y, c2x, c2y, ex, ey), (x0, y0) = args, (x, y)
+            points = [((1 - t) ** 3 * x0 + 3 * (1 - t) ** 2 * t * c1x + 3 * (1 - t) * t * t * c2x + t ** 3 * ex,
+                       (1 - t) ** 3 * y0 + 3 * (1 - t) ** 2 * t * c1y + 3 * (1 - t) * t * t * c2y + t ** 3 * ey)
+                      for t in (i / steps for i in range(steps + 1))]
+            x, y = ex, ey
+        else:
+            continue
+        for px, py in points:
+            px, py = apply(matrix, px, py)
+            xs.append(px)
+            ys.append(py)
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def test_parse_path_resolves_relative_and_shorthand_commands():
+    segments = parse_path("m10 10 h5 v5 H10 z s5 5 10 0 t10 0")
+    assert segments[:5] == [("M", (10.0, 10.0)), ("L", (15.0, 10.0)), ("L", (15.0, 15.0)),
+                            ("L", (10.0, 15.0)), ("Z", ())]
+    # S without a preceding C uses the current point as its first control point
+    assert segments[5] == ("C", (10.0, 10.0, 15.0, 15.0, 20.0, 10.0))
+    assert segments[6] == ("Q", (20.0, 10.0, 30.0, 10.0))
+
+
+def test_parse_path_keeps_segments_before_an_error():
+    assert parse_path("M0 0 L10 10 L5") == [("M", (0.0, 0.0)), ("L", (10.0, 10.0))]
+    assert parse_path("") == []
+
+
+def test_compact_arc_flags():
+    # Flags may be written without separators: "a5 5 0 015 5" is rx=5 ry=5 rot=0 large=0 sweep=1 x=5 y=5
+    assert parse_path("M0 0a5 5 0 015 5") == parse_path("M0 0 a5 5 0 0 1 5 5")
+
+
+def test_format_path_round_trip():
+    segments = parse_path("M1.5 2 L3 4 Q5 6 7 8 C9 10 11 12 13 14 Z")
+    assert format_path(segments) == "M1.5 2L3 4Q5 6 7 8C9 10 11 12 13 14Z"
+    assert parse_path(format_path(segments)) == segments
+
+
+@pytest.mark.parametrize("d", [
+    "M0 0 C 50 -40 80 120 100 0",
+    "M10 80 Q 52.5 10 95 80 T 180 80",
+    "M20 20 A 30 15 30 1 1 60 40",
+    "M0 0 C 0 100 100 -100 100 0 S 150 80 200 0",
+])
+@pytest.mark.parametrize("transform", [None, "rotate(30)", "matrix(1 0.5 -0.3 1 4 5)"])
+def test_segments_bounds_match_sampling(d, transform):
+    segments = parse_path(d)
+    matrix = parse_transform(transform)
+    exact = segments_bounds(segments, matrix)
+    assert exact == pytest.approx(sampled_bounds(segments, matrix), abs=1e-3)
+
+
+def test_circle_bounds_are_tight_under_rotation():
+    segments = shape_segments("circle", {"cx": "50", "cy": "50", "r": "10"})
+    bounds = segments_bounds(segments, parse_transform("rotate(45 50 50)"))
+    assert bounds == pytest.approx((40, 40, 60, 60), abs=1e-2)
+
+
+def test_arc_bounds():
+    # A half circle of radius 10 above the chord from (0, 0) to (20, 0)
+    bounds = segments_bounds(parse_path("M0 0 A10 10 0 0 1 20 0"))
+    assert bounds == pytest.approx((0, -10, 20, 0), abs=1e-2)
+
+
+def test_degenerate_shapes():
+    assert shape_segments("rect", {"width": "0", "height": "10"}) == []
+    assert shape_segments("circle", {"r": "-1"}) == []
+    assert segments_bounds([]) is None
+
+
+def svg(body, attrs='viewBox="0 0 100 100"'):
+    return ET.fromstring(f'<svg xmlns="http://www.w3.org/2000/svg" '
+                         f'xmlns:xlink="http://www.w3.org/1999/xlink" {attrs}>{body}</svg>')
+
+
+def test_document_bounds_apply_nested_transforms():
+    root = svg('<g transform="translate(10 20)"><g transform="scale(2)">'
+               '<rect x="1" y="1" width="5" height="5"/></g></g>')
+    assert document_bounds(root) == ((12, 22, 22, 32), True)
+
+
+def test_document_bounds_include_strokes_scaled():
+    root = svg('<g transform="scale(2)"><line x1="0" y1="10" x2="10" y2="10" stroke="#000" stroke-width="2"/></g>')
+    bounds, _ = document_bounds(root)
+    assert bounds == pytest.approx((-2, 18, 22, 22))
+
+
+def test_document_bounds_follow_use_and_skip_definitions():
+    root = svg('<defs><symbol id="s"><rect width="10" height="10"/></symbol>'
+               '<rect id="hidden" x="500" y="500" width="1" height="1"/></defs>'
+               '<use xlink:href="#s" x="30" y="40"/>'
+               '<rect x="0" y="0" width="5" height="5" display="none"/>')
+    assert document_bounds(root) == ((30, 40, 40, 50), True)
+
+
+def test_text_makes_bounds_incomplete():
+    bounds, complete = document_bounds(svg('<rect width="10" height="10"/><text x="5" y="5">label</text>'))
+    assert bounds == (0, 0, 10, 10)
+    assert not complete
+    assert document_bounds(svg('')) == (None, True)
+
+
+def test_percentages_refer_to_the_viewport():
+    root = svg('<rect x="10%" y="0" width="50%" height="25%"/>', 'width="200" height="40"')
+    assert document_bounds(root)[0] == pytest.approx((20, 0, 120, 10))
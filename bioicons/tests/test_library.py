@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from bioicons.indexer import build_index, write_index
+from bioicons.library import IconLibrary, LRUCache
+from bioicons.pack import IconPack, write_pack
+from bioicons.xmlparse import have_lxml, xml_parser
+
+from .conftest import SVG
+
+
+def test_lookups(library):
+    icons = IconLibrary(library)
+    assert icons.get("pipette")["category"] == "Lab_apparatus"
+    assert sorted(icon["name"] for icon in icons.find(category="Virology")) == ["influenza", "sars-cov-2"]
+
+
+def test_parse_is_cached(library):
+    icons = IconLibrary(library)
+    root = icons.parse("influenza")
+    assert root.tag == "{http://www.w3.org/2000/svg}svg"
+    assert icons.parse("influenza") is root
+    assert icons.cache.info()["hits"] == 1
+
+
+def test_parse_drops_comments_and_keeps_text_whitespace(library):
+    (library / "cc-0/Virology/Jane_Doe/influenza.svg").write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg"><!-- note --><?pi x?>'
+        '<text><tspan>Hello</tspan> <tspan>world</tspan></text></svg>')
+    root = IconLibrary(library).parse("influenza")
+    assert [child.tag.split("}")[1] for child in root] == ["text"]
+    assert root[0][0].tail == " "
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+
+@pytest.mark.skipif(not have_lxml(), reason="lxml not installed")
+def test_xml_parser_is_per_thread():
+    parsers = []
+    thread = threading.Thread(target=lambda: parsers.append(xml_parser()))
+    thread.start()
+    thread.join()
+    assert xml_parser() is xml_parser()
+    assert parsers[0] is not xml_parser()
+
+
+@pytest.mark.parametrize("filename, name", [("fly_fertlized_egg_3.5h.svg", "fly_fertlized_egg_3.5h"),
+                                            ("lung-lobes..svg", "lung-lobes.")])
+def test_dotted_file_names_are_reachable(library, filename, name):
+    path = library / "cc-0/Virology/Jane_Doe" / filename
+    path.write_text(SVG.format(color="#abcdef"))
+    write_index(build_index(library), library)
+
+    icons = IconLibrary(library)
+    assert icons.path(name) == path
+    assert icons.read_bytes(name) == path.read_bytes()
+    assert icons.parse(name) is icons.parse(name)
+
+    write_pack(library.parent / "icons.pack", library)
+    with IconPack(library.parent / "icons.pack") as pack:
+        assert pack.find(name) == [f"cc-0/Virology/Jane_Doe/{filename}"]
@@ -0,0 +1,75 @@
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from bioicons.library import IconLibrary
+from bioicons.markers import IconGeometry, clear_cache, have_matplotlib, icon_collection, icon_geometry, icon_marker
+
+pytestmark = pytest.mark.skipif(not have_matplotlib(), reason="matplotlib is not available")
+
+
+def geometry(body, view_box="0 0 10 10"):
+    return IconGeometry(ET.fromstring(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{view_box}">{body}</svg>'))
+
+
+def test_shapes_are_normalized_to_the_unit_box():
+    parts = geometry('<rect x="1" y="1" width="8" height="4" fill="#ff0000"/>').parts
+    assert len(parts) == 1
+    path, facecolor, edgecolor, width = parts[0]
+    # y is flipped: the top of the rect (y=1) is at +0.4
+    vertices = path.vertices[path.codes != path.CLOSEPOLY]
+    assert vertices.min(axis=0).tolist() == pytest.approx([-0.4, 0.0])
+    assert vertices.max(axis=0).tolist() == pytest.approx([0.4, 0.4])
+    assert facecolor == pytest.approx((1.0, 0.0, 0.0, 1.0))
+    assert edgecolor == "none" and width == 0.0
+
+
+def test_strokes_and_opacity():
+    parts = geometry('<g opacity="0.5"><line x1="0" y1="5" x2="10" y2="5" stroke="#0000ff" stroke-width="2"/></g>'
+                     '<rect width="2" height="2" fill="none"/>', view_box="0 0 20 20").parts
+    # The unpainted rect is dropped, and lines are never filled
+    assert len(parts) == 1
+    path, facecolor, edgecolor, width = parts[0]
+    assert path.codes.tolist() == [path.MOVETO, path.LINETO]
+    assert facecolor == "none"
+    assert edgecolor == pytest.approx((0.0, 0.0, 1.0, 0.5))
+    assert width == pytest.approx(0.1)
+
+
+def test_marker_is_one_compound_path():
+    icon = geometry('<rect width="4" height="4" fill="#000"/><circle cx="7" cy="7" r="2" fill="#fff"/>')
+    assert len(icon.parts) == 2
+    assert len(icon.marker.vertices) == sum(len(part[0].vertices) for part in icon.parts)
+    assert icon.marker is icon.marker
+
+
+def test_geometry_is_cached_per_icon(library):
+    clear_cache()
+    icons = IconLibrary(library)
+    marker = icon_marker("sars-cov-2", icons)
+    assert icon_marker("sars-cov-2", icons) is marker
+    assert icon_geometry(icons.get("sars-cov-2"), icons).marker is marker
+    assert icon_marker("influenza", icons) is not marker
+    clear_cache()
+    assert icon_marker("sars-cov-2", icons) is not marker
+
+
+def test_collection_repeats_parts_per_offset(library):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    icons = IconLibrary(library)
+    fig, ax = plt.subplots()
+    try:
+        offsets = np.array([[0, 0], [1, 2], [3, 1]])
+        collection = icon_collection("pipette", offsets, size=100, ax=ax, library=icons, zorder=3)
+        assert collection in ax.collections
+        assert len(collection.get_paths()) == 3
+        assert collection.get_offsets().tolist() == offsets.tolist()
+        assert collection.get_facecolors()[0].tolist() == pytest.approx([0.0, 0.0, 1.0, 1.0])
+        assert collection.get_zorder() == 3
+        fig.canvas.draw()
+    finally:
+        plt.close(fig)
@@ -0,0 +1,43 @@
+from bioicons.optimize import minify_svg
+
+NS = 'xmlns="http://www.w3.org/2000/svg"'
+
+
+def test_indentation_is_removed():
+    data = f'<svg {NS}>\n  <g>\n    <rect width="1" height="1"/>\n  </g>\n</svg>'.encode()
+    optimized, changed = minify_svg(data)
+    assert changed
+    assert optimized == f'<svg {NS}><g><rect width="1" height="1" /></g></svg>'.encode()
+
+
+def test_editor_data_is_removed():
+    data = (f'<svg {NS} xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape">'
+            f'<metadata>x</metadata><rect inkscape:label="a" width="1"/></svg>').encode()
+    optimized, changed = minify_svg(data)
+    assert changed
+    assert b"metadata" not in optimized and b"inkscape" not in optimized
+
+
+def test_space_between_tspans_is_kept():
+    data = f'<svg {NS}>\n  <text><tspan>Hello</tspan> <tspan>world</tspan></text>\n</svg>'.encode()
+    optimized, _ = minify_svg(data)
+    assert b"<tspan>Hello</tspan> <tspan>world</tspan>" in optimized
+
+
+def test_xml_space_preserve_is_respected():
+    data = (f'<svg {NS}>\n  <g xml:space="preserve">\n    <rect width="1"/>\n  </g>\n'
+            f'  <g>\n    <rect width="2"/>\n  </g>\n</svg>').encode()
+    optimized, _ = minify_svg(data)
+    assert b'<g xml:space="preserve">\n    <rect width="1" />\n  </g>' in optimized
+    assert b'<g><rect width="2" /></g>' in optimized
+
+
+def test_text_after_dropped_element_is_kept():
+    data = (f'<svg {NS} xmlns:sodipodi="http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd">'
+            f'<text>a<sodipodi:guide/> b</text>\n</svg>').encode()
+    optimized, _ = minify_svg(data)
+    assert b"<text>a b</text>" in optimized
+
+
+def test_unparsable_input_is_unchanged():
+    assert minify_svg(b"<svg") == (b"<svg", False)
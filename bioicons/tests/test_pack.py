@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from bioicons.pack import IconPack, write_pack
+
+FLU = "cc-0/Virology/Jane_Doe/influenza.svg"
+PIPETTE = "cc-by-4.0/Lab_apparatus/John_Roe/pipette.svg"
+
+
+def _modify(library, relpath, data):
+    path = library / relpath
+    st = path.stat()
+    path.write_bytes(data)
+    # Distinct mtime even on coarse-grained filesystems
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+
+def _contents(pack_path):
+    with IconPack(pack_path) as pack:
+        return {key: bytes(pack[key]) for key in pack}
+
+
+def test_create_and_read(library, tmp_path):
+    pack_path = tmp_path / "icons.pack"
+    stats = write_pack(pack_path, library)
+    assert stats["added"] == 3 and not stats["compacted"] and not stats["recovered"]
+    assert _contents(pack_path)[FLU] == (library / FLU).read_bytes()
+    with IconPack(pack_path) as pack:
+        assert pack.find("pipette") == [PIPETTE]
+
+
+def test_unchanged_rebuild_leaves_pack_alone(library, tmp_path):
+    pack_path = tmp_path / "icons.pack"
+    write_pack(pack_path, library)
+    before = pack_path.read_bytes()
+    stats = write_pack(pack_path, library)
+    assert stats["unchanged"] == 3 and stats["added"] == stats["updated"] == 0
+    assert pack_path.read_bytes() == before
+
+
+def test_changed_icon_is_appended(library, tmp_path):
+    pack_path = tmp_path / "icons.pack"
+    write_pack(pack_path, library)
+    size = pack_path.stat().st_size
+    _modify(library, FLU, b"<svg xmlns='http://www.w3.org/2000/svg'/>")
+
+    # Never compact: a third of this tiny pack is superseded
+    stats = write_pack(pack_path, library, compact_threshold=1.0)
+    assert stats["updated"] == 1 and stats["unchanged"] == 2 and not stats["compacted"]
+    assert pack_path.stat().st_size > size
+    assert _contents(pack_path)[FLU] == b"<svg xmlns='http://www.w3.org/2000/svg'/>"
+
+
+def test_removed_icon_and_compaction(library, tmp_path):
+    pack_path = tmp_path / "icons.pack"
+    write_pack(pack_path, library)
+    (library / PIPETTE).unlink()
+    _modify(library, FLU, b"<svg/>")
+
+    stats = write_pack(pack_path, library, compact_threshold=0.0)
+    assert stats["removed"] == 1 and stats["compacted"]
+    contents = _contents(pack_path)
+    assert sorted(contents) == sorted(str(p.relative_to(library)).replace(os.sep, "/")
+                                      for p in library.rglob("*.svg"))
+    # Compaction leaves no dead bytes: the file is exactly header, data and table
+    live = sum(len(data) for data in contents.values())
+    with IconPack(pack_path) as pack:
+        assert pack.live_bytes == live
+
+
+def test_interrupted_append_keeps_previous_pack(library, tmp_path):
+    pack_path = tmp_path / "icons.pack"
+    write_pack(pack_path, library)
+    expected = _contents(pack_path)
+    # An append that died before rewriting the header: bytes after the table only
+    with open(pack_path, "ab") as f:
+        f.write(b"\0partial icon and table")
+    assert _contents(pack_path) == expected
+
+    _modify(library, FLU, b"<svg id='new'/>")
+    write_pack(pack_path, library, compact_threshold=1.0)
+    assert _contents(pack_path)[FLU] == b"<svg id='new'/>"
+
+
+def test_unreadable_pack_is_rebuilt(library, tmp_path):
+    pack_path = tmp_path / "icons.pack"
+    pack_path.write_bytes(b"not a pack")
+    with pytest.warns(RuntimeWarning, match="unreadable pack"):
+        stats = write_pack(pack_path, library)
+    assert stats["recovered"] and stats["added"] == 3
+    assert _contents(pack_path)[FLU] == (library / FLU).read_bytes()
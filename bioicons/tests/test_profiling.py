@@ -0,0 +1,60 @@
+import json
+
+from bioicons.build import BuildContext, run_build
+from bioicons.profiling import NULL_PROFILER, Profiler, get_profiler
+
+from .conftest import ICONS
+
+
+def test_phases_and_files_accumulate():
+    profiler = Profiler(top=2)
+    profiler.start()
+    for nbytes in (10, 20):
+        with profiler.phase("index", "write") as phase:
+            phase.bytes = nbytes
+    for i, seconds in enumerate((0.3, 0.1, 0.5)):
+        profiler.record_file("optimize", f"icon{i}.svg", seconds, 100)
+    profiler.stage_done("optimize", 1.5, "ran")
+    profiler.stop()
+
+    report = profiler.report()
+    assert report["stages"]["index"]["phases"]["write"]["calls"] == 2
+    assert report["stages"]["index"]["phases"]["write"]["bytes"] == 30
+    assert report["stages"]["optimize"]["files"] == 3
+    assert report["stages"]["optimize"]["bytes"] == 300
+    assert report["stages"]["optimize"]["status"] == "ran"
+    # Only the two slowest icons are kept, slowest first
+    assert [record["path"] for record in report["slowest_files"]] == ["icon2.svg", "icon0.svg"]
+    assert report["seconds"] >= 0
+    assert "memory" not in report
+
+
+def test_memory_tracing():
+    profiler = Profiler(trace_memory=True)
+    profiler.start()
+    data = [bytes(1000) for _ in range(100)]
+    profiler.stop()
+    assert data
+    assert profiler.report()["memory"]["peak_bytes"] >= 100 * 1000
+    assert "tracemalloc peak" in profiler.summary()
+
+
+def test_null_profiler():
+    assert get_profiler(None) is NULL_PROFILER
+    assert not NULL_PROFILER
+    with NULL_PROFILER.phase("scan", "glob") as phase:
+        phase.bytes = 1
+    NULL_PROFILER.record_file("scan", "a.svg", 1.0, 1)
+
+
+def test_profiled_build(library, tmp_path):
+    profiler = Profiler()
+    ctx = BuildContext(library, tmp_path / "drawio", tmp_path / "build", jobs=1, profiler=profiler)
+    run_build(["index", "optimize"], ctx=ctx)
+    profiler.write(tmp_path / "profile.json")
+
+    report = json.loads((tmp_path / "profile.json").read_text())
+    assert set(report["stages"]) >= {"scan", "validate", "index", "optimize"}
+    assert set(report["stages"]["index"]["phases"]) == {"scan", "write", "catalog"}
+    assert report["stages"]["optimize"]["files"] == len(ICONS)
+    assert {record["path"] for record in report["slowest_files"]} == set(ICONS)
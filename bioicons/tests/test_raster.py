@@ -0,0 +1,65 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bioicons.geometry import IDENTITY, parse_path  # noqa: E402
+from bioicons.raster import ShapeWalker, flatten, parse_opacity, rasterize  # noqa: E402
+
+
+def _mask(d, size=10, nonzero=True):
+    return rasterize(flatten(parse_path(d), IDENTITY, (0.0, 0.0), 1.0), (size, size), nonzero)
+
+
+def test_rectangle_covers_pixel_centers():
+    mask = _mask("M2 3H7V9H2Z")
+    assert mask.sum() == 5 * 6
+    assert mask[3:9, 2:7].all()
+
+
+def test_fill_rules():
+    # Outer square and an inner square drawn in the same direction
+    d = "M0 0H10V10H0Z M3 3H7V7H3Z"
+    assert _mask(d).sum() == 100
+    assert _mask(d, nonzero=False).sum() == 100 - 16
+
+
+def test_flatten_applies_matrix_origin_and_scale():
+    [polygon] = flatten(parse_path("M1 1L2 1"), (2.0, 0.0, 0.0, 2.0, 1.0, 0.0), (1.0, 0.0), 10.0)
+    assert polygon[0].tolist() == [20.0, 20.0]
+    assert polygon[-1].tolist() == [40.0, 20.0]
+
+
+def test_curves_are_flattened_within_bounds():
+    [polygon] = flatten(parse_path("M0 0C0 10 10 10 10 0Z"), IDENTITY, (0.0, 0.0), 1.0)
+    assert polygon[:, 1].max() == pytest.approx(7.5)
+
+
+def test_parse_opacity():
+    assert parse_opacity("0.5") == 0.5
+    assert parse_opacity("2") == 1.0
+    assert parse_opacity(None) == 1.0
+    assert parse_opacity("bad", 0.0) == 0.0
+
+
+class _Recorder(ShapeWalker):
+    def __init__(self, root):
+        self.shapes = []
+        super().__init__(root, size=100)
+
+    def _shape(self, tag, elem, matrix, paint, opacity):
+        self.shapes.append((tag, matrix[4], paint["fill"], opacity))
+
+
+def test_walker_resolves_paint_transforms_and_use():
+    root = ET.fromstring(
+        '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" viewBox="0 0 50 100">'
+        '<defs><rect id="r" width="1" height="1"/></defs>'
+        '<g fill="#ff0000" opacity="0.5" transform="translate(5 0)">'
+        '<circle r="1"/><use xlink:href="#r" x="2"/><text>skipped</text></g>'
+        '<path d="M0 0H1" style="display:none"/></svg>')
+    walker = _Recorder(root)
+    assert walker.shapes == [("circle", 5.0, "#ff0000", 0.5), ("rect", 7.0, "#ff0000", 0.5)]
+    # The 50x100 viewBox is centered in the square canvas
+    assert walker.scale == 1.0 and walker.origin == (-25.0, 0.0)
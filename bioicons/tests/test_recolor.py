@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from bioicons.recolor import (BIOICONS_PALETTE, build_color_map, extract_colors, hex_to_rgb, lab_to_rgb,
+                              normalize_color, recolor_svg, recolor_tree, rgb_to_hex, rgb_to_lab)
+
+from .conftest import ICONS
+
+DOCUMENT = (
+    '<svg xmlns="http://www.w3.org/2000/svg">'
+    '<style>.a { fill: #F00; stroke: rgb(0, 0, 255) }</style>'
+    '<linearGradient id="abc"><stop offset="0" stop-color="#00ff0080"/></linearGradient>'
+    '<rect class="a" fill="url(#abc)" stroke="red"/>'
+    '<circle style="fill:rgba(0,0,255,0.5);stroke:none" data-fill="#123456"/>'
+    '<path fill="rgb(255 0 0 / 25%)" stroke="rgb(0 0 255)"/>'
+    '</svg>'
+)
+
+
+@pytest.mark.parametrize("token, color", [
+    ("#F00", "#ff0000"), ("#ff000080", "#ff0000"), ("rgb(100%, 0%, 0%)", "#ff0000"),
+    ("rgba(0 0 255 / 0.5)", "#0000ff"), ("Grey", "#808080"), ("none", None), ("url(#a)", None), ("#12", None),
+])
+def test_normalize_color(token, color):
+    assert normalize_color(token) == color
+
+
+def test_extract_colors_ignores_ids_and_foreign_attributes():
+    assert extract_colors(DOCUMENT) == {"#ff0000", "#0000ff", "#00ff00"}
+
+
+def test_unmapped_colors_are_left_unchanged():
+    assert recolor_svg(DOCUMENT, {}) == DOCUMENT
+    # Mapped tokens are written in normalized form; already normalized ones come back identical
+    svg = '<svg><path fill="#ff0000" style="stroke:#0000ff"/></svg>'
+    assert recolor_svg(svg, {color: color for color in extract_colors(svg)}) == svg
+
+
+def test_recolor_round_trip():
+    forward = {"#ff0000": "#111111", "#0000ff": "#222222", "#00ff00": "#333333"}
+    recolored = recolor_svg(DOCUMENT, forward)
+    assert extract_colors(recolored) == set(forward.values())
+    # Alpha digits and rgba() alpha are kept, url() references and ids are not touched
+    assert 'stop-color="#33333380"' in recolored
+    assert "rgba(34,34,34,0.5)" in recolored
+    assert 'fill="rgba(17,17,17,25%)" stroke="#222222"' in recolored
+    assert 'fill="url(#abc)"' in recolored and 'id="abc"' in recolored
+    assert 'data-fill="#123456"' in recolored
+
+    backward = recolor_svg(recolored, {target: source for source, target in forward.items()})
+    assert extract_colors(backward) == set(forward)
+
+
+def test_lab_round_trip():
+    colors = ["#000000", "#ffffff", "#19aeff", "#ff4141", "#7f7f7f", "#012345"]
+    assert rgb_to_hex(lab_to_rgb(rgb_to_lab(hex_to_rgb(colors)))) == colors
+
+
+def test_palette_colors_map_to_themselves():
+    assert build_color_map(BIOICONS_PALETTE, BIOICONS_PALETTE) == {c: c for c in BIOICONS_PALETTE}
+
+
+def test_grayscale_keeps_lightness():
+    mapping = build_color_map(["#ff0000", "#808080"], None)
+    assert mapping["#808080"] == "#808080"
+    r, g, b = (int(mapping["#ff0000"][i:i + 2], 16) for i in (1, 3, 5))
+    assert r == g == b
+    assert rgb_to_lab(hex_to_rgb([mapping["#ff0000"]]))[0, 0] == pytest.approx(
+        rgb_to_lab(hex_to_rgb(["#ff0000"]))[0, 0], abs=0.5)
+
+
+def test_recolor_tree_reuses_cached_maps(library, tmp_path):
+    out = tmp_path / "themes"
+    themes = {"mono": ("#000000", "#ffffff"), "grayscale": None}
+    cache = recolor_tree(library, out, themes, jobs=1)
+    assert set(cache["mono"]) == set(ICONS.values())
+    for path in ICONS:
+        assert extract_colors((out / "mono" / path).read_text()) <= {"#000000", "#ffffff"}
+
+    # A cached entry is used as is, even if it differs from the computed one
+    cache["mono"]["#ff0000"] = "#abcdef"
+    path = "cc-0/Virology/Jane_Doe/sars-cov-2.svg"
+    recolor_tree(library, out, themes, [path], jobs=1, cache=cache)
+    assert extract_colors((out / "mono" / path).read_text()) == {"#abcdef"}
+
+
+def test_recolor_tree_on_a_shared_executor(library, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(2) as pool:
+        cache = recolor_tree(library, tmp_path / "themes", {"grayscale": None}, executor=pool)
+    assert np.all([len(set(color[1:][i:i + 2] for i in (0, 2, 4))) == 1 for color in cache["grayscale"].values()])
+    assert len(list((tmp_path / "themes" / "grayscale").rglob("*.svg"))) == len(ICONS)
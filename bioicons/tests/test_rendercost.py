@@ -0,0 +1,96 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from bioicons import rendercost
+from bioicons.geometry import local_name
+from bioicons.render import have_renderer
+
+from .conftest import ICONS
+
+# Render cost per element kind, standing in for measured time
+WEIGHTS = {"path": 10.0, "circle": 1.0}
+
+ICON = (b'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10">'
+        b'<g id="heavy"><path d="M0 0L10 10" filter="url(#blur)"/><circle r="1"/></g>'
+        b'<circle r="2"/></svg>')
+
+
+@pytest.fixture
+def weighted_renders(monkeypatch):
+    """Make every render cost the summed weight of the elements it draws."""
+    def median_render_time(svg, repeats=1, size=1):
+        return sum(WEIGHTS.get(local_name(element.tag), 0.0) for element in ET.fromstring(svg).iter())
+    monkeypatch.setattr(rendercost, "median_render_time", median_render_time)
+
+
+def test_label_hints():
+    element = ET.fromstring('<path id="p" filter="url(#f)" clip-path="url(#c)" d="%s"/>' % ("M0 0" * 3000))
+    assert rendercost._label(element, "svg/path[1]") == {
+        "element": "svg/path[1]", "tag": "path", "id": "p", "hints": ["filter", "mask/clip", "path data 11 KB"]}
+    assert rendercost._label(ET.fromstring('<image href="a.png"/>'), "svg/image[1]")["hints"] == ["bitmap"]
+    assert "hints" not in rendercost._label(ET.fromstring("<rect/>"), "svg/rect[1]")
+
+
+def test_attribute_cost_drills_into_expensive_subtrees(weighted_renders):
+    result = rendercost.attribute_cost(ICON, repeats=1)
+    assert result["seconds"] == 12.0
+    assert result["removals"] == 4
+    assert [(element["element"], element["seconds"]) for element in result["elements"]] == [
+        ("svg/g[1]", 11.0),
+        ("svg/g[1]/path[1]", 10.0),
+        ("svg/circle[1]", 1.0),
+        ("svg/g[1]/circle[1]", 1.0),
+    ]
+    assert result["elements"][0]["id"] == "heavy"
+    assert result["elements"][1]["hints"] == ["filter"]
+    assert result["elements"][1]["share"] == pytest.approx(10 / 12)
+
+
+def test_attribute_cost_limits(weighted_renders):
+    # Nothing reaches a share of 1, so the group is not broken down
+    result = rendercost.attribute_cost(ICON, repeats=1, drill_share=1.0)
+    assert [element["element"] for element in result["elements"]] == ["svg/g[1]", "svg/circle[1]"]
+    assert rendercost.attribute_cost(ICON, repeats=1, max_removals=1)["removals"] == 1
+
+
+def test_broken_icons_report_errors(tmp_path):
+    path = tmp_path / "broken.svg"
+    path.write_bytes(b"<svg")
+    assert rendercost.profile_icon((str(path), 1, 64))["error"].startswith("ParseError")
+
+
+def test_print_report(capsys):
+    report = {
+        "repeats": 3, "size": 256, "total_seconds": 0.5,
+        "icons": [
+            {"path": "cc-0/Virology/Jane_Doe/a.svg", "seconds": 0.4, "bytes": 4096, "breakdown": {"elements": [
+                {"element": "svg/g[1]", "id": "heavy", "seconds": 0.3, "share": 0.75, "hints": ["filter"]},
+                {"element": "svg/rect[1]", "seconds": 0.01, "share": 0.025},
+            ]}},
+            {"path": "cc-0/Virology/Jane_Doe/b.svg", "seconds": 0.1, "bytes": 100, "breakdown": {"error": "boom"}},
+        ],
+        "failed": [{"path": "cc-0/Virology/Jane_Doe/c.svg", "error": "ParseError: no element found"}],
+    }
+    rendercost.print_report(report, elements=1)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Rendered 2 icons at 256 px in 0.50 s (median of 3)"
+    assert lines[1].split() == ["1.", "400.0", "ms", "4", "KB", "cc-0/Virology/Jane_Doe/a.svg"]
+    assert lines[2].split() == ["300.0", "ms", "75%", "svg/g[1]", "#heavy", "(filter)"]
+    assert lines[4] == "       breakdown failed: boom"
+    assert lines[5] == "  failed: cc-0/Virology/Jane_Doe/c.svg: ParseError: no element found"
+    assert len(lines) == 6
+
+
+@pytest.mark.skipif(not have_renderer(), reason="CairoSVG is not available")
+def test_measure_library(library):
+    report = rendercost.measure_library(library, repeats=1, size=32, top=1, jobs=1)
+    assert len(report["icons"]) + len(report["failed"]) == len(ICONS)
+    assert all(icon["seconds"] > 0 for icon in report["icons"])
+    assert "breakdown" in report["icons"][0]
+
+
+@pytest.mark.skipif(have_renderer(), reason="CairoSVG is available")
+def test_measure_library_requires_renderer(library):
+    with pytest.raises(RuntimeError):
+        rendercost.measure_library(library)
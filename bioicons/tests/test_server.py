@@ -0,0 +1,131 @@
+import asyncio
+import gzip
+
+from bioicons.catalog import update_catalog
+from bioicons.server import IconServer
+
+
+def _server(library, tmp_path):
+    db = tmp_path / "icons.sqlite"
+    update_catalog(db, library)
+    return IconServer(library, library, db)
+
+
+def _request(server, target, headers=None):
+    """Send one GET over a real connection and return (status, headers, body)."""
+    async def run():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            lines = [f"GET {target} HTTP/1.1", "Connection: close"]
+            lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        response_headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        return int(status_line.split(" ")[1]), response_headers, body
+    return asyncio.run(run())
+
+
+def _get(server, target):
+    """Send one GET and return (status, body)."""
+    status, _, body = _request(server, target)
+    return status, body
+
+
+def test_search_hyphenated_query(library, tmp_path):
+    result = _server(library, tmp_path).search({"q": ["sars-cov-2"]})
+    assert [icon["name"] for icon in result["results"]] == ["sars-cov-2"]
+
+
+def test_search_prefix_and_operators(library, tmp_path):
+    server = _server(library, tmp_path)
+    assert [icon["name"] for icon in server.search({"q": ["pip"]})["results"]] == ["pipette"]
+    for text in ("AND", '"unterminated', "gpu-3d", "NEAR(", "*"):
+        assert server.search({"q": [text]})["count"] == 0
+
+
+def test_search_facets(library, tmp_path):
+    result = _server(library, tmp_path).search({"q": ["virology"], "name": ["influenza"]})
+    assert [icon["name"] for icon in result["results"]] == ["influenza"]
+
+
+def test_search_route(library, tmp_path):
+    status, body = _get(_server(library, tmp_path), "/api/search?q=sars-cov-2")
+    assert status == 200
+    assert b'"sars-cov-2"' in body
+
+
+def test_static_routes(library, tmp_path):
+    server = _server(library, tmp_path)
+    status, body = _get(server, "/cc-0/Virology/Jane_Doe/influenza.svg")
+    assert status == 200
+    assert body.startswith(b"<svg")
+    assert _get(server, "/missing.svg")[0] == 404
+    assert _get(server, "/../secret")[0] == 404
+
+
+def test_bad_path_is_rejected(library, tmp_path):
+    assert _get(_server(library, tmp_path), "/icon%00.svg")[0] == 400
+
+
+def test_search_limit_is_clamped(library, tmp_path):
+    server = _server(library, tmp_path)
+    assert server.search({"category": ["Virology"], "limit": ["-5"]})["count"] == 1
+    assert server.search({"category": ["Virology"], "limit": ["0"]})["count"] == 1
+    assert server.search({"category": ["Virology"], "limit": ["many"]})["count"] == 2
+
+
+def test_missing_index_is_unavailable(library, tmp_path):
+    (library / "icons.json").unlink()
+    server = IconServer(library, library, None)
+    assert _get(server, "/api/search?name=pipette")[0] == 503
+    assert _get(server, "/cc-0/Virology/Jane_Doe/influenza.svg")[0] == 200
+
+
+def test_etag_revalidation(library, tmp_path):
+    server = _server(library, tmp_path)
+    target = "/cc-0/Virology/Jane_Doe/influenza.svg"
+    status, headers, _ = _request(server, target)
+    etag = headers["etag"]
+    assert status == 200 and etag.startswith('"')
+
+    status, headers, body = _request(server, target, {"If-None-Match": f'"other", {etag}'})
+    assert status == 304
+    assert headers["etag"] == etag and body == b""
+    assert _request(server, target, {"If-None-Match": '"other"'})[0] == 200
+
+    # A new file version gets a new ETag
+    (library / target.lstrip("/")).write_text('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1 1"/>')
+    status, headers, _ = _request(server, target, {"If-None-Match": etag})
+    assert status == 200 and headers["etag"] != etag
+
+
+def test_precompressed_variants(library, tmp_path):
+    server = _server(library, tmp_path)
+    target = "/cc-0/Virology/Jane_Doe/influenza.svg"
+    path = library / target.lstrip("/")
+    original = path.read_bytes()
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(original))
+    path.with_name(path.name + ".br").write_bytes(b"brotli bytes")
+
+    status, headers, body = _request(server, target, {"Accept-Encoding": "gzip, deflate"})
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-type"] == "image/svg+xml"
+    assert headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(body) == original
+
+    status, headers, body = _request(server, target, {"Accept-Encoding": "gzip, br"})
+    assert headers["content-encoding"] == "br" and body == b"brotli bytes"
+
+    for accept in ("", "br;q=0, gzip;q=0", "identity"):
+        status, headers, body = _request(server, target, {"Accept-Encoding": accept})
+        assert "content-encoding" not in headers and body == original
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from bioicons.geometry import parse_path
+from bioicons.simplify import count_nodes, rdp, simplify_file, simplify_segments, simplify_svg
+
+# A square traced with many collinear points along each edge
+SQUARE = ("M10 10 " + " ".join(f"L{x} 10" for x in range(12, 91, 2)) + " " +
+          " ".join(f"L90 {y}" for y in range(12, 91, 2)) + " L10 90 Z")
+
+
+def svg(body):
+    return f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">{body}</svg>'.encode()
+
+
+def test_rdp_keeps_corners_only():
+    points = np.array([[0, 0], [1, 0], [2, 0], [2, 1], [2, 2]], dtype=float)
+    assert rdp(points, 0.1).tolist() == [True, False, True, False, True]
+
+
+def test_simplify_segments():
+    # A flat curve becomes a line, and the line run is thinned to its end points
+    segments = parse_path("M0 0 C 3 0.01 6 -0.01 10 0 L 20 0 L 20 10")
+    assert simplify_segments(segments, 0.1) == [("M", (0.0, 0.0)), ("L", (20.0, 0.0)), ("L", (20.0, 10.0))]
+    curved = parse_path("M0 0 C 0 10 10 10 10 0")
+    assert simplify_segments(curved, 0.1) == curved
+
+
+def test_simplified_square_keeps_its_silhouette():
+    data = svg(f'<path d="{SQUARE}"/>')
+    output, stats = simplify_svg(data)
+    assert stats["simplified"] == 1 and stats["rejected"] == 0
+    assert stats["nodes_before"] == count_nodes(parse_path(SQUARE))
+    assert stats["nodes_after"] == 4
+    assert stats["bytes_after"] == len(output) < len(data)
+    assert b'd="M10 10L90 10L90 90L10 90Z"' in output
+
+
+def test_visible_change_is_rejected():
+    # A 5-unit notch falls within a large tolerance but changes many pixels
+    d = "M10 10 L50 10 L52 15 L54 10 L90 10 L90 90 L10 90 Z"
+    data = svg(f'<path d="{d}"/>')
+    output, stats = simplify_svg(data, tolerance=0.06, threshold=0.001)
+    assert output == data
+    assert stats["rejected"] == 1 and stats["nodes_after"] == stats["nodes_before"]
+
+    output, stats = simplify_svg(data, tolerance=0.06, threshold=0.5)
+    assert stats["simplified"] == 1 and output != data
+
+
+@pytest.mark.parametrize("data", [
+    svg(f'<path d="{SQUARE}" fill="none" stroke="#000"/>'),
+    svg(f'<g style="fill:none"><path d="{SQUARE}"/></g>'),
+    b"<svg",
+])
+def test_unfilled_and_broken_documents_are_unchanged(data):
+    output, stats = simplify_svg(data)
+    assert output == data
+    assert stats["simplified"] == 0
+
+
+def test_simplify_file(tmp_path):
+    src = tmp_path / "in.svg"
+    src.write_bytes(svg(f'<path d="{SQUARE}"/>'))
+    dst = tmp_path / "out" / "icon.svg"
+    stats = simplify_file((str(src), str(dst), 0.0005, 0.01))
+    assert stats["nodes_after"] == 4
+    assert dst.read_bytes().startswith(b"<svg")
@@ -0,0 +1,45 @@
+import json
+
+from bioicons.catalog import connect, update_catalog, update_paths
+from bioicons.tests.conftest import SVG
+from bioicons.watch import LibraryWatcher
+
+NEW = "cc-0/Virology/Jane_Doe/hiv.svg"
+FLU = "cc-0/Virology/Jane_Doe/influenza.svg"
+PIPETTE = "cc-by-4.0/Lab_apparatus/John_Roe/pipette.svg"
+
+
+def _rows(db):
+    conn = connect(db)
+    try:
+        return {row["path"]: row["name"] for row in conn.execute("SELECT path, name FROM icons")}
+    finally:
+        conn.close()
+
+
+def test_update_paths_only_touches_given_paths(library, tmp_path):
+    db = tmp_path / "icons.sqlite"
+    update_catalog(db, library)
+    (library / NEW).write_text(SVG.format(color="#123456"))
+    (library / FLU).write_text(SVG.format(color="#abcdef") + "\n")
+    (library / PIPETTE).unlink()
+
+    stats = update_paths(db, library, [NEW, FLU, PIPETTE, "cc-0/Virology/Jane_Doe/never-existed.svg"])
+    assert stats == {"added": 1, "updated": 1, "removed": 1, "unchanged": 0}
+    # The result is what a full rescan would produce
+    assert update_catalog(db, library)["unchanged"] == 3
+
+
+def test_watcher_apply_updates_outputs(library, tmp_path):
+    watcher = LibraryWatcher(library, tmp_path / "drawio", polling=True)
+    watcher.build()
+    db = library / "icons.sqlite"
+
+    (library / NEW).write_text(SVG.format(color="#123456"))
+    (library / PIPETTE).unlink()
+    assert watcher.apply({NEW, PIPETTE}) == {"Virology", "Lab_apparatus"}
+
+    assert sorted(_rows(db)) == sorted([NEW, FLU, "cc-0/Virology/Jane_Doe/sars-cov-2.svg"])
+    assert update_catalog(db, library)["unchanged"] == 3
+    names = [icon["name"] for icon in json.loads((library / "icons.json").read_text())]
+    assert sorted(names) == ["hiv", "influenza", "sars-cov-2"]
@@ -0,0 +1,64 @@
+"""
+Icon Tree - Helpers for the license/category/author/icon.svg library layout.
+
+Every build tool walks the same directory structure, so the path conventions
+(what counts as an icon and how its metadata is derived from the path) live here.
+"""
+
+import glob
+import os
+from pathlib import Path
+from typing import Dict, List, Union
+
+# Root of the icon library inside the repository
+ICONS_ROOT = Path(__file__).resolve().parent.parent / "static" / "icons"
+
+# Icons are organized as license/category/author/icon.svg
+ICON_GLOB = os.path.join("*", "*", "*", "*.svg")
+
+
+def icon_name(filename: str) -> str:
+    """
+    Icon name of a file: the file name without its .svg suffix.
+
+    Names may contain dots (fly_fertlized_egg_3.5h.svg), so that name + ".svg"
+    always gives back the file name.
+    """
+    return filename[:-len(".svg")] if filename.endswith(".svg") else filename
+
+
+def icon_entry(relpath: str) -> Dict[str, str]:
+    """
+    Derive icon metadata from a path relative to the library root.
+
+    Args:
+        relpath: Path of the form license/category/author/icon.svg
+
+    Returns:
+        Dictionary with name, category, license, author and path keys
+    """
+    parts = relpath.replace(os.sep, "/").split("/")
+    return {
+        "name": icon_name(parts[3]),
+        "category": parts[1],
+        "license": parts[0],
+        "author": parts[2].replace("_", " "),
+        "path": "/".join(parts),
+    }
+
+
+def scan_icons(root: Union[str, Path] = ICONS_ROOT) -> List[Dict[str, str]]:
+    """
+    List every icon in the library.
+
+    Args:
+        root: Library root directory
+
+    Returns:
+        Icon entries (see icon_entry) sorted by path
+    """
+    root = str(root)
+    relpaths = sorted(
+        os.path.relpath(path, root) for path in glob.glob(os.path.join(root, ICON_GLOB))
+    )
+    return [icon_entry(relpath) for relpath in relpaths]
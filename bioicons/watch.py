@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Library Watcher - Keeps the indexes and draw.io libraries current while curating.
+
+File events come from inotify on Linux and from periodic stat polling elsewhere.
+Bursts of events (e.g. copying a folder of icons) are debounced into one update,
+which rewrites the JSON index, updates changed catalog rows and rebuilds only the
+draw.io libraries of the affected categories.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import glob
+import os
+import select
+import struct
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+
+from .catalog import update_catalog, update_paths
+from .drawio import DRAWIO_DIR, drawio_item, get_width_height, library_filename, write_categories, write_library
+from .indexer import build_index, write_index
+from .tree import ICONS_ROOT, ICON_GLOB, icon_entry
+
+DEFAULT_DEBOUNCE = 0.2
+DEFAULT_POLL_INTERVAL = 0.25
+
+# Depth of the icon files below the root: license/category/author/icon.svg
+ICON_DEPTH = 4
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT = struct.Struct("iIII")
+
+
+def _depth(relpath: str) -> int:
+    return len(relpath.split("/")) if relpath else 0
+
+
+class PollingSource:
+    """
+    Detects changes by comparing size and mtime snapshots of the icon tree.
+    """
+
+    def __init__(self, root: str, interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot = {}
+        for path in glob.glob(os.path.join(self.root, ICON_GLOB)):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[os.path.relpath(path, self.root).replace(os.sep, "/")] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout: float) -> Set[str]:
+        """Sleep up to timeout seconds and return the paths that changed."""
+        time.sleep(min(timeout, self.interval))
+        snapshot = self._scan()
+        changed = {path for path, stamp in snapshot.items() if self._snapshot.get(path) != stamp}
+        changed.update(path for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """
+    Receives change events from Linux inotify, watching every directory down to
+    the author level.
+    """
+
+    def __init__(self, root: str):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError("inotify is only available on Linux")
+
+        self.root = root
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}
+        self._add_tree("")
+
+    def _add_watch(self, reldir: str):
+        path = os.path.join(self.root, reldir) if reldir else self.root
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._dirs[wd] = reldir
+
+    def _add_tree(self, reldir: str):
+        """Watch a directory and its subdirectories above the icon level."""
+        self._add_watch(reldir)
+        if _depth(reldir) >= ICON_DEPTH - 1:
+            return
+        path = os.path.join(self.root, reldir) if reldir else self.root
+        for entry in os.scandir(path):
+            if entry.is_dir():
+                self._add_tree(f"{reldir}/{entry.name}" if reldir else entry.name)
+
+    def _forget(self, reldir: str):
+        """Stop watching a directory that was moved out of its place in the tree."""
+        for wd, watched in list(self._dirs.items()):
+            if watched == reldir or watched.startswith(reldir + "/"):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._dirs[wd]
+
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        Wait up to timeout seconds for events.
+
+        Returns:
+            Changed icon paths; directory paths stand for everything below them and
+            the empty string requests a full rescan (after a queue overflow)
+        """
+        changed = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed
+
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, length = EVENT.unpack_from(data, pos)
+                pos += EVENT.size
+                name = os.fsdecode(data[pos:pos + length].rstrip(b"\x00"))
+                pos += length
+
+                if mask & IN_Q_OVERFLOW:
+                    changed.add("")
+                    continue
+                reldir = self._dirs.get(wd)
+                if reldir is None:
+                    continue
+                if mask & IN_DELETE_SELF:
+                    del self._dirs[wd]
+                    continue
+
+                relpath = f"{reldir}/{name}" if reldir else name
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and _depth(relpath) < ICON_DEPTH:
+                        self._add_tree(relpath)
+                    elif mask & IN_MOVED_FROM:
+                        self._forget(relpath)
+                    changed.add(relpath)
+                elif _depth(relpath) == ICON_DEPTH and name.endswith(".svg") and not mask & IN_CREATE:
+                    # Created files are reported once they are closed after writing
+                    changed.add(relpath)
+
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class LibraryWatcher:
+    """
+    Incrementally maintains icons.json, categories.json, icons.sqlite and the
+    draw.io libraries as icons are added, modified, moved or deleted.
+    """
+
+    def __init__(self, root: Union[str, Path] = ICONS_ROOT,
+                 drawio_dir: Union[str, Path] = DRAWIO_DIR,
+                 debounce: float = DEFAULT_DEBOUNCE,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 polling: bool = False):
+        """
+        Initialize the watcher.
+
+        Args:
+            root: Library root directory
+            drawio_dir: Output directory for draw.io libraries
+            debounce: Quiet period in seconds before a burst of events is applied
+            poll_interval: Seconds between scans when polling
+            polling: Use polling even where inotify is available
+        """
+        self.root = str(root)
+        self.drawio_dir = str(drawio_dir)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.polling = polling
+
+        # path -> icon entry, in icons.json order (oldest modification first)
+        self.icons = {}
+        # path -> (size, mtime_ns, (width, height)) so unchanged icons are not re-parsed
+        self._sizes = {}
+        # category -> published draw.io categories.json entry
+        self.drawio = {}
+
+    def build(self):
+        """Build every output from scratch; the starting point for incremental updates."""
+        os.makedirs(self.drawio_dir, exist_ok=True)
+        self.icons = {icon["path"]: icon for icon in build_index(self.root)}
+        write_index(list(self.icons.values()), self.root)
+        update_catalog(os.path.join(self.root, "icons.sqlite"), self.root, list(self.icons.values()))
+
+        self.drawio = {}
+        self._write_drawio(sorted({icon["category"] for icon in self.icons.values()}))
+
+    def _size(self, icon: Dict[str, str]):
+        path = os.path.join(self.root, icon["path"])
+        st = os.stat(path)
+        cached = self._sizes.get(icon["path"])
+        if cached and cached[:2] == (st.st_size, st.st_mtime_ns):
+            return cached[2]
+        size = get_width_height(path)
+        self._sizes[icon["path"]] = (st.st_size, st.st_mtime_ns, size)
+        return size
+
+    def _write_drawio(self, categories):
+        members = defaultdict(list)
+        for icon in self.icons.values():
+            if icon["category"] in categories:
+                members[icon["category"]].append(icon)
+
+        for category in categories:
+            icons = sorted(members.get(category, []), key=lambda icon: icon["path"])
+            if not icons:
+                self.drawio.pop(category, None)
+                stale = os.path.join(self.drawio_dir, library_filename(category))
+                if os.path.exists(stale):
+                    os.remove(stale)
+                continue
+            items = [drawio_item(icon, self.root, self._size(icon)) for icon in icons]
+            entry = write_library(category, items, self.drawio_dir)
+            if entry is None:
+                self.drawio.pop(category, None)
+            else:
+                self.drawio[category] = entry
+
+        write_categories(dict(sorted(self.drawio.items())), self.drawio_dir)
+
+    def _expand(self, changed: Set[str]) -> Set[str]:
+        """Turn reported paths (icons, directories, or '' for everything) into icon paths."""
+        paths = set()
+        for relpath in changed:
+            if _depth(relpath) == ICON_DEPTH:
+                paths.add(relpath)
+                continue
+            prefix = relpath + "/" if relpath else ""
+            paths.update(path for path in self.icons if path.startswith(prefix))
+            pattern = os.path.join(self.root, relpath, *ICON_GLOB.split(os.sep)[_depth(relpath):])
+            paths.update(os.path.relpath(p, self.root).replace(os.sep, "/") for p in glob.glob(pattern))
+        return paths
+
+    def apply(self, changed: Set[str]) -> Set[str]:
+        """
+        Update all outputs for a set of changed paths.
+
+        Returns:
+            Categories whose draw.io libraries were rebuilt
+        """
+        affected = set()
+        relpaths = sorted(self._expand(changed))
+        for relpath in relpaths:
+            old = self.icons.pop(relpath, None)
+            if old is not None:
+                affected.add(old["category"])
+            if os.path.isfile(os.path.join(self.root, relpath)):
+                # Modified icons move to the end, matching the mtime ordering of icons.json
+                icon = icon_entry(relpath)
+                self.icons[relpath] = icon
+                affected.add(icon["category"])
+            else:
+                self._sizes.pop(relpath, None)
+
+        if not affected:
+            return affected
+
+        write_index(list(self.icons.values()), self.root)
+        update_paths(os.path.join(self.root, "icons.sqlite"), self.root, relpaths)
+        self._write_drawio(sorted(affected))
+        return affected
+
+    def _source(self):
+        if not self.polling:
+            try:
+                return InotifySource(self.root)
+            except OSError as e:
+                print(f"inotify unavailable ({e}), falling back to polling")
+        return PollingSource(self.root, self.poll_interval)
+
+    def run(self):
+        """Build all outputs, then watch the library until interrupted."""
+        source = self._source()
+        print("Building indexes and draw.io libraries...")
+        self.build()
+        print(f"Watching {os.path.abspath(self.root)} ({type(source).__name__})")
+
+        pending = set()
+        deadline = None
+        try:
+            while True:
+                timeout = max(0.0, deadline - time.monotonic()) if pending else 1.0
+                changes = source.wait(timeout)
+                if changes:
+                    pending |= changes
+                    deadline = time.monotonic() + self.debounce
+                elif pending and time.monotonic() >= deadline:
+                    start = time.monotonic()
+                    categories = self.apply(pending)
+                    pending = set()
+                    if categories:
+                        print(f"Updated {', '.join(categories)} in {time.monotonic() - start:.2f}s")
+        except KeyboardInterrupt:
+            print("Stopped watching")
+        finally:
+            source.close()
+
+
+def main():
+    """Watch the icon library from the command line."""
+    parser = argparse.ArgumentParser(description="Incrementally rebuild indexes and draw.io libraries on file changes")
+    parser.add_argument("--root", "-r", default=str(ICONS_ROOT), help="Icon library root")
+    parser.add_argument("--drawio-dir", "-d", default=str(DRAWIO_DIR), help="Output directory for draw.io libraries")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help=f"Quiet period before applying changes in seconds (default: {DEFAULT_DEBOUNCE})")
+    parser.add_argument("--poll", action="store_true", help="Poll for changes instead of using inotify")
+    args = parser.parse_args()
+
+    watcher = LibraryWatcher(args.root, args.drawio_dir, debounce=args.debounce, polling=args.poll)
+    watcher.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+XML Parsing - The lxml parser configuration shared by bioicons and svg_critic.
+
+Every lxml parse of icons and diagrams uses the same options:
+
+- huge_tree, so multi-MB documents (long paths, inline rasters) are not rejected
+- comments and processing instructions removed, so every node is an element,
+  as with xml.etree.ElementTree
+
+Whitespace is kept: text between <tspan>s is content.
+"""
+
+import threading
+from typing import Dict
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Keyword arguments for lxml.etree.XMLParser and lxml.etree.iterparse
+PARSER_OPTIONS: Dict[str, bool] = {"huge_tree": True, "remove_comments": True, "remove_pis": True}
+
+# lxml parsers must not be used by several threads at once
+_local = threading.local()
+
+
+def have_lxml() -> bool:
+    """Check whether lxml is installed."""
+    return etree is not None
+
+
+def xml_parser():
+    """
+    Return this thread's lxml parser with PARSER_OPTIONS.
+
+    Raises:
+        ImportError: If lxml is not installed
+    """
+    if etree is None:
+        raise ImportError("lxml is not installed (pip install lxml)")
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = etree.XMLParser(**PARSER_OPTIONS)
+    return parser
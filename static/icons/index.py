@@ -1,36 +1,16 @@
 #!/usr/bin/env python3
 
-import glob 
-import argparse
-import os
-# required arg
-import json
-   
-
-
-
-icons = []
-categories = set() 
-# iterates over all svg files organized as license/category/author/icon.svg
-for name in sorted(glob.glob(os.path.join("./*/*/*/*.svg")), key=os.path.getmtime):
-    n = name.split('/')[-1].split('.')[0]
-    l = name.split('/')[1]
-    a = name.split('/')[3].replace('_', ' ')
-    c = name.split('/')[2]
-    item={"name": n,
-    "category": c,
-    "license":l,
-    "author":a
-    }
-    icons.append(item)
-    categories.add(c)
+"""
+Builds icons.json, categories.json and icons.sqlite for this directory.
 
-categories = list(categories)
-
-categories.insert(0,'All_icons')
-
-with open('icons.json', 'w') as outfile:
-        json.dump(icons, outfile)
+The indexer lives in the bioicons package at the repository root; this script
+runs it as python -m bioicons.indexer (see --help, e.g. --watch and --profile).
+"""
+import os
+import subprocess
+import sys
 
-with open('categories.json', 'w') as outfile:
-        json.dump(categories, outfile)
+here = os.path.dirname(os.path.abspath(__file__))
+repo = os.path.join(here, "..", "..")
+sys.exit(subprocess.call([sys.executable, "-m", "bioicons.indexer", "--root", here,
+                          "--drawio-dir", os.path.join(here, "..", "drawio-lib")] + sys.argv[1:], cwd=repo))
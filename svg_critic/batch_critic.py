@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Batch SVG Critic - Score whole directories of SVGs into a JSONL file.
+
+Each input file is evaluated with SVGCritic on a process pool and written as
+one JSON line as soon as it finishes:
+
+    {"file": "icons/cell.svg", "seconds": 0.012, "evaluation": {...}}
+    {"file": "icons/broken.svg", "seconds": 0.001, "error": "ParseError: ..."}
+
+Files already present in the output are skipped, so an interrupted or crashed
+run picks up where it stopped when started again with the same output.
+With --retry-errors failed files are evaluated again and appended; when a file
+appears more than once, the last line is the current result.
+
+Usage:
+    python batch_critic.py ../static/icons -o critic.jsonl
+    python batch_critic.py "diagrams/**/*.svg" other.svg -o critic.jsonl --jobs 4
+"""
+
+import argparse
+import functools
+import glob
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    from .rules import resolve_rules
+    from .svg_critic import SVGCritic
+except ImportError:
+    from rules import resolve_rules
+    from svg_critic import SVGCritic
+
+
+def collect_files(patterns: Iterable[str]) -> List[str]:
+    """
+    Expand directories (recursively), glob patterns and file paths to SVG files.
+
+    Args:
+        patterns: Directories, glob patterns (** is recursive) or file paths
+
+    Returns:
+        Sorted, de-duplicated list of paths
+    """
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for dirpath, _, filenames in os.walk(pattern):
+                files.update(os.path.join(dirpath, name) for name in filenames
+                             if name.lower().endswith('.svg'))
+        elif os.path.isfile(pattern):
+            files.add(pattern)
+        else:
+            files.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted({os.path.normpath(path) for path in files})
+
+
+def load_done(output: str, retry_errors: bool = False) -> Set[str]:
+    """
+    Read the absolute paths of files already recorded in an output file.
+
+    Lines that do not parse (e.g. cut off by a crash) are ignored, so their
+    files are evaluated again.
+
+    Args:
+        output: JSONL output path; a missing file means nothing is done
+        retry_errors: Leave out files whose evaluation failed
+
+    Returns:
+        Set of absolute paths
+    """
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict) or 'file' not in record:
+                continue
+            if retry_errors and 'error' in record:
+                continue
+            done.add(os.path.abspath(record['file']))
+    return done
+
+
+def evaluate_file(path: str, streaming: bool = False, rules: Optional[List[str]] = None) -> Dict:
+    """
+    Evaluate one SVG file.
+
+    Args:
+        path: SVG file
+        streaming: Use SVGCritic's bounded-memory streaming parser
+        rules: Rule names to run (default: all)
+
+    Returns:
+        Record with the file, the time taken and either the evaluation or the error
+    """
+    start = time.perf_counter()
+    try:
+        record = {'file': path, 'evaluation': SVGCritic(path, streaming=streaming).evaluate(rules)}
+    except Exception as e:
+        record = {'file': path, 'error': f"{type(e).__name__}: {e}"}
+    record['seconds'] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def _open_for_append(output: str):
+    """Open the output for appending, starting on a fresh line after a cut-off write."""
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    f = open(output, 'a+', encoding='utf-8')
+    if f.tell():
+        f.seek(f.tell() - 1)
+        if f.read(1) != '\n':
+            f.write('\n')
+    return f
+
+
+def run_batch(files: List[str], output: str, jobs: int = 1, quiet: bool = False,
+              streaming: bool = False, rules: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Evaluate files and append one JSON line per file to output.
+
+    Every line is flushed when written, so completed files survive an
+    interruption.
+
+    Args:
+        files: SVG files to evaluate
+        output: JSONL file to append to
+        jobs: Worker processes; 1 evaluates in this process
+        quiet: Do not print progress to stderr
+        streaming: Parse with SVGCritic's streaming mode
+        rules: Rule names to run (default: all)
+
+    Returns:
+        Counts of evaluated and failed files
+    """
+    counts = {'evaluated': 0, 'failed': 0}
+    if not files:
+        return counts
+
+    evaluate = functools.partial(evaluate_file, streaming=streaming, rules=rules)
+    pool = Pool(jobs) if jobs > 1 else None
+    try:
+        if pool is not None:
+            # Small chunks keep the output streaming while amortizing IPC
+            chunksize = max(1, min(16, len(files) // (jobs * 8)))
+            records = pool.imap_unordered(evaluate, files, chunksize=chunksize)
+        else:
+            records = map(evaluate, files)
+
+        with _open_for_append(output) as f:
+            for i, record in enumerate(records, 1):
+                f.write(json.dumps(record) + '\n')
+                f.flush()
+                counts['failed' if 'error' in record else 'evaluated'] += 1
+                if not quiet and (i % 100 == 0 or i == len(files)):
+                    print(f"{i}/{len(files)} files", file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch SVG Critic - Score SVG files into JSONL")
+    parser.add_argument("inputs", nargs="+", help="SVG files, directories or glob patterns")
+    parser.add_argument("--output", "-o", default="critic.jsonl", help="JSONL file to append results to")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--retry-errors", action="store_true", help="Evaluate files that failed before again")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Bounded-memory parsing for very large SVGs")
+    parser.add_argument("--rules", help="Comma-separated rules to run, e.g. overlaps,color_harmony (default: all)")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Only print the summary")
+    args = parser.parse_args()
+
+    rules = [name.strip() for name in args.rules.split(',') if name.strip()] if args.rules else None
+    try:
+        resolve_rules(rules)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    files = collect_files(args.inputs)
+    if not files:
+        print("Error: no SVG files found", file=sys.stderr)
+        return 1
+
+    done = load_done(args.output, args.retry_errors)
+    todo = [path for path in files if os.path.abspath(path) not in done]
+    skipped = len(files) - len(todo)
+    if skipped and not args.quiet:
+        print(f"Skipping {skipped} files already in {args.output}", file=sys.stderr)
+
+    try:
+        counts = run_batch(todo, args.output, max(1, args.jobs), args.quiet, args.streaming, rules)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; run again with the same output to resume", file=sys.stderr)
+        return 130
+
+    print(f"Evaluated {counts['evaluated']}, failed {counts['failed']}, skipped {skipped} "
+          f"-> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
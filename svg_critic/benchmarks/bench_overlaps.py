@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark for SVGCritic.detect_overlaps on generated pathway diagrams.
+
+Diagrams are grids of groups (pathway nodes), each holding a few shapes with
+some jitter so that neighbouring nodes overlap. For every size the benchmark
+times detect_overlaps() and, up to --check-limit elements, the original
+all-pairs loop, and verifies that both report the same overlaps.
+
+Usage:
+    python benchmarks/bench_overlaps.py
+    python benchmarks/bench_overlaps.py --sizes 1000 4000 16000 --repeats 5
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from svg_critic import SVGCritic
+
+
+def generate_pathway_svg(path, shapes, seed=0):
+    """Write a diagram with about the given number of shapes in groups of four."""
+    rng = random.Random(seed)
+    groups = max(1, shapes // 4)
+    columns = max(1, int(groups ** 0.5))
+    width = columns * 120 + 40
+    height = (groups // columns + 1) * 120 + 40
+    lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">']
+    for g in range(groups):
+        x = 20 + (g % columns) * 120 + rng.uniform(-40, 40)
+        y = 20 + (g // columns) * 120 + rng.uniform(-40, 40)
+        lines.append(f'  <g id="node{g}">')
+        lines.append(f'    <rect id="box{g}" x="{x:.1f}" y="{y:.1f}" width="100" height="60" fill="#19aeff"/>')
+        lines.append(f'    <circle id="dot{g}" cx="{x + 20:.1f}" cy="{y + 30:.1f}" r="{rng.uniform(5, 25):.1f}" fill="#ff4141"/>')
+        lines.append(f'    <ellipse id="oval{g}" cx="{x + 70:.1f}" cy="{y + 80:.1f}" rx="30" ry="12" fill="#ffc022"/>')
+        lines.append(f'    <rect id="tag{g}" x="{x + 60:.1f}" y="{y - 10:.1f}" width="50" height="20" fill="#5dbb63"/>')
+        lines.append('  </g>')
+    lines.append('</svg>')
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+
+def reference_overlaps(elements):
+    """The original O(n^2) all-pairs implementation, for timing and verification."""
+    overlaps = []
+    for i, elem1 in enumerate(elements):
+        bbox1 = elem1.get('bbox', {})
+        if not bbox1 or 'x1' not in bbox1:
+            continue
+        for j, elem2 in enumerate(elements[i+1:], i+1):
+            if elem1.get('parent_id') == elem2.get('parent_id'):
+                continue
+            bbox2 = elem2.get('bbox', {})
+            if not bbox2 or 'x1' not in bbox2:
+                continue
+            if (bbox1['x1'] < bbox2['x2'] and bbox1['x2'] > bbox2['x1'] and
+                    bbox1['y1'] < bbox2['y2'] and bbox1['y2'] > bbox2['y1']):
+                overlap_width = min(bbox1['x2'], bbox2['x2']) - max(bbox1['x1'], bbox2['x1'])
+                overlap_height = min(bbox1['y2'], bbox2['y2']) - max(bbox1['y1'], bbox2['y1'])
+                overlap_area = overlap_width * overlap_height
+                area1 = (bbox1['x2'] - bbox1['x1']) * (bbox1['y2'] - bbox1['y1'])
+                area2 = (bbox2['x2'] - bbox2['x1']) * (bbox2['y2'] - bbox2['y1'])
+                smaller_area = min(area1, area2)
+                overlap_percentage = (overlap_area / smaller_area) * 100 if smaller_area > 0 else 0
+                if overlap_percentage > 10:
+                    overlaps.append({
+                        'element1': elem1.get('id', f"element-{i}"),
+                        'element2': elem2.get('id', f"element-{j}"),
+                        'overlap_percentage': overlap_percentage,
+                        'severity': 'high' if overlap_percentage > 50 else 'medium'
+                    })
+    return overlaps
+
+
+def best_time(func, repeats, setup=None):
+    """Fastest of several runs, in seconds, and the last result; setup() runs untimed before each."""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SVGCritic.detect_overlaps scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000, 8000, 16000],
+                        help="Shape counts to benchmark")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--check-limit", type=int, default=4000,
+                        help="Largest size for which the all-pairs reference is run")
+    parser.add_argument("--output", "-o", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'shapes':>8} {'overlaps':>9} {'sweep ms':>10} {'us/shape':>9} {'all-pairs ms':>13}")
+        for size in args.sizes:
+            path = os.path.join(workdir, f"pathway-{size}.svg")
+            generate_pathway_svg(path, size)
+            critic = SVGCritic(path)
+
+            def cold_cache():
+                # detect_overlaps is memoized: drop the cached result, but keep the
+                # shared columns warm so only the sweep is timed
+                critic.invalidate()
+                critic.columns
+
+            seconds, overlaps = best_time(critic.detect_overlaps, args.repeats, cold_cache)
+            entry = {"shapes": len(critic.elements), "overlaps": len(overlaps), "seconds": seconds}
+            if size <= args.check_limit:
+                reference_seconds, expected = best_time(lambda: reference_overlaps(critic.elements), 1)
+                if overlaps != expected:
+                    print(f"Mismatch against the all-pairs reference at {size} shapes")
+                    return 1
+                entry["reference_seconds"] = reference_seconds
+            results.append(entry)
+
+            reference = f"{entry['reference_seconds'] * 1000:13.1f}" if "reference_seconds" in entry else f"{'-':>13}"
+            print(f"{entry['shapes']:8d} {entry['overlaps']:9d} {seconds * 1000:10.2f} "
+                  f"{seconds / entry['shapes'] * 1e6:9.2f} {reference}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the svg_parser backends on the library's largest icons.
+
+For the N largest SVG files under --root, each backend is timed on parsing,
+a full traversal (tag and attributes of every element, as SVGCritic reads
+them) and a tag-filtered traversal of shape elements. Times are the best of
+--repeats runs, summed over the files.
+
+Usage:
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --count 50 --repeats 5 --output parsers.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from svg_parser import BACKENDS, SVG_NS, have_lxml, iter_tags, local_name, parse
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "static", "icons")
+
+SHAPE_TAGS = tuple(SVG_NS + name for name in ('rect', 'circle', 'ellipse', 'line', 'polyline', 'polygon', 'path'))
+
+
+def largest_svgs(root, count):
+    """Return the paths of the count largest SVG files under root."""
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith('.svg'):
+                path = os.path.join(dirpath, name)
+                files.append((os.path.getsize(path), path))
+    return [path for _, path in sorted(files, reverse=True)[:count]]
+
+
+def best_time(func, repeats):
+    """Best wall time of func() over repeats runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def traverse(root):
+    """Read every element's local tag and attributes."""
+    count = 0
+    for elem in root.iter():
+        local_name(elem.tag)
+        for _ in elem.attrib.items():
+            pass
+        count += 1
+    return count
+
+
+def filter_shapes(root):
+    """Count shape elements using the backend's tag filter."""
+    return sum(1 for _ in iter_tags(root, *SHAPE_TAGS))
+
+
+def benchmark(files, backend, repeats):
+    """Summed best times of parse, traversal and tag filter for one backend."""
+    totals = {'parse_ms': 0.0, 'traverse_ms': 0.0, 'filter_ms': 0.0, 'elements': 0, 'failed': 0}
+    for path in files:
+        try:
+            root = parse(path, backend).getroot()
+        except Exception:
+            totals['failed'] += 1
+            continue
+        totals['parse_ms'] += best_time(lambda: parse(path, backend), repeats) * 1000
+        totals['traverse_ms'] += best_time(lambda: traverse(root), repeats) * 1000
+        totals['filter_ms'] += best_time(lambda: filter_shapes(root), repeats) * 1000
+        totals['elements'] += traverse(root)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark svg_parser backends on the largest icons")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Directory to search for SVG files")
+    parser.add_argument("--count", type=int, default=20, help="Number of largest files to use")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    files = largest_svgs(args.root, args.count)
+    if not files:
+        print(f"Error: no SVG files found under {args.root}")
+        return 1
+    size_mb = sum(os.path.getsize(path) for path in files) / 1e6
+    print(f"{len(files)} files, {size_mb:.1f} MB (largest {os.path.getsize(files[0]) / 1e6:.2f} MB)")
+
+    backends = [b for b in BACKENDS if b != 'lxml' or have_lxml()]
+    results = {}
+    print(f"{'backend':>8} {'parse ms':>10} {'traverse ms':>12} {'filter ms':>10} {'elements':>9}")
+    for backend in backends:
+        totals = results[backend] = benchmark(files, backend, args.repeats)
+        print(f"{backend:>8} {totals['parse_ms']:>10.1f} {totals['traverse_ms']:>12.1f} "
+              f"{totals['filter_ms']:>10.1f} {totals['elements']:>9}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({'files': files, 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
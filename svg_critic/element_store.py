@@ -0,0 +1,127 @@
+"""
+Element Store - Columnar NumPy view of SVGCritic elements.
+
+SVGCritic keeps its elements as a list of dicts. The metrics only need a few
+numeric fields per element, so the store packs them into one structured array
+(bounding box, type code and parent index) and interns attribute values into
+per-attribute tables of unique strings plus an integer code per element.
+Analyzers then work on whole columns instead of looping over dicts.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Shape types get stable codes; other types are appended as they are seen
+TYPE_NAMES = ('rect', 'circle', 'ellipse', 'line', 'polyline', 'polygon', 'path', 'text')
+
+ELEMENT_DTYPE = np.dtype([
+    ('x1', 'f8'), ('y1', 'f8'), ('x2', 'f8'), ('y2', 'f8'),
+    ('type', 'i2'),
+    ('parent', 'i4'),
+])
+
+
+class AttributeColumn:
+    """
+    Interned values of one attribute.
+
+    Attributes:
+        values: Unique attribute values
+        codes: (n,) index into values per element, -1 where the attribute is absent
+    """
+
+    def __init__(self, values: List[str], codes: np.ndarray):
+        self.values = values
+        self.codes = codes
+
+    def counts(self) -> Dict[str, int]:
+        """Number of elements using each value."""
+        present = self.codes[self.codes >= 0]
+        return {self.values[code]: int(count)
+                for code, count in enumerate(np.bincount(present, minlength=len(self.values))) if count}
+
+    def mask(self, values) -> np.ndarray:
+        """Boolean mask of elements whose value is one of values."""
+        wanted = [i for i, value in enumerate(self.values) if value in set(values)]
+        return np.isin(self.codes, wanted)
+
+
+class ElementStore:
+    """
+    Structured-array representation of a list of element dicts.
+
+    Attributes:
+        table: (n,) structured array with x1, y1, x2, y2, type and parent
+            fields; boxes are NaN for elements without a bbox
+        types: Type names indexed by the type codes
+        parents: Parent ids indexed by the parent codes
+    """
+
+    def __init__(self, elements: List[Dict]):
+        self.elements = elements
+        self.types = list(TYPE_NAMES)
+        self.parents: List[Optional[str]] = []
+        self._attributes: Dict[str, AttributeColumn] = {}
+
+        type_codes = {name: code for code, name in enumerate(self.types)}
+        parent_codes: Dict[Optional[str], int] = {}
+        table = np.zeros(len(elements), dtype=ELEMENT_DTYPE)
+        boxes = np.full((len(elements), 4), np.nan)
+        types = np.empty(len(elements), dtype=np.int16)
+        parents = np.empty(len(elements), dtype=np.int32)
+        for i, elem in enumerate(elements):
+            bbox = elem.get('bbox')
+            if bbox and 'x1' in bbox:
+                boxes[i] = (bbox['x1'], bbox['y1'], bbox['x2'], bbox['y2'])
+            elem_type = elem.get('type')
+            if elem_type not in type_codes:
+                type_codes[elem_type] = len(self.types)
+                self.types.append(elem_type)
+            types[i] = type_codes[elem_type]
+            parent = elem.get('parent_id')
+            if parent not in parent_codes:
+                parent_codes[parent] = len(self.parents)
+                self.parents.append(parent)
+            parents[i] = parent_codes[parent]
+
+        table['x1'], table['y1'], table['x2'], table['y2'] = boxes.T
+        table['type'] = types
+        table['parent'] = parents
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def boxes(self) -> np.ndarray:
+        """(n, 4) float array of x1, y1, x2, y2."""
+        table = self.table
+        return np.column_stack([table['x1'], table['y1'], table['x2'], table['y2']])
+
+    def has_bbox(self) -> np.ndarray:
+        """Mask of elements with a bounding box."""
+        return ~np.isnan(self.table['x1'])
+
+    def type_mask(self, *names: str) -> np.ndarray:
+        """Mask of elements of the given types."""
+        codes = [code for code, name in enumerate(self.types) if name in names]
+        return np.isin(self.table['type'], codes)
+
+    def attribute(self, name: str) -> AttributeColumn:
+        """Interned column of an attribute, built on first use."""
+        column = self._attributes.get(name)
+        if column is None:
+            values: List[str] = []
+            index: Dict[str, int] = {}
+            codes = np.full(len(self.elements), -1, dtype=np.int32)
+            for i, elem in enumerate(self.elements):
+                value = elem['attributes'].get(name)
+                if value is None:
+                    continue
+                code = index.get(value)
+                if code is None:
+                    code = index[value] = len(values)
+                    values.append(value)
+                codes[i] = code
+            column = self._attributes[name] = AttributeColumn(values, codes)
+        return column
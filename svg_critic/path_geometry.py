@@ -0,0 +1,157 @@
+"""
+Path Geometry - Exact bounding boxes for SVG path, line, polyline and polygon elements.
+
+Elements are read into absolute M/L/Q/C/Z segments by bioicons.geometry (the
+parser shared with the icon library tools; arcs become cubic Béziers of at
+most 90°) and reduced to two kinds of geometry: points (segment end points)
+and cubic Béziers (quadratics are degree-elevated exactly). The geometry of
+all elements in a document is gathered into one batch, and the curve extrema
+are then solved with NumPy for every segment at once from the roots of each
+cubic's derivative.
+
+Bounding boxes are in the element's own user space; transforms are not applied.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from bioicons.geometry import Segment, shape_segments
+except ImportError:
+    # Run as a script from svg_critic/: the bioicons package lives at the repository root
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from bioicons.geometry import Segment, shape_segments
+
+PATH_LIKE = ("path", "line", "polyline", "polygon")
+
+
+class PathBatch:
+    """
+    Collects the geometry of many elements and computes all their bounds at once.
+
+    Usage:
+        batch = PathBatch()
+        owner = batch.add('path', {'d': 'M0 0 C 10 20 30 20 40 0'})
+        bounds = batch.bounds()  # (n, 4) array of x1, y1, x2, y2
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._points: List[float] = []
+        self._point_owners: List[int] = []
+        self._cubics: List[float] = []
+        self._cubic_owners: List[int] = []
+
+    def add(self, elem_type: str, attrs: Dict[str, str]) -> int:
+        """
+        Add the geometry of a path, line, polyline or polygon element.
+
+        Returns:
+            Index of the element's row in bounds()
+        """
+        segments = shape_segments(elem_type, attrs) if elem_type in PATH_LIKE else []
+        return self.add_segments(segments)
+
+    def add_segments(self, segments: Sequence[Segment]) -> int:
+        """
+        Add absolute M/L/Q/C/Z segments (see bioicons.geometry.parse_path).
+
+        Returns:
+            Index of the row in bounds()
+        """
+        owner = self.count
+        self.count += 1
+        points, cubics = self._points, self._cubics
+        x = y = start_x = start_y = 0.0
+        for command, args in segments:
+            if command == "M":
+                x, y = start_x, start_y = args
+            elif command == "L":
+                x, y = args
+            elif command == "C":
+                cubics.extend((x, y, *args))
+                self._cubic_owners.append(owner)
+                x, y = args[4], args[5]
+            elif command == "Q":
+                qx, qy, ex, ey = args
+                # Degree elevation: the quadratic as an exact cubic
+                cubics.extend((x, y, x + 2 / 3 * (qx - x), y + 2 / 3 * (qy - y),
+                               ex + 2 / 3 * (qx - ex), ey + 2 / 3 * (qy - ey), ex, ey))
+                self._cubic_owners.append(owner)
+                x, y = ex, ey
+            else:
+                x, y = start_x, start_y
+                continue
+            points.extend((x, y))
+            self._point_owners.append(owner)
+        return owner
+
+    def bounds(self) -> np.ndarray:
+        """
+        Bounding boxes of all added elements.
+
+        Returns:
+            (count, 4) array of x1, y1, x2, y2; rows of elements without
+            geometry are NaN
+        """
+        lower = np.full((self.count, 2), np.inf)
+        upper = np.full((self.count, 2), -np.inf)
+
+        def accumulate(owners, xy):
+            if len(owners):
+                np.minimum.at(lower, owners, xy)
+                np.maximum.at(upper, owners, xy)
+
+        accumulate(np.asarray(self._point_owners, dtype=np.int64),
+                   np.asarray(self._points, dtype=np.float64).reshape(-1, 2))
+        if self._cubics:
+            owners, extrema = cubic_extrema(np.asarray(self._cubics, dtype=np.float64).reshape(-1, 4, 2),
+                                            np.asarray(self._cubic_owners, dtype=np.int64))
+            accumulate(owners, extrema)
+
+        result = np.hstack([lower, upper])
+        result[~np.isfinite(lower[:, 0])] = np.nan
+        return result
+
+
+def cubic_extrema(controls: np.ndarray, owners: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Interior axis extrema of many cubic Béziers.
+
+    Args:
+        controls: (n, 4, 2) control points
+        owners: (n,) owner index per curve
+
+    Returns:
+        (owners, points) for every extremum with 0 < t < 1; end points are not
+        included
+    """
+    p0, p1, p2, p3 = (controls[:, i, :] for i in range(4))
+    # Derivative / 3 = a t^2 + b t + c, per axis
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.sqrt(b * b - 4 * a * c)
+        quadratic = np.abs(a) > 1e-12
+        t1 = np.where(quadratic, (-b + root) / (2 * a), -c / b)
+        t2 = np.where(quadratic, (-b - root) / (2 * a), np.nan)
+    t = np.concatenate([t1, t2], axis=1)  # (n, 4): two roots for x, two for y
+    valid = (t > 0) & (t < 1)
+
+    rows, cols = np.nonzero(valid)
+    t = t[rows, cols][:, None]
+    mt = 1 - t
+    points = (mt ** 3 * p0[rows] + 3 * mt * mt * t * p1[rows] + 3 * mt * t * t * p2[rows] + t ** 3 * p3[rows])
+    return owners[rows], points
+
+
+def path_bbox(elem_type: str, attrs: Dict[str, str]) -> Optional[Tuple[float, float, float, float]]:
+    """Bounding box (x1, y1, x2, y2) of a single element, or None if it has no geometry."""
+    batch = PathBatch()
+    batch.add(elem_type, attrs)
+    row = batch.bounds()[0]
+    return None if np.isnan(row[0]) else tuple(float(v) for v in row)
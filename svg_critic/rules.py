@@ -0,0 +1,214 @@
+"""
+Rules - SVGCritic analyzers as registered, selectable and timed rules.
+
+Each rule names the analyzer it runs, its weight in the overall score, the
+shared precomputations it needs and the element fields it reads. A
+RuleEngine runs any subset of the registered rules on one critic. It builds
+only the precomputations that the selected rules need, each once, and times
+every precomputation and rule.
+
+    from svg_critic import SVGCritic
+
+    evaluation = SVGCritic("diagram.svg").evaluate(rules=["overlaps", "color_harmony"])
+    evaluation["rules"]["overlaps"]   # {'score': 80, 'weight': 0.25, 'seconds': 0.0004}
+
+New rules are added with register_rule(); their analyzer may be an SVGCritic
+method name or a function taking the critic.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Shared precomputations: name -> SVGCritic attribute that builds (and caches) it
+PRECOMPUTATIONS = {
+    'columns': 'columns',
+    'palette': 'color_palette',
+}
+
+
+class Rule(NamedTuple):
+    """
+    One analyzer of the critic.
+
+    Attributes:
+        name: Rule name, used to select it
+        analyzer: SVGCritic method name, or a function taking the critic
+        key: Key of the result in SVGCritic.evaluate()
+        weight: Share of the overall score; 0 for advisory rules
+        score: Maps the result to a 0-100 score; None for advisory rules
+        report: Maps the result to its evaluate() value (default: unchanged)
+        requires: Names of the PRECOMPUTATIONS the analyzer uses
+        fields: Element fields read; attributes as "attributes.<name>"
+        depends: Rules whose results the analyzer reuses
+    """
+    name: str
+    analyzer: Union[str, Callable]
+    key: str
+    weight: float = 0.0
+    score: Optional[Callable[[Any], float]] = None
+    report: Optional[Callable[[Any], Any]] = None
+    requires: Tuple[str, ...] = ()
+    fields: Tuple[str, ...] = ()
+    depends: Tuple[str, ...] = ()
+
+
+# Registered rules in evaluation order
+RULES: Dict[str, Rule] = {}
+
+
+def register_rule(rule: Rule) -> Rule:
+    """
+    Register a rule, replacing any rule of the same name.
+
+    Raises:
+        ValueError: If it requires an unknown precomputation or depends on an unregistered rule
+    """
+    for name in rule.requires:
+        if name not in PRECOMPUTATIONS:
+            raise ValueError(f"Rule {rule.name} requires unknown precomputation: {name}")
+    for name in rule.depends:
+        if name not in RULES:
+            raise ValueError(f"Rule {rule.name} depends on unregistered rule: {name}")
+    RULES[rule.name] = rule
+    return rule
+
+
+def resolve_rules(names: Optional[Sequence[str]] = None) -> List[Rule]:
+    """
+    Return the rules to run for a selection, in registration order.
+
+    Rules that a selected rule depends on are included.
+
+    Args:
+        names: Rule names (default: all registered rules)
+
+    Raises:
+        ValueError: If a name is not a registered rule
+    """
+    if names is None:
+        return list(RULES.values())
+    unknown = [name for name in names if name not in RULES]
+    if unknown:
+        raise ValueError(f"Unknown rules: {', '.join(unknown)} (available: {', '.join(RULES)})")
+    selected = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(RULES[name].depends)
+    return [rule for name, rule in RULES.items() if name in selected]
+
+
+def required_fields(names: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+    """Element fields read by the selected rules."""
+    fields = {}
+    for rule in resolve_rules(names):
+        fields.update(dict.fromkeys(rule.fields))
+    return tuple(fields)
+
+
+def required_attributes(names: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+    """SVG attributes read by the selected rules."""
+    return tuple(field.split('.', 1)[1] for field in required_fields(names) if field.startswith('attributes.'))
+
+
+def overall_score(results: Dict[str, Dict]) -> int:
+    """
+    Weighted average of the scored rules in RuleEngine.run() results, rounded.
+
+    Returns 0 when no scored rule ran.
+    """
+    total = sum(entry['weight'] for entry in results.values() if entry['score'] is not None)
+    if not total:
+        return 0
+    weighted = sum(entry['weight'] * entry['score'] for entry in results.values() if entry['score'] is not None)
+    return round(weighted / total)
+
+
+class RuleEngine:
+    """Runs registered rules on one SVGCritic."""
+
+    def __init__(self, critic):
+        self.critic = critic
+
+    def run(self, names: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+        """
+        Run the selected rules.
+
+        Results are cached on the critic, so running a rule again (or a
+        rule whose analyzer reuses another's result) does not recompute it.
+
+        Args:
+            names: Rule names (default: all registered rules)
+
+        Returns:
+            {"precomputations": {name: seconds}, "rules": {name: {"result",
+            "score", "weight", "seconds"}}}
+        """
+        rules = resolve_rules(names)
+        precomputations = {}
+        for rule in rules:
+            for name in rule.requires:
+                if name not in precomputations:
+                    start = time.perf_counter()
+                    getattr(self.critic, PRECOMPUTATIONS[name])
+                    precomputations[name] = time.perf_counter() - start
+
+        results = {}
+        for rule in rules:
+            analyzer = rule.analyzer
+            start = time.perf_counter()
+            if isinstance(analyzer, str):
+                result = getattr(self.critic, analyzer)()
+            else:
+                result = analyzer(self.critic)
+            seconds = time.perf_counter() - start
+            results[rule.name] = {
+                'result': result,
+                'score': rule.score(result) if rule.score is not None else None,
+                'weight': rule.weight,
+                'seconds': seconds,
+            }
+        return {'precomputations': precomputations, 'rules': results}
+
+
+# Built-in rules; weights as in the original fixed weighted average
+register_rule(Rule(
+    'overlaps', 'detect_overlaps', 'critical_issues', weight=0.25,
+    # Each overlap costs 20 points
+    score=lambda overlaps: 100 - min(100, len(overlaps) * 20),
+    report=lambda overlaps: [
+        {
+            'type': 'overlap',
+            'elements': [o['element1'], o['element2']],
+            'severity': o['severity']
+        }
+        for o in overlaps
+    ],
+    requires=('columns',), fields=('id', 'bbox', 'parent_id'),
+))
+register_rule(Rule(
+    'layout', 'analyze_layout', 'layout_assessment', weight=0.20,
+    score=lambda layout: layout['balance_score'],
+    requires=('columns',), fields=('bbox',),
+))
+register_rule(Rule(
+    'color_harmony', 'analyze_color_harmony', 'color_harmony', weight=0.15,
+    score=lambda harmony: harmony['palette_adherence'],
+    requires=('palette',), fields=('attributes.fill', 'attributes.stroke'),
+))
+register_rule(Rule(
+    'visual_hierarchy', 'analyze_visual_hierarchy', 'visual_hierarchy', weight=0.20,
+    score=lambda hierarchy: hierarchy['score'],
+    requires=('columns',), fields=('bbox',),
+))
+register_rule(Rule(
+    'accessibility', 'analyze_accessibility', 'accessibility', weight=0.20,
+    score=lambda accessibility: accessibility['score'],
+    fields=('id', 'type', 'attributes.fill', 'attributes.stroke', 'attributes.font-size'),
+))
+register_rule(Rule(
+    'code_improvements', 'suggest_code_improvements', 'suggested_code_changes',
+    requires=('columns',), fields=('id', 'type', 'bbox'), depends=('overlaps',),
+))
@@ -7,50 +7,286 @@ to improve visual clarity, organization, and effectiveness.
 
 import re
 import math
-import xml.etree.ElementTree as ET
 import json
+import functools
 from collections import defaultdict
 import numpy as np
 from typing import Dict, List, Tuple, Any, Optional, Union
 
-# Define namespaces for parsing SVG
-NAMESPACES = {
-    'svg': 'http://www.w3.org/2000/svg',
-    'xlink': 'http://www.w3.org/1999/xlink',
-    'inkscape': 'http://www.inkscape.org/namespaces/inkscape',
-    'sodipodi': 'http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd'
-}
+try:
+    from .path_geometry import PATH_LIKE, PathBatch
+    from .transforms import TransformStack
+    from .element_store import ElementStore
+    from .svg_parser import NAMESPACES, iterparse, local_name, parse, resolve_backend
+    from .rules import RULES, RuleEngine, overall_score, required_attributes
+except ImportError:
+    from path_geometry import PATH_LIKE, PathBatch
+    from transforms import TransformStack
+    from element_store import ElementStore
+    from svg_parser import NAMESPACES, iterparse, local_name, parse, resolve_backend
+    from rules import RULES, RuleEngine, overall_score, required_attributes
 
-# Register namespaces for ElementTree
-for prefix, uri in NAMESPACES.items():
-    ET.register_namespace(prefix, uri)
+
+def _sweep_pairs(boxes: np.ndarray, block: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find candidate pairs of overlapping boxes by sort and sweep.
+
+    The canvas is cut into horizontal bands about twice the typical box
+    height. Within each band, boxes are sorted by their left edge and each one
+    is paired with the boxes that start after it and before its right edge.
+    A box spanning several bands joins each of them, and a pair is kept only
+    in the first band the two boxes share. Because sweeping one band sees only
+    its local neighbours, the cost stays near O(n log n + k) even when many
+    boxes line up in the same column.
+
+    Args:
+        boxes: (n, 4) array of x1, y1, x2, y2
+        block: Sweep positions processed at once, to bound memory
+
+    Returns:
+        Two index arrays (into boxes) of candidate pairs, each pair once
+    """
+    x1, y1, x2, y2 = boxes.T
+    heights = y2 - y1
+    typical = np.median(heights[heights > 0]) if np.any(heights > 0) else 0.0
+    top = y1.min()
+    span = y2.max() - top
+    band_height = max(2 * typical, span / len(boxes)) if span > 0 else 1.0
+    first_band = np.floor((y1 - top) / band_height).astype(np.int64)
+    last_band = np.maximum(np.floor((y2 - top) / band_height).astype(np.int64), first_band)
+
+    # One membership per (box, band)
+    counts = last_band - first_band + 1
+    member = np.repeat(np.arange(len(boxes)), counts)
+    band = first_band[member] + np.arange(len(member)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    # Shift each band along x so that a single sorted sweep never crosses bands
+    shift = band * (2 * (np.abs(x1).max() + np.abs(x2).max()) + 1.0)
+    order = np.lexsort((x1[member], band))
+    starts = (x1[member] + shift)[order]
+    ends = np.searchsorted(starts, (x2[member] + shift)[order], side='left')
+
+    firsts, seconds = [], []
+    for lo in range(0, len(order), block):
+        positions = np.arange(lo, min(lo + block, len(order)))
+        pair_counts = np.maximum(ends[positions] - positions - 1, 0)
+        total = int(pair_counts.sum())
+        if not total:
+            continue
+        base = np.repeat(positions, pair_counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        a, b = member[order[base]], member[order[base + 1 + offsets]]
+        # Report a pair only in the first band both boxes belong to
+        keep = band[order[base]] == np.maximum(first_band[a], first_band[b])
+        firsts.append(a[keep])
+        seconds.append(b[keep])
+    if not firsts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+# Subtrees that streaming mode skips without building elements
+SKIPPED_TAGS = ('metadata',)
+
+# Path-like elements measured per PathBatch, bounding the parser's working memory
+PATH_BATCH_SIZE = 4096
+
+
+def _tree_events(root):
+    """Yield ('start', elem) and ('end', elem) for the descendants of root in document order."""
+    for child in root:
+        yield 'start', child
+        yield from _tree_events(child)
+        yield 'end', child
+
+
+def _stream_events(events, root):
+    """
+    Filter iterparse events below root, freeing each element once it has ended.
+    
+    <metadata> subtrees are skipped and the attributes of <image> elements
+    (usually inline raster data) are dropped as soon as they are read. Ended
+    elements are cleared and detached from their parent, so only the open
+    elements on the current path stay in memory.
+    """
+    stack = [root]
+    skipping = 0
+    for event, elem in events:
+        if event == 'start':
+            stack.append(elem)
+            if skipping or local_name(elem.tag) in SKIPPED_TAGS:
+                skipping += 1
+                continue
+            if local_name(elem.tag) == 'image':
+                elem.attrib.clear()
+            yield event, elem
+        elif elem is not root:
+            stack.pop()
+            if skipping:
+                skipping -= 1
+            else:
+                yield event, elem
+            elem.clear()
+            # Earlier siblings are already detached, so this is a constant-time removal
+            stack[-1].remove(elem)
+
+
+def _measure_paths(paths: PathBatch, rows: List[Tuple[int, int]], boxes: List):
+    """Store the bounds of a PathBatch's rows at their elements' indices in boxes."""
+    if rows:
+        bounds = paths.bounds()
+        for index, row in rows:
+            boxes[index] = tuple(bounds[row])
+
+
+def _memoized(method):
+    """
+    Cache an analysis on the critic until its elements change.
+
+    Results live in the instance's _analyses dictionary, keyed by method
+    name, and are cleared by SVGCritic.invalidate().
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        analyses = self._analyses
+        if name not in analyses:
+            analyses[name] = method(self)
+        return analyses[name]
+    return wrapper
 
 
 class SVGCritic:
     """
     Analyzes SVG files and provides design feedback.
+    
+    Analyses are computed lazily and cached, so each runs at most once per
+    document; the overlaps, layout, color_harmony, visual_hierarchy,
+    accessibility and code_improvements properties (and the matching
+    methods) return the cached results. Treat them as read-only. Assigning
+    to elements clears the cache; call invalidate() after changing elements
+    in place.
     """
     
-    def __init__(self, svg_path: str):
+    def __init__(self, svg_path: str, streaming: bool = False, backend: Optional[str] = None):
         """
         Initialize with path to SVG file.
         
         Args:
             svg_path: Path to the SVG file to analyze
+            streaming: Parse incrementally with iterparse instead of loading
+                the whole tree, so memory does not grow with the file's
+                markup, rasters or metadata. Elements then keep only id,
+                transform and the attributes the registered rules read
+                (rules.required_attributes), tree is None and root holds
+                just the root element's attributes.
+            backend: XML parser, "lxml" or "etree" (default: lxml when
+                installed; see svg_parser)
         """
         self.svg_path = svg_path
-        self.tree = ET.parse(svg_path)
-        self.root = self.tree.getroot()
+        self.streaming = streaming
+        self.backend = resolve_backend(backend)
+        if streaming:
+            self.tree = None
+            events = iterparse(svg_path, ('start', 'end'), self.backend)
+            _, self.root = next(events)
+        else:
+            self.tree = parse(svg_path, self.backend)
+            self.root = self.tree.getroot()
         self.width = float(self.root.get('width', '800'))
         self.height = float(self.root.get('height', '600'))
-        self.elements = self._parse_elements()
-        self.color_palette = self._extract_color_palette()
+        self._analyses = {}
+        if streaming:
+            attributes = tuple(dict.fromkeys(('id', 'transform') + required_attributes()))
+            self.elements = self._parse_elements(_stream_events(events, self.root), attributes)
+        else:
+            self.elements = self._parse_elements()
+
+    @property
+    def elements(self) -> List[Dict]:
+        """Parsed shape elements; assigning a new list clears cached analyses."""
+        return self._elements
+
+    @elements.setter
+    def elements(self, elements: List[Dict]):
+        self._elements = elements
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop all cached analyses, e.g. after modifying elements in place."""
+        self._analyses.clear()
+
+    @property
+    def columns(self) -> ElementStore:
+        """Columnar view of the elements, built once per document."""
+        return self._element_store()
+
+    @_memoized
+    def _element_store(self) -> ElementStore:
+        return ElementStore(self.elements)
+
+    @property
+    def color_palette(self) -> Dict[str, int]:
+        """Fill and stroke colors with their use counts."""
+        return self._extract_color_palette()
+
+    @property
+    def overlaps(self) -> List[Dict]:
+        return self.detect_overlaps()
+
+    @property
+    def layout(self) -> Dict:
+        return self.analyze_layout()
+
+    @property
+    def color_harmony(self) -> Dict:
+        return self.analyze_color_harmony()
+
+    @property
+    def visual_hierarchy(self) -> Dict:
+        return self.analyze_visual_hierarchy()
+
+    @property
+    def accessibility(self) -> Dict:
+        return self.analyze_accessibility()
+
+    @property
+    def code_improvements(self) -> List[Dict]:
+        return self.suggest_code_improvements()
         
-    def _parse_elements(self) -> List[Dict]:
-        """Extract all SVG elements into a structured format."""
-        elements = []
+    def _parse_elements(self, events=None, attributes: Optional[Tuple[str, ...]] = None) -> List[Dict]:
+        """
+        Extract all SVG elements into a structured format.
+        
+        Bounding boxes are in canvas space: each element's box is measured in
+        its own user space and mapped through its transform and those of its
+        ancestors.
         
-        def process_element(elem, parent_id=None, group_transform=None):
+        Args:
+            events: ('start', elem) / ('end', elem) pairs for the descendants
+                of the root in document order, as from iterparse; defaults
+                to a walk of self.root
+            attributes: Attribute names to keep per element (default: all)
+        """
+        if events is None:
+            events = _tree_events(self.root)
+        elements = []
+        boxes = []
+        # Path-like geometry is measured in batches of up to PATH_BATCH_SIZE elements
+        paths = PathBatch()
+        path_rows = []
+        transforms = TransformStack()
+        ctm_keys = []
+        # (id, inherited transform, CTM key) of each open element, innermost last
+        scopes = [(None, None, 0)]
+        
+        for event, elem in events:
+            if event == 'end':
+                scopes.pop()
+                continue
+            parent_id, group_transform, parent_ctm = scopes[-1]
             elem_id = elem.get('id', '')
             elem_type = elem.tag.split('}')[-1]  # Remove namespace prefix
             
@@ -59,31 +295,57 @@ class SVGCritic:
             
             # Process transform attribute
             transform = attrs.get('transform', group_transform)
+            ctm = transforms.push(parent_ctm, attrs.get('transform'))
+            scopes.append((elem_id, transform, ctm))
             
             # Handle different element types
             if elem_type in ['rect', 'circle', 'ellipse', 'line', 'polyline', 'polygon', 'path']:
-                bbox = self._calculate_bbox(elem, transform)
+                if elem_type in PATH_LIKE:
+                    path_rows.append((len(elements), paths.add(elem_type, attrs)))
+                    boxes.append(None)
+                else:
+                    bbox = self._calculate_bbox(elem, transform)
+                    boxes.append((bbox['x1'], bbox['y1'], bbox['x2'], bbox['y2']))
+                if attributes is not None:
+                    attrs = {k: attrs[k] for k in attributes if k in attrs}
+                ctm_keys.append(ctm)
                 elements.append({
                     'id': elem_id,
                     'type': elem_type,
                     'attributes': attrs,
                     'transform': transform,
                     'parent_id': parent_id,
-                    'bbox': bbox
+                    'bbox': None
                 })
-            
-            # Process children recursively
-            for child in elem:
-                process_element(child, elem_id, transform)
-        
-        # Start processing from root
-        for child in self.root:
-            process_element(child)
+                if len(path_rows) >= PATH_BATCH_SIZE:
+                    _measure_paths(paths, path_rows, boxes)
+                    paths, path_rows = PathBatch(), []
+        _measure_paths(paths, path_rows, boxes)
+
+        boxes = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+        # Elements without geometry keep the empty box rather than being moved by their transform
+        empty = np.isnan(boxes[:, 0]) | np.all(boxes == 0, axis=1)
+        keys = np.asarray(ctm_keys, dtype=np.int64)
+        boxes = transforms.map_boxes(np.where(empty[:, None], 0.0, boxes), keys)
+
+        for index, elem in enumerate(elements):
+            matrix = transforms.matrix(keys[index])
+            elem['ctm'] = [float(v) for v in matrix]
+            if empty[index]:
+                elem['bbox'] = {'x1': 0, 'y1': 0, 'x2': 0, 'y2': 0}
+            else:
+                x1, y1, x2, y2 = boxes[index]
+                elem['bbox'] = {'x1': float(x1), 'y1': float(y1), 'x2': float(x2), 'y2': float(y2)}
             
         return elements
     
     def _calculate_bbox(self, elem, transform=None) -> Dict[str, float]:
-        """Calculate bounding box for an element (approximate)."""
+        """
+        Calculate the bounding box of a rect, circle or ellipse.
+        
+        Path, line, polyline and polygon elements are measured in a batch by
+        _parse_elements (see path_geometry.PathBatch).
+        """
         elem_type = elem.tag.split('}')[-1]
         
         if elem_type == 'rect':
@@ -106,74 +368,76 @@ class SVGCritic:
             ry = float(elem.get('ry', '0'))
             return {'x1': cx - rx, 'y1': cy - ry, 'x2': cx + rx, 'y2': cy + ry}
             
-        # For more complex elements like paths, we'd need more sophisticated calculations
-        # This is a placeholder for demonstration
         return {'x1': 0, 'y1': 0, 'x2': 0, 'y2': 0}
     
+    @_memoized
     def _extract_color_palette(self) -> Dict[str, int]:
         """Extract and count colors used in the SVG."""
         colors = defaultdict(int)
         
-        for elem in self.elements:
-            attrs = elem['attributes']
-            fill = attrs.get('fill')
-            stroke = attrs.get('stroke')
-            
-            if fill and fill != 'none':
-                colors[fill] += 1
-            if stroke and stroke != 'none':
-                colors[stroke] += 1
+        for name in ('fill', 'stroke'):
+            for color, count in self.columns.attribute(name).counts().items():
+                if color and color != 'none':
+                    colors[color] += count
                 
         return dict(colors)
     
+    @_memoized
     def detect_overlaps(self) -> List[Dict]:
         """
         Detect overlapping elements in the SVG.
         
+        Candidate pairs come from a banded sort-and-sweep over the bounding
+        boxes (see _sweep_pairs), so only nearby pairs are examined.
+        Elements sharing a parent are not compared, and only overlaps covering
+        more than 10% of the smaller element are reported.
+        
         Returns:
-            List of overlapping element pairs with overlap details
+            List of overlapping element pairs with overlap details, ordered by
+            the document order of the first and then the second element
         """
+        columns = self.columns
+        indices = np.nonzero(columns.has_bbox())[0]
+        if len(indices) < 2:
+            return []
+
+        boxes = columns.boxes()[indices]
+        parents = columns.table['parent'][indices]
+        first, second = _sweep_pairs(boxes)
+
+        # Order each pair by document position, as the element1/element2 fields expect
+        first, second = np.minimum(first, second), np.maximum(first, second)
+        keep = ((parents[first] != parents[second]) &
+                (boxes[first, 0] < boxes[second, 2]) & (boxes[first, 2] > boxes[second, 0]) &
+                (boxes[first, 1] < boxes[second, 3]) & (boxes[first, 3] > boxes[second, 1]))
+        first, second = first[keep], second[keep]
+        b1, b2 = boxes[first], boxes[second]
+
+        overlap_width = np.minimum(b1[:, 2], b2[:, 2]) - np.maximum(b1[:, 0], b2[:, 0])
+        overlap_height = np.minimum(b1[:, 3], b2[:, 3]) - np.maximum(b1[:, 1], b2[:, 1])
+        overlap_area = overlap_width * overlap_height
+        smaller_area = np.minimum((b1[:, 2] - b1[:, 0]) * (b1[:, 3] - b1[:, 1]),
+                                  (b2[:, 2] - b2[:, 0]) * (b2[:, 3] - b2[:, 1]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage = np.where(smaller_area > 0, (overlap_area / smaller_area) * 100, 0.0)
+
+        significant = np.nonzero(percentage > 10)[0]  # Only report significant overlaps
+        significant = significant[np.lexsort((second[significant], first[significant]))]
+
         overlaps = []
-        
-        for i, elem1 in enumerate(self.elements):
-            bbox1 = elem1.get('bbox', {})
-            if not bbox1 or 'x1' not in bbox1:
-                continue
-                
-            for j, elem2 in enumerate(self.elements[i+1:], i+1):
-                # Skip elements with the same parent
-                if elem1.get('parent_id') == elem2.get('parent_id'):
-                    continue
-                    
-                bbox2 = elem2.get('bbox', {})
-                if not bbox2 or 'x1' not in bbox2:
-                    continue
-                
-                # Check for overlap
-                if (bbox1['x1'] < bbox2['x2'] and bbox1['x2'] > bbox2['x1'] and
-                    bbox1['y1'] < bbox2['y2'] and bbox1['y2'] > bbox2['y1']):
-                    
-                    # Calculate overlap area
-                    overlap_width = min(bbox1['x2'], bbox2['x2']) - max(bbox1['x1'], bbox2['x1'])
-                    overlap_height = min(bbox1['y2'], bbox2['y2']) - max(bbox1['y1'], bbox2['y1'])
-                    overlap_area = overlap_width * overlap_height
-                    
-                    # Calculate percentage of smaller element
-                    area1 = (bbox1['x2'] - bbox1['x1']) * (bbox1['y2'] - bbox1['y1'])
-                    area2 = (bbox2['x2'] - bbox2['x1']) * (bbox2['y2'] - bbox2['y1'])
-                    smaller_area = min(area1, area2)
-                    overlap_percentage = (overlap_area / smaller_area) * 100 if smaller_area > 0 else 0
-                    
-                    if overlap_percentage > 10:  # Only report significant overlaps
-                        overlaps.append({
-                            'element1': elem1.get('id', f"element-{i}"),
-                            'element2': elem2.get('id', f"element-{j}"),
-                            'overlap_percentage': overlap_percentage,
-                            'severity': 'high' if overlap_percentage > 50 else 'medium'
-                        })
+        for k in significant:
+            i, j = int(indices[first[k]]), int(indices[second[k]])
+            overlap_percentage = float(percentage[k])
+            overlaps.append({
+                'element1': self.elements[i].get('id', f"element-{i}"),
+                'element2': self.elements[j].get('id', f"element-{j}"),
+                'overlap_percentage': overlap_percentage,
+                'severity': 'high' if overlap_percentage > 50 else 'medium'
+            })
         
         return overlaps
     
+    @_memoized
     def analyze_layout(self) -> Dict:
         """
         Analyze layout organization and quadrant distribution.
@@ -189,24 +453,18 @@ class SVGCritic:
             'q4': {'x1': 0, 'y1': self.height/2, 'x2': self.width/2, 'y2': self.height}
         }
         
-        # Count elements in each quadrant
-        quadrant_counts = {q: 0 for q in quadrants}
-        
-        for elem in self.elements:
-            bbox = elem.get('bbox', {})
-            if not bbox or 'x1' not in bbox:
-                continue
-                
-            # Find center point of element
-            center_x = (bbox['x1'] + bbox['x2']) / 2
-            center_y = (bbox['y1'] + bbox['y2']) / 2
-            
-            # Determine quadrant
-            for q, q_bbox in quadrants.items():
-                if (q_bbox['x1'] <= center_x <= q_bbox['x2'] and 
-                    q_bbox['y1'] <= center_y <= q_bbox['y2']):
-                    quadrant_counts[q] += 1
-                    break
+        # Count elements by the quadrant holding their center; a center on a
+        # shared border belongs to the first matching quadrant in q1..q4 order
+        table = self.columns.table
+        center_x = (table['x1'] + table['x2']) / 2
+        center_y = (table['y1'] + table['y2']) / 2
+        assigned = np.full(len(table), -1)
+        for q, q_bbox in enumerate(quadrants.values()):
+            inside = ((q_bbox['x1'] <= center_x) & (center_x <= q_bbox['x2']) &
+                      (q_bbox['y1'] <= center_y) & (center_y <= q_bbox['y2']))
+            assigned[inside & (assigned < 0)] = q
+        counts = np.bincount(assigned[assigned >= 0], minlength=len(quadrants))
+        quadrant_counts = {q: int(count) for q, count in zip(quadrants, counts)}
         
         # Calculate balance score (0-100)
         total_elements = sum(quadrant_counts.values())
@@ -242,6 +500,7 @@ class SVGCritic:
         
         return suggestions
     
+    @_memoized
     def analyze_color_harmony(self) -> Dict:
         """
         Analyze color palette for harmony and consistency.
@@ -278,6 +537,7 @@ class SVGCritic:
             'suggestions': suggestions
         }
     
+    @_memoized
     def analyze_visual_hierarchy(self) -> Dict:
         """
         Analyze visual hierarchy based on size relationships.
@@ -286,31 +546,21 @@ class SVGCritic:
             Dictionary with hierarchy analysis metrics
         """
         # Collect size information
-        sizes = []
-        for elem in self.elements:
-            bbox = elem.get('bbox', {})
-            if not bbox or 'x1' not in bbox:
-                continue
-                
-            width = bbox['x2'] - bbox['x1']
-            height = bbox['y2'] - bbox['y1']
-            area = width * height
-            
-            if area > 0:
-                sizes.append(area)
+        table = self.columns.table
+        areas = (table['x2'] - table['x1']) * (table['y2'] - table['y1'])
+        sizes = np.sort(areas[areas > 0])
         
-        if not sizes:
+        if not len(sizes):
             return {
                 'score': 0,
                 'suggestions': ["Not enough measurable elements to analyze hierarchy"]
             }
         
         # Calculate size variety
-        sizes.sort()
         if len(sizes) < 2:
             size_ratio = 1
         else:
-            size_ratio = sizes[-1] / sizes[0]  # Largest to smallest ratio
+            size_ratio = float(sizes[-1] / sizes[0])  # Largest to smallest ratio
         
         # Score based on ratio (ideally around 10-20x difference between largest and smallest)
         if size_ratio < 5:
@@ -329,6 +579,7 @@ class SVGCritic:
             'suggestions': [suggestion]
         }
 
+    @_memoized
     def analyze_accessibility(self) -> Dict:
         """
         Analyze for accessibility concerns.
@@ -379,6 +630,7 @@ class SVGCritic:
             'suggestions': suggestions
         }
 
+    @_memoized
     def suggest_code_improvements(self) -> List[Dict]:
         """
         Suggest specific code changes to improve the SVG.
@@ -400,7 +652,7 @@ class SVGCritic:
             })
         
         # Check for overlaps and suggest fixes
-        overlaps = self.detect_overlaps()
+        overlaps = self.overlaps
         for overlap in overlaps:
             elem1 = overlap['element1']
             elem2 = overlap['element2']
@@ -414,82 +666,50 @@ class SVGCritic:
         
         # Check for elements near edges
         edge_buffer = 20  # pixels
-        for i, elem in enumerate(self.elements):
-            bbox = elem.get('bbox', {})
-            if not bbox or 'x1' not in bbox:
-                continue
-                
-            # Check if element is very close to SVG edge
-            if (bbox['x1'] < edge_buffer or 
-                bbox['y1'] < edge_buffer or 
-                bbox['x2'] > self.width - edge_buffer or 
-                bbox['y2'] > self.height - edge_buffer):
-                
-                elem_id = elem.get('id', f"element-{i}")
-                suggestions.append({
-                    'type': 'position',
-                    'elements': [elem_id],
-                    'issue': f"Element {elem_id} is too close to SVG edge",
-                    'suggestion': f"Move {elem_id} inward to maintain proper margin"
-                })
+        table = self.columns.table
+        near_edge = ((table['x1'] < edge_buffer) | (table['y1'] < edge_buffer) |
+                     (table['x2'] > self.width - edge_buffer) | (table['y2'] > self.height - edge_buffer))
+        for i in np.nonzero(near_edge)[0]:
+            elem_id = self.elements[i].get('id', f"element-{i}")
+            suggestions.append({
+                'type': 'position',
+                'elements': [elem_id],
+                'issue': f"Element {elem_id} is too close to SVG edge",
+                'suggestion': f"Move {elem_id} inward to maintain proper margin"
+            })
         
         return suggestions
     
-    def evaluate(self) -> Dict:
+    def evaluate(self, rules: Optional[List[str]] = None) -> Dict:
         """
-        Perform full evaluation of the SVG.
+        Perform full evaluation of the SVG, or of selected rules.
         
-        Returns:
-            Dictionary with complete evaluation results
-        """
-        # Analyze various aspects
-        overlaps = self.detect_overlaps()
-        layout = self.analyze_layout()
-        color_harmony = self.analyze_color_harmony()
-        visual_hierarchy = self.analyze_visual_hierarchy()
-        accessibility = self.analyze_accessibility()
-        code_improvements = self.suggest_code_improvements()
-        
-        # Calculate overall score (weighted average)
-        weights = {
-            'overlaps': 0.25,
-            'layout': 0.20,
-            'color_harmony': 0.15,
-            'visual_hierarchy': 0.20,
-            'accessibility': 0.20
-        }
+        The analyzers run as registered rules (see rules.py); only the
+        shared precomputations the selected rules need are built.
         
-        # Convert overlap count to a score (0-100)
-        overlap_score = 100 - min(100, len(overlaps) * 20)
-        
-        # Weighted score calculation
-        overall_score = (
-            weights['overlaps'] * overlap_score +
-            weights['layout'] * layout['balance_score'] +
-            weights['color_harmony'] * color_harmony['palette_adherence'] +
-            weights['visual_hierarchy'] * visual_hierarchy['score'] +
-            weights['accessibility'] * accessibility['score']
-        )
-        
-        # Round to nearest integer
-        overall_score = round(overall_score)
+        Args:
+            rules: Rule names to run, e.g. ['overlaps', 'color_harmony']
+                (default: all). Rules they depend on run too.
         
-        return {
-            'overall_score': overall_score,
-            'critical_issues': [
-                {
-                    'type': 'overlap', 
-                    'elements': [o['element1'], o['element2']], 
-                    'severity': o['severity']
-                } 
-                for o in overlaps
-            ],
-            'layout_assessment': layout,
-            'color_harmony': color_harmony,
-            'visual_hierarchy': visual_hierarchy,
-            'accessibility': accessibility,
-            'suggested_code_changes': code_improvements
+        Returns:
+            Dictionary with the overall score (weighted average of the rules
+            that ran), each rule's result under its report key, and under
+            'rules' each rule's score, weight and run time in seconds, with
+            'precomputations' timing the shared steps
+        """
+        run = RuleEngine(self).run(rules)
+        results = run['rules']
+        
+        evaluation = {'overall_score': overall_score(results)}
+        for name, entry in results.items():
+            rule = RULES[name]
+            evaluation[rule.key] = rule.report(entry['result']) if rule.report else entry['result']
+        evaluation['rules'] = {
+            name: {'score': entry['score'], 'weight': entry['weight'], 'seconds': round(entry['seconds'], 6)}
+            for name, entry in results.items()
         }
+        evaluation['precomputations'] = {name: round(seconds, 6) for name, seconds in run['precomputations'].items()}
+        return evaluation
 
 
 def generate_human_readable_report(evaluation: Dict) -> str:
@@ -510,64 +730,69 @@ def generate_human_readable_report(evaluation: Dict) -> str:
     ]
     
     # Critical issues
-    if evaluation['critical_issues']:
-        report.append("## Critical Issues")
-        for issue in evaluation['critical_issues']:
-            report.append(f"- **{issue['severity'].upper()}**: Overlap between elements {' and '.join(issue['elements'])}")
-        report.append("")
-    else:
-        report.append("## Critical Issues\nNo critical issues detected! 👍\n")
+    if 'critical_issues' in evaluation:
+        if evaluation['critical_issues']:
+            report.append("## Critical Issues")
+            for issue in evaluation['critical_issues']:
+                report.append(f"- **{issue['severity'].upper()}**: Overlap between elements {' and '.join(issue['elements'])}")
+            report.append("")
+        else:
+            report.append("## Critical Issues\nNo critical issues detected! 👍\n")
     
     # Layout assessment
-    report.append("## Layout Assessment")
-    report.append(f"- **Balance Score**: {evaluation['layout_assessment']['balance_score']:.1f}/100")
-    report.append("- **Quadrant Distribution**:")
-    for q, count in evaluation['layout_assessment']['quadrant_distribution'].items():
-        report.append(f"  - {q.upper()}: {count} elements")
-    
-    if evaluation['layout_assessment']['suggestions']:
-        report.append("- **Suggestions**:")
-        for suggestion in evaluation['layout_assessment']['suggestions']:
-            report.append(f"  - {suggestion}")
-    report.append("")
+    if 'layout_assessment' in evaluation:
+        report.append("## Layout Assessment")
+        report.append(f"- **Balance Score**: {evaluation['layout_assessment']['balance_score']:.1f}/100")
+        report.append("- **Quadrant Distribution**:")
+        for q, count in evaluation['layout_assessment']['quadrant_distribution'].items():
+            report.append(f"  - {q.upper()}: {count} elements")
+        
+        if evaluation['layout_assessment']['suggestions']:
+            report.append("- **Suggestions**:")
+            for suggestion in evaluation['layout_assessment']['suggestions']:
+                report.append(f"  - {suggestion}")
+        report.append("")
     
     # Color harmony
-    report.append("## Color Harmony")
-    report.append(f"- **Unique Colors**: {evaluation['color_harmony']['unique_colors']}")
-    report.append(f"- **Palette Adherence**: {evaluation['color_harmony']['palette_adherence']:.1f}%")
-    
-    if evaluation['color_harmony']['suggestions']:
-        report.append("- **Suggestions**:")
-        for suggestion in evaluation['color_harmony']['suggestions']:
-            report.append(f"  - {suggestion}")
-    report.append("")
+    if 'color_harmony' in evaluation:
+        report.append("## Color Harmony")
+        report.append(f"- **Unique Colors**: {evaluation['color_harmony']['unique_colors']}")
+        report.append(f"- **Palette Adherence**: {evaluation['color_harmony']['palette_adherence']:.1f}%")
+        
+        if evaluation['color_harmony']['suggestions']:
+            report.append("- **Suggestions**:")
+            for suggestion in evaluation['color_harmony']['suggestions']:
+                report.append(f"  - {suggestion}")
+        report.append("")
     
     # Visual hierarchy
-    report.append("## Visual Hierarchy")
-    report.append(f"- **Score**: {evaluation['visual_hierarchy']['score']}/100")
-    if 'size_ratio' in evaluation['visual_hierarchy']:
-        report.append(f"- **Size Ratio (largest:smallest)**: {evaluation['visual_hierarchy']['size_ratio']:.1f}x")
-    
-    if evaluation['visual_hierarchy']['suggestions']:
-        report.append("- **Suggestions**:")
-        for suggestion in evaluation['visual_hierarchy']['suggestions']:
-            report.append(f"  - {suggestion}")
-    report.append("")
+    if 'visual_hierarchy' in evaluation:
+        report.append("## Visual Hierarchy")
+        report.append(f"- **Score**: {evaluation['visual_hierarchy']['score']}/100")
+        if 'size_ratio' in evaluation['visual_hierarchy']:
+            report.append(f"- **Size Ratio (largest:smallest)**: {evaluation['visual_hierarchy']['size_ratio']:.1f}x")
+        
+        if evaluation['visual_hierarchy']['suggestions']:
+            report.append("- **Suggestions**:")
+            for suggestion in evaluation['visual_hierarchy']['suggestions']:
+                report.append(f"  - {suggestion}")
+        report.append("")
     
     # Accessibility
-    report.append("## Accessibility")
-    report.append(f"- **Score**: {evaluation['accessibility']['score']:.1f}/100")
-    report.append(f"- **Font Size Score**: {evaluation['accessibility']['font_size_score']:.1f}/100")
-    report.append(f"- **Contrast Issues**: {evaluation['accessibility']['contrast_issues']}")
-    
-    if evaluation['accessibility']['suggestions']:
-        report.append("- **Suggestions**:")
-        for suggestion in evaluation['accessibility']['suggestions']:
-            report.append(f"  - {suggestion}")
-    report.append("")
+    if 'accessibility' in evaluation:
+        report.append("## Accessibility")
+        report.append(f"- **Score**: {evaluation['accessibility']['score']:.1f}/100")
+        report.append(f"- **Font Size Score**: {evaluation['accessibility']['font_size_score']:.1f}/100")
+        report.append(f"- **Contrast Issues**: {evaluation['accessibility']['contrast_issues']}")
+        
+        if evaluation['accessibility']['suggestions']:
+            report.append("- **Suggestions**:")
+            for suggestion in evaluation['accessibility']['suggestions']:
+                report.append(f"  - {suggestion}")
+        report.append("")
     
     # Suggested code changes
-    if evaluation['suggested_code_changes']:
+    if evaluation.get('suggested_code_changes'):
         report.append("## Suggested Code Improvements")
         for suggestion in evaluation['suggested_code_changes']:
             report.append(f"- **{suggestion['type'].title()}**: {suggestion['issue']}")
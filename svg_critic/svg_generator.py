@@ -6,6 +6,7 @@ This module handles the generation of initial SVG designs based on text prompts.
 """
 
 import os
+import sys
 import json
 import requests
 from pathlib import Path
@@ -21,6 +22,12 @@ try:
 except ImportError:
     pass
 
+# The library context needs the bioicons package (the repository root on the path)
+try:
+    from bioicons.library import default_library
+except ImportError:
+    default_library = None
+
 # API Constants
 DEFAULT_MODEL = "claude-3-7-sonnet-20250219"
 API_ENDPOINT = "https://api.anthropic.com/v1/messages"
@@ -163,6 +170,7 @@ class SVGGenerator:
         # Detect topics in the user prompt to provide more targeted guidance
         topics = self._detect_topics(user_prompt)
         topic_guidance = self._get_topic_specific_guidance(topics)
+        library_context = self._get_library_context()
         
         prompt = f"""
 You are an expert SVG designer specializing in scientific and biotechnology diagrams for the Bioicons project. Create a complete, standalone SVG diagram based on this request:
@@ -176,6 +184,8 @@ You are generating SVGs for the Bioicons project, which is an open-source librar
 2. Scientific category (Cell_types, Genetics, Nucleic_acids, etc.)
 3. Author name
 
+{library_context}
+
 {topic_guidance}
 
 When appropriate, REUSE existing concepts and design patterns from these icons as building blocks in your new design. Common patterns include:
@@ -340,6 +350,31 @@ Create a professional, scientifically accurate SVG suitable for research publica
             
         return "\n\n".join(guidance)
     
+    def _get_library_context(self):
+        """
+        List the categories actually present in the Bioicons library.
+        
+        Returns:
+            String with each category, its icon count and a few example icon names,
+            or an empty string if the library index is not available
+        """
+        if default_library is None:
+            return ""
+        
+        try:
+            library = default_library()
+            categories = library.categories()
+        except (OSError, ValueError):
+            return ""
+        
+        lines = ["Categories currently in the library (icon count: example icons):"]
+        for category in categories:
+            icons = library.find(category=category)
+            examples = ", ".join(sorted({icon["name"] for icon in icons})[:5])
+            lines.append(f"- {category} ({len(icons)}: {examples})")
+        
+        return "\n".join(lines)
+    
     def _extract_svg_code(self, response_text):
         """
         Extract SVG code from Claude's response.
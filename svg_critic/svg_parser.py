@@ -0,0 +1,120 @@
+"""
+SVG Parser - XML parsing backend shared by SVGCritic and VisualSVGCritic.
+
+Two interchangeable backends return ElementTree-compatible trees:
+
+- "lxml": libxml2 parsing and C-level iteration, with multi-tag filtering
+  inside iter(). The parser options (huge_tree, no comments or processing
+  instructions) are those of bioicons.xmlparse, shared with the icon library.
+- "etree": the standard library's xml.etree.ElementTree, used when lxml is
+  not installed.
+
+The SVG namespaces are registered once here for both critics.
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+try:
+    from lxml import etree as LET
+except ImportError:
+    LET = None
+
+try:
+    from bioicons.xmlparse import PARSER_OPTIONS, xml_parser
+except ImportError:
+    # Run as a script from svg_critic/: the bioicons package lives at the repository root
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from bioicons.xmlparse import PARSER_OPTIONS, xml_parser
+
+# Define namespaces for parsing SVG
+NAMESPACES = {
+    'svg': 'http://www.w3.org/2000/svg',
+    'xlink': 'http://www.w3.org/1999/xlink',
+    'inkscape': 'http://www.inkscape.org/namespaces/inkscape',
+    'sodipodi': 'http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd'
+}
+
+SVG_NS = '{%s}' % NAMESPACES['svg']
+
+BACKENDS = ('lxml', 'etree')
+
+# Register namespaces for ElementTree (and lxml, which keeps its own registry).
+# SVG is written as the default namespace, as bioicons does; the registry is
+# process-wide, so a prefix here would also change bioicons' output.
+for prefix, uri in NAMESPACES.items():
+    ET.register_namespace('' if prefix == 'svg' else prefix, uri)
+    if LET is not None and prefix != 'svg':
+        LET.register_namespace(prefix, uri)
+
+
+def have_lxml() -> bool:
+    """Check whether the lxml backend is available."""
+    return LET is not None
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """
+    Return the backend to use: the one requested, or lxml when installed.
+
+    Raises:
+        ValueError: If the backend is unknown or lxml is requested but missing
+    """
+    if backend is None:
+        return 'lxml' if have_lxml() else 'etree'
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend} (expected one of {', '.join(BACKENDS)})")
+    if backend == 'lxml' and not have_lxml():
+        raise ValueError("The lxml parser backend requires lxml (pip install lxml)")
+    return backend
+
+
+def parse(path: str, backend: Optional[str] = None):
+    """
+    Parse an SVG file.
+
+    Args:
+        path: SVG file
+        backend: "lxml" or "etree" (default: lxml when installed)
+
+    Returns:
+        ElementTree of the chosen backend
+    """
+    if resolve_backend(backend) == 'lxml':
+        return LET.parse(path, xml_parser())
+    return ET.parse(path)
+
+
+def iterparse(path: str, events: Tuple[str, ...] = ('start', 'end'),
+              backend: Optional[str] = None) -> Iterator:
+    """
+    Incrementally parse an SVG file, yielding (event, element) pairs.
+
+    Elements are those of the chosen backend; callers may clear and detach
+    them once their end event has been handled.
+    """
+    if resolve_backend(backend) == 'lxml':
+        return LET.iterparse(path, events=events, **PARSER_OPTIONS)
+    return ET.iterparse(path, events=events)
+
+
+def iter_tags(root, *tags: str) -> Iterator:
+    """
+    Iterate over root and its descendants with any of the given qualified tags.
+
+    lxml filters all tags in C; ElementTree only filters one tag natively,
+    so several tags are matched in Python.
+    """
+    if LET is not None and isinstance(root, LET._Element):
+        return root.iter(*tags)
+    if len(tags) == 1:
+        return root.iter(tags[0])
+    wanted = set(tags)
+    return (elem for elem in root.iter() if elem.tag in wanted)
+
+
+def local_name(tag: str) -> str:
+    """Tag without its namespace prefix."""
+    return tag.split('}')[-1]
@@ -0,0 +1,39 @@
+"""pytest setup: the critic modules are imported flat, as the scripts here do, and a shared diagram."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Command-line scripts rather than pytest tests; they need API keys or local
+# diagrams and are run directly
+collect_ignore = [
+    "check_api_key.py",
+    "test_all.py",
+    "test_api_key.py",
+    "test_claude_api.py",
+    "test_svg_critic.py",
+    "test_with_key.py",
+]
+
+DIAGRAM = """<svg xmlns="http://www.w3.org/2000/svg" width="200" height="200">
+  <g id="left"><rect id="a" x="30" y="30" width="60" height="60" fill="#19aeff"/></g>
+  <g id="right" transform="translate(10 0)">
+    <rect id="b" x="40" y="50" width="60" height="60" fill="#ff4141" stroke="#333333"/>
+    <circle id="c" cx="140" cy="150" r="10" fill="#ffc022"/>
+    <text x="5" y="5" font-size="8">label</text>
+  </g>
+  <path d="M120 30 L170 30 L170 60 Z" fill="none" stroke="#5dbb63"/>
+  <ellipse id="e" cx="100" cy="190" rx="30" ry="5" fill="#ff4141"/>
+</svg>
+"""
+
+
+@pytest.fixture
+def diagram(tmp_path):
+    """Path of a small diagram with two overlapping rects in different groups."""
+    path = tmp_path / "diagram.svg"
+    path.write_text(DIAGRAM)
+    return str(path)
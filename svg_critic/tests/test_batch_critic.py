@@ -0,0 +1,98 @@
+import json
+import os
+import sys
+
+import pytest
+
+from batch_critic import _open_for_append, collect_files, load_done, main, run_batch
+
+
+def lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.fixture
+def files(tmp_path, diagram):
+    """Two good SVGs and a broken one, in nested directories."""
+    good = open(diagram).read()
+    (tmp_path / "icons" / "sub").mkdir(parents=True)
+    paths = [tmp_path / "icons" / "a.svg", tmp_path / "icons" / "sub" / "b.SVG", tmp_path / "icons" / "broken.svg"]
+    paths[0].write_text(good)
+    paths[1].write_text(good)
+    paths[2].write_text("<svg")
+    (tmp_path / "icons" / "notes.txt").write_text("not an svg")
+    return [str(path) for path in paths]
+
+
+def test_collect_files(files, tmp_path):
+    root = tmp_path / "icons"
+    assert collect_files([str(root)]) == sorted(files)
+    # Globs, explicit files and duplicates
+    assert collect_files([str(root / "*.svg"), files[1], str(root / "sub" / ".." / "a.svg")]) == sorted(files)
+    assert collect_files([str(root / "**" / "*.SVG")]) == [files[1]]
+    assert collect_files([str(root / "notes.txt"), str(tmp_path / "missing")]) == [str(root / "notes.txt")]
+
+
+def test_load_done(tmp_path):
+    output = tmp_path / "critic.jsonl"
+    assert load_done(str(output)) == set()
+    output.write_text(
+        json.dumps({"file": "a.svg", "evaluation": {}}) + "\n" +
+        json.dumps({"file": "b.svg", "error": "ParseError"}) + "\n" +
+        "[1, 2]\n" +
+        '{"file": "c.svg", "evalu')
+    # Paths are made absolute, and torn or foreign lines are skipped
+    assert load_done(str(output)) == {os.path.abspath("a.svg"), os.path.abspath("b.svg")}
+    assert load_done(str(output), retry_errors=True) == {os.path.abspath("a.svg")}
+
+
+def test_open_for_append_after_torn_line(tmp_path):
+    output = tmp_path / "out" / "critic.jsonl"
+    with _open_for_append(str(output)) as f:
+        f.write('{"file": "a.svg"}\n{"file": "b.s')
+    with _open_for_append(str(output)) as f:
+        f.write('{"file": "c.svg"}\n')
+    assert output.read_text().splitlines() == ['{"file": "a.svg"}', '{"file": "b.s', '{"file": "c.svg"}']
+    # A complete last line is not followed by a blank one
+    with _open_for_append(str(output)) as f:
+        pass
+    assert output.read_text().count("\n") == 3
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_batch(files, tmp_path, jobs):
+    output = tmp_path / "critic.jsonl"
+    counts = run_batch(files, str(output), jobs=jobs, quiet=True, rules=["overlaps"])
+    assert counts == {"evaluated": 2, "failed": 1}
+    records = {record["file"]: record for record in lines(output)}
+    assert set(records) == set(files)
+    # The message depends on the XML backend
+    assert "evaluation" not in records[files[2]] and records[files[2]]["error"]
+    assert set(records[files[0]]["evaluation"]["rules"]) == {"overlaps"}
+    assert records[files[0]]["seconds"] >= 0
+
+
+def test_main_resumes(files, tmp_path, monkeypatch):
+    output = tmp_path / "critic.jsonl"
+    # An earlier run evaluated a.svg and was cut off while writing the next line
+    run_batch(files[:1], str(output), quiet=True)
+    with open(output, "a") as f:
+        f.write('{"file": "%s", "eval' % files[1])
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["batch_critic.py", str(tmp_path / "icons"), "-o", str(output),
+                                          "-j", "1", "-q", *args])
+        return main()
+
+    def recorded():
+        text = output.read_text().splitlines()
+        return [json.loads(line)["file"] for line in text[:1] + text[2:]]
+
+    assert run() == 0
+    assert recorded() == [files[0], files[2], files[1]]
+    assert run() == 0
+    assert len(recorded()) == 3
+    # Only the failed file is evaluated again
+    assert run("--retry-errors") == 0
+    assert recorded()[3:] == [files[2]]
+    assert run("--rules", "nope") == 1
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from element_store import TYPE_NAMES, ElementStore
+from svg_critic import SVGCritic
+
+COLORS = ["#19aeff", "#ff4141", "none", "red", None]
+
+
+def element(i, bbox, elem_type="rect", parent="g0", **attributes):
+    return {"id": f"e{i}", "type": elem_type, "attributes": {k: v for k, v in attributes.items() if v},
+            "parent_id": parent, "bbox": bbox}
+
+
+def random_elements(seed, n=200):
+    rng = np.random.default_rng(seed)
+    elements = []
+    for i in range(n):
+        x, y = rng.uniform(-50, 800, 2)
+        w, h = rng.choice([0.0, 3.0, 40.0, 200.0], 2)
+        bbox = {"x1": x, "y1": y, "x2": x + w, "y2": y + h} if rng.random() > 0.1 else {}
+        elements.append(element(i, bbox, str(rng.choice(TYPE_NAMES)), f"g{rng.integers(5)}",
+                                fill=COLORS[rng.integers(len(COLORS))], stroke=COLORS[rng.integers(len(COLORS))]))
+    return elements
+
+
+def measured(elements):
+    return [(i, e["bbox"]) for i, e in enumerate(elements) if e.get("bbox") and "x1" in e["bbox"]]
+
+
+def test_store_columns():
+    elements = [
+        element(0, {"x1": 1, "y1": 2, "x2": 3, "y2": 4}, fill="red"),
+        element(1, {}, "star", parent=None, fill="blue", stroke="red"),
+        element(2, {"x1": 0, "y1": 0, "x2": 5, "y2": 5}, "circle", fill="red"),
+    ]
+    store = ElementStore(elements)
+    assert len(store) == 3
+    assert store.has_bbox().tolist() == [True, False, True]
+    assert store.boxes()[0].tolist() == [1, 2, 3, 4]
+    # Unknown types get codes after the built-in ones
+    assert store.types[store.table["type"][1]] == "star"
+    assert store.type_mask("rect", "star").tolist() == [True, True, False]
+    assert [store.parents[code] for code in store.table["parent"]] == ["g0", None, "g0"]
+
+    fill = store.attribute("fill")
+    assert store.attribute("fill") is fill
+    assert fill.counts() == {"red": 2, "blue": 1}
+    assert fill.mask(["blue", "green"]).tolist() == [False, True, False]
+    assert store.attribute("stroke").codes.tolist() == [-1, 0, -1]
+    assert store.attribute("opacity").counts() == {}
+
+
+def test_empty_store():
+    store = ElementStore([])
+    assert len(store) == 0 and store.boxes().shape == (0, 4)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_metrics_match_element_loops(diagram, seed):
+    critic = SVGCritic(diagram)
+    critic.elements = elements = random_elements(seed)
+    boxes = measured(elements)
+
+    palette = {}
+    for e in elements:
+        for name in ("fill", "stroke"):
+            color = e["attributes"].get(name)
+            if color and color != "none":
+                palette[color] = palette.get(color, 0) + 1
+    assert critic.color_palette == palette
+
+    quadrants = [(0, 0, 100, 100), (100, 0, 200, 100), (100, 100, 200, 200), (0, 100, 100, 200)]
+    counts = [0, 0, 0, 0]
+    for _, b in boxes:
+        cx, cy = (b["x1"] + b["x2"]) / 2, (b["y1"] + b["y2"]) / 2
+        for q, (x1, y1, x2, y2) in enumerate(quadrants):
+            if x1 <= cx <= x2 and y1 <= cy <= y2:
+                counts[q] += 1
+                break
+    assert list(critic.layout["quadrant_distribution"].values()) == counts
+
+    areas = sorted(a for a in ((b["x2"] - b["x1"]) * (b["y2"] - b["y1"]) for _, b in boxes) if a > 0)
+    assert critic.visual_hierarchy["size_ratio"] == pytest.approx(areas[-1] / areas[0])
+
+    near_edge = [f"e{i}" for i, b in boxes
+                 if b["x1"] < 20 or b["y1"] < 20 or b["x2"] > 180 or b["y2"] > 180]
+    found = [s["elements"][0] for s in critic.code_improvements if s["issue"].endswith("too close to SVG edge")]
+    assert found == near_edge
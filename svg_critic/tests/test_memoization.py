@@ -0,0 +1,65 @@
+import sys
+
+import pytest
+
+from svg_critic import SVGCritic
+
+# svg_critic is the flat module, or the package when collected together with the bioicons tests
+_memoized = sys.modules[SVGCritic.__module__]._memoized
+
+ANALYSES = ["overlaps", "layout", "color_harmony", "visual_hierarchy", "accessibility", "code_improvements"]
+
+
+@pytest.mark.parametrize("name", ANALYSES)
+def test_analyses_are_computed_once(diagram, name):
+    critic = SVGCritic(diagram)
+    assert critic._analyses == {}
+    result = getattr(critic, name)
+    assert getattr(critic, name) is result
+    # The property and the method share one cached result
+    method = {"overlaps": "detect_overlaps", "layout": "analyze_layout",
+              "code_improvements": "suggest_code_improvements"}.get(name, f"analyze_{name}")
+    assert getattr(critic, method)() is result
+
+
+def test_evaluate_reuses_cached_analyses(diagram, monkeypatch):
+    critic = SVGCritic(diagram)
+    calls = []
+    detect = SVGCritic.detect_overlaps.__wrapped__
+
+    def detect_overlaps(self):
+        calls.append(1)
+        return detect(self)
+    monkeypatch.setattr(SVGCritic, "detect_overlaps", _memoized(detect_overlaps))
+
+    first = critic.evaluate()
+    # code_improvements reuses the overlap detection of the overlaps rule
+    assert len(calls) == 1
+    second = critic.evaluate()
+    assert len(calls) == 1
+    assert second["critical_issues"] == first["critical_issues"]
+    assert second["suggested_code_changes"] == first["suggested_code_changes"]
+
+
+def test_invalidate_after_in_place_changes(diagram):
+    critic = SVGCritic(diagram)
+    assert [(o["element1"], o["element2"]) for o in critic.overlaps] == [("a", "b")]
+    columns = critic.columns
+
+    # Move b away from a: the cached results are stale until invalidate()
+    critic.elements[1]["bbox"] = {"x1": 150, "y1": 100, "x2": 190, "y2": 140}
+    assert len(critic.overlaps) == 1 and critic.columns is columns
+    critic.invalidate()
+    assert critic.overlaps == []
+    assert critic.columns is not columns
+
+
+def test_assigning_elements_clears_the_cache(diagram):
+    critic = SVGCritic(diagram)
+    palette = critic.color_palette
+    assert palette["#ff4141"] == 2
+    critic.elements = [e for e in critic.elements if e["id"] != "e"]
+    assert critic.color_palette is not palette
+    assert critic.color_palette["#ff4141"] == 1
+    # Other critics of the same file keep their own caches
+    assert SVGCritic(diagram).color_palette == palette
@@ -0,0 +1,86 @@
+import sys
+
+import numpy as np
+import pytest
+
+from svg_critic import SVGCritic
+
+# svg_critic is the flat module, or the package when collected together with the bioicons tests
+_sweep_pairs = sys.modules[SVGCritic.__module__]._sweep_pairs
+
+
+def brute_force_pairs(boxes):
+    """Every pair of boxes with overlapping interiors, as (i, j) with i < j."""
+    pairs = set()
+    for i in range(len(boxes)):
+        for j in range(i + 1, len(boxes)):
+            a, b = boxes[i], boxes[j]
+            if a[0] < b[2] and a[2] > b[0] and a[1] < b[3] and a[3] > b[1]:
+                pairs.add((i, j))
+    return pairs
+
+
+def sweep_pairs(boxes, **kwargs):
+    first, second = _sweep_pairs(np.asarray(boxes, dtype=float), **kwargs)
+    pairs = [(min(i, j), max(i, j)) for i, j in zip(first.tolist(), second.tolist())]
+    assert len(pairs) == len(set(pairs)), "a pair was reported twice"
+    return set(pairs)
+
+
+def random_boxes(rng, n, column=False):
+    x = rng.uniform(0, 20 if column else 500, n)
+    y = rng.uniform(0, 500, n)
+    # Mostly small boxes, some tall ones spanning many bands, some degenerate
+    width = rng.choice([0.0, 5.0, 30.0, 120.0], n, p=[0.05, 0.45, 0.4, 0.1])
+    height = rng.choice([0.0, 5.0, 30.0, 300.0], n, p=[0.05, 0.45, 0.4, 0.1])
+    return np.stack([x, y, x + width, y + height], axis=1)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("column", [False, True])
+def test_sweep_candidates_cover_all_overlaps(seed, column):
+    boxes = random_boxes(np.random.default_rng(seed), 300, column)
+    expected = brute_force_pairs(boxes)
+    # Candidates may include touching pairs, which detect_overlaps filters out
+    assert expected <= sweep_pairs(boxes)
+    assert expected <= sweep_pairs(boxes, block=7)
+
+
+def test_sweep_single_band():
+    boxes = [[0, 0, 10, 0], [5, 0, 15, 0], [20, 0, 30, 0]]
+    assert sweep_pairs(boxes) == {(0, 1)}
+
+
+def test_detect_overlaps_matches_all_pairs(tmp_path):
+    rng = np.random.default_rng(7)
+    lines = ['<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 600 600">']
+    for g in range(40):
+        lines.append(f'<g id="g{g}">')
+        for k in range(3):
+            x, y, w, h = rng.uniform(0, 500), rng.uniform(0, 500), rng.uniform(5, 80), rng.uniform(5, 80)
+            lines.append(f'<rect id="r{g}_{k}" x="{x:.1f}" y="{y:.1f}" width="{w:.1f}" height="{h:.1f}"/>')
+        lines.append('</g>')
+    lines.append('</svg>')
+    path = tmp_path / "random.svg"
+    path.write_text("\n".join(lines))
+
+    critic = SVGCritic(str(path))
+    expected = []
+    elements = critic.elements
+    for i, a in enumerate(elements):
+        for j in range(i + 1, len(elements)):
+            b = elements[j]
+            box1, box2 = a.get('bbox'), b.get('bbox')
+            if not box1 or not box2 or a.get('parent_id') == b.get('parent_id'):
+                continue
+            width = min(box1['x2'], box2['x2']) - max(box1['x1'], box2['x1'])
+            height = min(box1['y2'], box2['y2']) - max(box1['y1'], box2['y1'])
+            if width <= 0 or height <= 0:
+                continue
+            smaller = min((box['x2'] - box['x1']) * (box['y2'] - box['y1']) for box in (box1, box2))
+            if width * height / smaller * 100 > 10:
+                expected.append((a['id'], b['id'], pytest.approx(width * height / smaller * 100)))
+
+    found = [(o['element1'], o['element2'], o['overlap_percentage']) for o in critic.detect_overlaps()]
+    assert found == expected
+    assert expected
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from bioicons.geometry import parse_path, segments_bounds
+from path_geometry import PathBatch, path_bbox
+
+PATHS = [
+    "M0 0 C 10 20 30 20 40 0",
+    "M10 10 Q 20 -10 30 10 T 50 10",
+    "M0 0 h10 v10 h-10 z m20 0 l5 5",
+    "M10 0 A10 10 0 1 0 10 0.001",
+    "M0 0 a5 10 30 0110 10",
+    "M0 0 S 10 10 20 0 s 10 -10 20 0",
+]
+
+
+@pytest.mark.parametrize("d", PATHS)
+def test_matches_bioicons_bounds(d):
+    assert path_bbox("path", {"d": d}) == pytest.approx(segments_bounds(parse_path(d)), abs=1e-6)
+
+
+def test_cubic_extrema():
+    x1, y1, x2, y2 = path_bbox("path", {"d": "M0 0 C 0 40 40 40 40 0"})
+    assert (x1, y1, x2) == (0.0, 0.0, 40.0)
+    assert y2 == pytest.approx(30.0)
+
+
+def test_shapes():
+    assert path_bbox("line", {"x1": "1", "y1": "5", "x2": "4", "y2": "2"}) == (1.0, 2.0, 4.0, 5.0)
+    # An odd trailing coordinate is dropped
+    assert path_bbox("polygon", {"points": "0,0 10,0 5,8 3"}) == (0.0, 0.0, 10.0, 8.0)
+
+
+def test_path_errors_keep_geometry_before_them():
+    assert path_bbox("path", {"d": "M0 0 L10 10 L20 x 30 30"}) == (0.0, 0.0, 10.0, 10.0)
+    assert path_bbox("path", {"d": ""}) is None
+    assert path_bbox("rect", {"width": "10"}) is None
+
+
+def test_batch_rows():
+    batch = PathBatch()
+    rows = [batch.add("path", {"d": "M0 0 L1 1"}), batch.add("path", {}), batch.add("line", {"x2": "3"})]
+    bounds = batch.bounds()
+    assert rows == [0, 1, 2]
+    assert bounds[0].tolist() == [0.0, 0.0, 1.0, 1.0]
+    assert np.isnan(bounds[1]).all()
+    assert bounds[2].tolist() == [0.0, 0.0, 3.0, 0.0]
@@ -0,0 +1,87 @@
+import sys
+
+import pytest
+
+from svg_critic import SVGCritic
+
+# svg_critic is the flat module, or the package when collected together with the bioicons tests;
+# use the rules module that SVGCritic itself runs
+rules = sys.modules[sys.modules[SVGCritic.__module__].RuleEngine.__module__]
+
+
+def test_engine_matches_direct_analyzer_calls(diagram):
+    run = rules.RuleEngine(SVGCritic(diagram)).run()
+    direct = SVGCritic(diagram)
+    expected = {
+        'overlaps': direct.detect_overlaps(),
+        'layout': direct.analyze_layout(),
+        'color_harmony': direct.analyze_color_harmony(),
+        'visual_hierarchy': direct.analyze_visual_hierarchy(),
+        'accessibility': direct.analyze_accessibility(),
+        'code_improvements': direct.suggest_code_improvements(),
+    }
+    assert {name: entry['result'] for name, entry in run['rules'].items()} == expected
+    assert set(run['precomputations']) == {'columns', 'palette'}
+    assert all(entry['seconds'] >= 0 for entry in run['rules'].values())
+
+
+def test_evaluate_keeps_the_fixed_weighted_report(diagram):
+    critic = SVGCritic(diagram)
+    evaluation = critic.evaluate()
+    overlaps = critic.detect_overlaps()
+    layout, harmony = critic.analyze_layout(), critic.analyze_color_harmony()
+    hierarchy, accessibility = critic.analyze_visual_hierarchy(), critic.analyze_accessibility()
+    overlap_score = 100 - min(100, len(overlaps) * 20)
+
+    assert evaluation['overall_score'] == round(
+        overlap_score * 0.25 + layout['balance_score'] * 0.20 + harmony['palette_adherence'] * 0.15 +
+        hierarchy['score'] * 0.20 + accessibility['score'] * 0.20)
+    assert evaluation['critical_issues'] == [
+        {'type': 'overlap', 'elements': [o['element1'], o['element2']], 'severity': o['severity']} for o in overlaps]
+    assert evaluation['layout_assessment'] == layout
+    assert evaluation['color_harmony'] == harmony
+    assert evaluation['visual_hierarchy'] == hierarchy
+    assert evaluation['accessibility'] == accessibility
+    assert evaluation['suggested_code_changes'] == critic.suggest_code_improvements()
+    assert evaluation['rules']['overlaps']['score'] == overlap_score
+    assert evaluation['rules']['code_improvements'] == {
+        'score': None, 'weight': 0.0, 'seconds': evaluation['rules']['code_improvements']['seconds']}
+    assert set(evaluation['precomputations']) == {'columns', 'palette'}
+
+
+def test_selected_rules(diagram):
+    evaluation = SVGCritic(diagram).evaluate(['color_harmony'])
+    assert set(evaluation['rules']) == {'color_harmony'}
+    # Only the palette is built, and the overall score is that of the one rule
+    assert set(evaluation['precomputations']) == {'palette'}
+    assert evaluation['overall_score'] == round(evaluation['color_harmony']['palette_adherence'])
+    assert 'critical_issues' not in evaluation
+
+    # Dependencies run too, in registration order
+    evaluation = SVGCritic(diagram).evaluate(['code_improvements'])
+    assert list(evaluation['rules']) == ['overlaps', 'code_improvements']
+
+    with pytest.raises(ValueError):
+        SVGCritic(diagram).evaluate(['nope'])
+
+
+def test_register_rule(diagram, monkeypatch):
+    monkeypatch.setattr(rules, 'RULES', dict(rules.RULES))
+    monkeypatch.setattr(sys.modules[SVGCritic.__module__], 'RULES', rules.RULES)
+    with pytest.raises(ValueError):
+        rules.register_rule(rules.Rule('bad', 'analyze_layout', 'bad', requires=('mesh',)))
+    with pytest.raises(ValueError):
+        rules.register_rule(rules.Rule('bad', 'analyze_layout', 'bad', depends=('missing',)))
+
+    rules.register_rule(rules.Rule(
+        'element_count', lambda critic: len(critic.elements), 'element_count', weight=1.0,
+        score=lambda count: 100 if count < 10 else 0, fields=('type', 'attributes.stroke-width')))
+    assert 'stroke-width' in rules.required_attributes()
+    evaluation = SVGCritic(diagram).evaluate(['element_count', 'overlaps'])
+    assert evaluation['element_count'] == 5
+    assert evaluation['overall_score'] == round((100 * 1.0 + evaluation['rules']['overlaps']['score'] * 0.25) / 1.25)
+
+
+def test_overall_score_without_scored_rules():
+    assert rules.overall_score({}) == 0
+    assert rules.overall_score({'code_improvements': {'score': None, 'weight': 0.0}}) == 0
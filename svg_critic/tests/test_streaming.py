@@ -0,0 +1,68 @@
+import pytest
+
+from svg_critic import SVGCritic
+from svg_parser import have_lxml
+
+# Nested transforms, a large inline raster and metadata, which streaming skips
+NESTED = """<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink"
+     width="400" height="300" viewBox="0 0 400 300">
+  <metadata><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+    <rdf:Description about="diagram"/></rdf:RDF></metadata>
+  <image id="photo" width="50" height="50" xlink:href="data:image/png;base64,%s"/>
+  <g id="outer" transform="translate(50 20) scale(2)">
+    <g id="inner" transform="rotate(30)">
+      <rect id="r1" width="40" height="20" fill="#19aeff"/>
+      <path id="p1" d="M0 0 C 10 30 30 30 40 0 Z" fill="#ff4141" stroke="#333333"/>
+    </g>
+    <circle id="c1" cx="30" cy="10" r="15" fill="#ff4141" opacity="0.5"/>
+    <polyline id="l1" points="0,0 10,40 60,5" fill="none" stroke="#5dbb63"/>
+  </g>
+  <line id="l2" x1="0" y1="290" x2="400" y2="290" stroke="#000000"/>
+</svg>
+""" % ("A" * 100000)
+
+BACKENDS = ["etree", "lxml"] if have_lxml() else ["etree"]
+
+
+@pytest.fixture(params=["diagram", "nested"])
+def document(request, tmp_path, diagram):
+    if request.param == "diagram":
+        return diagram
+    path = tmp_path / "nested.svg"
+    path.write_text(NESTED)
+    return str(path)
+
+
+def without_timings(evaluation):
+    evaluation = dict(evaluation)
+    evaluation['rules'] = {name: {k: v for k, v in entry.items() if k != 'seconds'}
+                           for name, entry in evaluation['rules'].items()}
+    del evaluation['precomputations']
+    return evaluation
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_streaming_matches_full_parse(document, backend):
+    full = SVGCritic(document, backend=backend)
+    streamed = SVGCritic(document, streaming=True, backend=backend)
+    assert streamed.tree is None
+    assert (streamed.width, streamed.height) == (full.width, full.height)
+
+    assert len(streamed.elements) == len(full.elements)
+    for a, b in zip(full.elements, streamed.elements):
+        assert {k: v for k, v in a.items() if k != 'attributes'} == {k: v for k, v in b.items() if k != 'attributes'}
+        # Only the attributes the rules read are kept
+        assert b['attributes'] == {k: v for k, v in a['attributes'].items() if k in b['attributes']}
+
+    assert without_timings(streamed.evaluate()) == without_timings(full.evaluate())
+    assert without_timings(streamed.evaluate(['color_harmony'])) == without_timings(full.evaluate(['color_harmony']))
+
+
+def test_streaming_drops_unused_attributes(tmp_path):
+    path = tmp_path / "nested.svg"
+    path.write_text(NESTED)
+    streamed = SVGCritic(str(path), streaming=True)
+    circle = next(e for e in streamed.elements if e['id'] == 'c1')
+    assert 'opacity' not in circle['attributes'] and circle['attributes']['fill'] == '#ff4141'
+    path_element = next(e for e in streamed.elements if e['id'] == 'p1')
+    assert set(path_element['attributes']) == {'id', 'fill', 'stroke'}
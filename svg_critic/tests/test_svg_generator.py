@@ -0,0 +1,17 @@
+import importlib
+import sys
+
+import pytest
+
+pytest.importorskip("requests")
+
+
+def test_library_context_without_path_changes(monkeypatch):
+    monkeypatch.delitem(sys.modules, "svg_generator", raising=False)
+    path = list(sys.path)
+    svg_generator = importlib.import_module("svg_generator")
+    assert sys.path == path
+
+    generator = svg_generator.SVGGenerator.__new__(svg_generator.SVGGenerator)
+    context = generator._get_library_context()
+    assert context.startswith("Categories currently in the library")
@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+import pytest
+
+from transforms import IDENTITY, TransformStack, parse_transform
+
+
+def test_parse_transform_list_applies_right_to_left():
+    # translate after scale: x' = 2x + 10
+    assert parse_transform("translate(10) scale(2)") == (2.0, 0.0, 0.0, 2.0, 10.0, 0.0)
+    assert parse_transform("scale(2),translate(10)") == (2.0, 0.0, 0.0, 2.0, 20.0, 0.0)
+
+
+def test_rotate_about_a_point():
+    a, b, c, d, e, f = parse_transform("rotate(90 5 5)")
+    # (10, 5) rotates to (5, 10)
+    assert a * 10 + c * 5 + e == pytest.approx(5)
+    assert b * 10 + d * 5 + f == pytest.approx(10)
+
+
+@pytest.mark.parametrize("text", ["translate(1) bogus(2)", "matrix(1 0 0 1)", "rotate(1 2)", "scale()"])
+def test_invalid_attribute_is_ignored_as_a_whole(text):
+    assert parse_transform(text) == IDENTITY
+
+
+def test_stack_shares_ctms():
+    stack = TransformStack()
+    group = stack.push(0, "translate(10 0)")
+    assert stack.push(group, None) == group
+    assert stack.push(0, "translate(10 0)") == group
+    assert stack.push(group, "scale(1)") == group
+    child = stack.push(group, "scale(2)")
+    assert stack.matrix(child) == (2.0, 0.0, 0.0, 2.0, 10.0, 0.0)
+
+
+def test_map_boxes():
+    stack = TransformStack()
+    shifted = stack.push(0, "translate(10 20)")
+    rotated = stack.push(0, "rotate(45)")
+    boxes = np.array([[0.0, 0.0, 2.0, 2.0]] * 3)
+    mapped = stack.map_boxes(boxes, np.array([0, shifted, rotated]))
+    assert mapped[0].tolist() == [0.0, 0.0, 2.0, 2.0]
+    assert mapped[1].tolist() == [10.0, 20.0, 12.0, 22.0]
+    half = math.sqrt(2)
+    assert mapped[2] == pytest.approx([-half, 0.0, half, 2 * half])
@@ -0,0 +1,83 @@
+"""
+Transforms - Resolution of SVG transforms to canvas space.
+
+Transform attributes are parsed by bioicons.geometry.parse_transform into
+affine matrices (a, b, c, d, e, f), cached per attribute string, and composed
+down the element tree by a TransformStack, which gives every distinct current
+transformation matrix (CTM) a small integer key. An element without its own
+transform reuses its parent's key, so the cost per element is constant however
+deeply groups are nested. Bounding boxes of a
+whole document are then mapped to canvas space in one NumPy operation.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from bioicons.geometry import IDENTITY, Matrix, multiply, parse_transform
+except ImportError:
+    # Run as a script from svg_critic/: the bioicons package lives at the repository root
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from bioicons.geometry import IDENTITY, Matrix, multiply, parse_transform
+
+
+class TransformStack:
+    """
+    Composes transforms down an element tree, sharing identical CTMs.
+
+    Key 0 is the identity (canvas space). push() returns the key of a child's
+    CTM given its parent's key and its own transform attribute.
+    """
+
+    def __init__(self):
+        self._matrices = [IDENTITY]
+        self._composed: Dict[Tuple[int, str], int] = {}
+
+    def push(self, parent: int, transform: Optional[str]) -> int:
+        """Key of the CTM of an element with the given transform under parent."""
+        if not transform:
+            return parent
+        key = self._composed.get((parent, transform))
+        if key is None:
+            local = parse_transform(transform)
+            if local == IDENTITY:
+                key = parent
+            else:
+                key = len(self._matrices)
+                self._matrices.append(multiply(self._matrices[parent], local))
+            self._composed[(parent, transform)] = key
+        return key
+
+    def matrix(self, key: int) -> Matrix:
+        """The CTM (a, b, c, d, e, f) for a key."""
+        return self._matrices[key]
+
+    def map_boxes(self, boxes: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """
+        Map local bounding boxes to canvas space.
+
+        Each box's four corners are transformed by its CTM and the axis-aligned
+        box around them is returned, so rotated and skewed boxes grow to
+        contain the transformed rectangle.
+
+        Args:
+            boxes: (n, 4) array of x1, y1, x2, y2 in local coordinates
+            keys: (n,) CTM key per box
+
+        Returns:
+            (n, 4) array in canvas coordinates
+        """
+        if not len(boxes):
+            return boxes.reshape(0, 4)
+        x1, y1, x2, y2 = boxes.T
+        corners = np.stack([
+            np.stack([x1, y1], axis=1), np.stack([x2, y1], axis=1),
+            np.stack([x1, y2], axis=1), np.stack([x2, y2], axis=1),
+        ], axis=1)  # (n, 4, 2)
+        a, b, c, d, e, f = np.asarray(self._matrices, dtype=np.float64)[keys].T[:, :, None]  # (n, 1) each
+        mapped = np.stack([a * corners[..., 0] + c * corners[..., 1] + e,
+                           b * corners[..., 0] + d * corners[..., 1] + f], axis=2)
+        return np.hstack([mapped.min(axis=1), mapped.max(axis=1)])
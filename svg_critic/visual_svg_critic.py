@@ -17,6 +17,11 @@ from pathlib import Path
 import subprocess
 import base64
 
+try:
+    from .svg_parser import SVG_NS, iter_tags, parse, resolve_backend
+except ImportError:
+    from svg_parser import SVG_NS, iter_tags, parse, resolve_backend
+
 # For a full implementation, you would use:
 # import cairosvg  # For SVG rendering
 # import anthropic  # For Claude API access
@@ -26,14 +31,16 @@ class VisualSVGCritic:
     A vision-based SVG critic that simulates analyzing rendered images.
     """
     
-    def __init__(self, svg_path):
+    def __init__(self, svg_path, backend=None):
         """
         Initialize with path to SVG file.
         
         Args:
             svg_path: Path to the SVG file to analyze
+            backend: XML parser, "lxml" or "etree" (default: lxml when installed)
         """
         self.svg_path = svg_path
+        self.backend = resolve_backend(backend)
         self.parse_svg()
         
         # Create a temporary directory for outputs
@@ -48,18 +55,8 @@ class VisualSVGCritic:
         # First fix any malformed SVG
         self._fix_svg_file()
         
-        # Define SVG namespaces for proper parsing
-        namespaces = {
-            'svg': 'http://www.w3.org/2000/svg',
-            'xlink': 'http://www.w3.org/1999/xlink'
-        }
-        
-        # Register namespaces for ElementTree
-        for prefix, uri in namespaces.items():
-            ET.register_namespace(prefix, uri)
-        
-        # Now parse the fixed SVG
-        self.tree = ET.parse(self.svg_path)
+        # Now parse the fixed SVG (namespaces are registered by svg_parser)
+        self.tree = parse(self.svg_path, self.backend)
         self.root = self.tree.getroot()
         
         # Extract basic SVG properties
@@ -162,7 +159,7 @@ class VisualSVGCritic:
         # Add simulated visual issues based on SVG structure
         # Find text elements and check their size
         small_text = []
-        for elem in self.root.iter('{http://www.w3.org/2000/svg}text'):
+        for elem in iter_tags(self.root, SVG_NS + 'text'):
             font_size = elem.get('font-size', '12')
             # Extract numeric part of font-size
             try:
@@ -455,17 +452,8 @@ class VisualSVGCritic:
         Returns:
             Dictionary with information about improvements made
         """
-        # Parse SVG
-        namespaces = {
-            'svg': 'http://www.w3.org/2000/svg',
-            'xlink': 'http://www.w3.org/1999/xlink'
-        }
-        
-        # Register namespaces for ElementTree
-        for prefix, uri in namespaces.items():
-            ET.register_namespace(prefix, uri)
-            
-        tree = ET.parse(input_svg_path)
+        # Parse SVG with the critic's backend (namespaces are registered by svg_parser)
+        tree = parse(input_svg_path, self.backend)
         root = tree.getroot()
         
         improvements = {
@@ -478,7 +466,7 @@ class VisualSVGCritic:
         # 1. Fix small text
         for issue in feedback.get('all_issues', []):
             if 'text' in issue.get('description', '').lower() and 'small' in issue.get('description', '').lower():
-                for elem in root.iter('{http://www.w3.org/2000/svg}text'):
+                for elem in iter_tags(root, SVG_NS + 'text'):
                     font_size = elem.get('font-size', '')
                     if font_size:
                         # Extract numeric part
@@ -618,7 +606,7 @@ class MockClaudeAPI:
             # 1. Fix small text (if mentioned in feedback)
             for issue in feedback.get('all_issues', []):
                 if 'text' in issue.get('description', '').lower() and 'small' in issue.get('description', '').lower():
-                    for elem in root.iter('{http://www.w3.org/2000/svg}text'):
+                    for elem in iter_tags(root, SVG_NS + 'text'):
                         font_size = elem.get('font-size', '')
                         if font_size and font_size.isdigit() and int(font_size) < 12:
                             elem.set('font-size', '12')